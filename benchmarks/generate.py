@@ -0,0 +1,121 @@
+from typing import List, Optional, Tuple
+import argparse
+import csv
+import random
+
+"""
+generator syntetycznych danych w kształcie NUFORC (scrubbed.csv)
+============================================================================
+dlaczego
+1. testy sprawdzają poprawność na kilku ręcznie napisanych wierszach
+2. benchmark potrzebuje danych o rozmiarze 10k - 10M wierszy z tymi samymi
+   problemami co prawdziwy plik:
+   - daty w kilku formatach, godzina "24:00", brakujące / błędne daty
+   - czasy trwania jako tekst ("about 5 minutes", "1-2 hrs")
+   - warianty zapisu kształtu ("Triangular", "DISC", "fire ball", pusty)
+   - komentarze w cudzysłowie z przecinkami, encjami HTML (&#44) i nowymi liniami
+   - współrzędne puste lub poza zakresem (wiersze odrzucane przez walidatory)
+3. seed - ten sam plik przy każdym uruchomieniu (porównywalne wyniki)
+
+generator zapisuje wiersz po wierszu - pamięć stała także dla 10M wierszy
+"""
+
+HEADER = ['datetime', 'city', 'state', 'country', 'shape', 'duration (seconds)',
+          'duration (hours/min)', 'comments', 'date posted', 'latitude', 'longitude']
+
+SHAPES = ['light', 'Light', 'triangle', 'Triangular', 'circle', 'disk', 'DISC', 'fireball', 'fire ball',
+          'orb', 'cigar', 'unknown', 'other', '']
+COUNTRIES = ['us', 'us', 'us', 'us', 'gb', 'ca', 'au', 'de', '']
+WORDS = ['bright', 'green', 'orange', 'light', 'hovering', 'moving', 'fast', 'silent', 'object', 'sky',
+         'triangle', 'disk', 'formation', 'lights', 'red', 'white', 'blinking', 'slowly']
+DURATION_TEXTS = [('about 5 minutes', '5 minutes'), ('1-2 hrs', '1-2 hrs'), ('few seconds', 'few seconds'),
+                  ('30 sec.', '30 sec.'), ('unknown', 'unknown')]
+
+
+def _places(rnd: random.Random, count: int) -> List[Tuple[str, str, str, float, float]]:
+    """pula miejsc - jak w NUFORC, miasta i ich współrzędne się powtarzają"""
+    places = []
+    for i in range(count):
+        country = rnd.choice(COUNTRIES)
+        places.append((f'city {i}', f's{rnd.randint(0, 60)}' if country in ('us', 'ca', 'au') else '',
+                       country, round(rnd.uniform(-60, 70), 6), round(rnd.uniform(-170, 175), 6)))
+    return places
+
+
+def _datetime(rnd: random.Random) -> str:
+    year, month, day = rnd.randint(1940, 2014), rnd.randint(1, 12), rnd.randint(1, 28)
+    hour, minute = rnd.randint(0, 23), rnd.randint(0, 59)
+    kind = rnd.random()
+    if kind < 0.85:
+        return f'{month}/{day}/{year} {hour}:{minute:02d}'
+    if kind < 0.90:
+        # NUFORC zapisuje północ jako 24:00
+        return f'{month}/{day}/{year} 24:00'
+    if kind < 0.95:
+        return f'{year}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:00'
+    if kind < 0.99:
+        return f'{month}/{day}/{year}'
+    return rnd.choice(['', 'unknown', '13/45/2001 99:99'])
+
+
+def _duration(rnd: random.Random) -> Tuple[str, str]:
+    kind = rnd.random()
+    if kind < 0.9:
+        seconds = rnd.choice([1, 2, 5, 10, 15, 30, 60, 120, 180, 300, 600, 900, 1800, 3600, 7200])
+        return str(seconds), f'{seconds // 60} minutes' if seconds >= 60 else f'{seconds} seconds'
+    if kind < 0.98:
+        return rnd.choice(DURATION_TEXTS)
+    return '', ''
+
+
+def _comments(rnd: random.Random) -> str:
+    words = rnd.choices(WORDS, k=rnd.randint(3, 25))
+    text = ' '.join(words)
+    kind = rnd.random()
+    if kind < 0.2:
+        text = text.replace(' ', '&#44 ', 1)
+    elif kind < 0.25:
+        text = f'{text}\nsecond line, with "quotes"'
+    elif kind < 0.3:
+        text = f'{text}, {text}'
+    elif kind < 0.32:
+        text = ''
+    return text
+
+
+def _coordinates(rnd: random.Random, lat: float, lon: float) -> Tuple[str, str]:
+    kind = rnd.random()
+    if kind < 0.995:
+        return str(lat), str(lon)
+    if kind < 0.998:
+        return '', ''
+    return str(rnd.choice([95.5, -91.0])), str(lon)
+
+
+def generate_csv(path: str, rows: int, seed: int = 0, places: Optional[int] = None) -> str:
+    """
+    zapis pliku CSV z rows wierszami
+    - places: liczba unikalnych miejsc (domyślnie ~ rows / 4, najwyżej 20 000)
+    - zwraca ścieżkę pliku
+    """
+    rnd = random.Random(seed)
+    pool = _places(rnd, places or max(1, min(20000, rows // 4)))
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(HEADER)
+        for _ in range(rows):
+            city, state, country, lat, lon = rnd.choice(pool)
+            seconds, text = _duration(rnd)
+            latitude, longitude = _coordinates(rnd, lat, lon)
+            writer.writerow([_datetime(rnd), city, state, country, rnd.choice(SHAPES), seconds, text,
+                             _comments(rnd), f'{rnd.randint(1, 12)}/{rnd.randint(1, 28)}/2014', latitude, longitude])
+    return path
+
+
+if __name__ == '__main__':
+    cli = argparse.ArgumentParser(description='syntetyczny CSV w kształcie NUFORC')
+    cli.add_argument('path')
+    cli.add_argument('--rows', type=int, default=10000)
+    cli.add_argument('--seed', type=int, default=0)
+    args = cli.parse_args()
+    generate_csv(args.path, args.rows, args.seed)
@@ -0,0 +1,336 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+
+from ufo_project.benchmarks.generate import generate_csv
+
+try:
+    import resource
+except ImportError:
+    # Windows - bez pomiaru RSS
+    resource = None
+
+"""
+benchmarki - loadery, repository, zapytania i eksport na syntetycznych danych
+============================================================================
+uruchomienie (z katalogu nad ufo_project):
+    python -m ufo_project.benchmarks.run --rows 10k 100k --output bench.json
+    python -m ufo_project.benchmarks.run --rows 100k --baseline bench_baseline.json
+    python -m ufo_project.benchmarks.run --rows 10k --baseline ufo_project/benchmarks/baseline.json
+
+baseline.json - zapisany wynik dla --rows 10k --seed 0 (dane z generate_csv, ten sam seed);
+czasy zależą od maszyny, więc przed porównaniem na innym komputerze warto nagrać własny
+
+wynik (JSON):
+- meta: python, platforma, liczba CPU, seed, czas uruchomienia
+- results[rozmiar][komponent]:
+  - stages[etap]: seconds, rows_per_sec (etapy przetwarzające wiersze), peak_rss_growth_mb,
+    peak_children_rss_growth_mb
+  - peak_rss_mb: szczytowe RSS procesu komponentu
+  - peak_children_rss_mb: szczytowe RSS największego procesu potomnego (pule procesów
+    load_parallel / load_mmap - tam odbywa się parsowanie); 0 gdy komponent nie tworzy procesów
+  - load_bulk.speedup_vs_threaded: czas load_sightings_threaded / czas trybu wsadowego
+    na tych samych danych (> 1 - tryb wsadowy szybszy)
+  - snapshot.warm_speedup_vs_parse: czas parsowania CSV / czas startu ze snapshotu
+
+pomiar pamięci:
+- każdy komponent działa w osobnym, świeżym procesie (spawn) - szczytowe RSS
+  jednego komponentu nie zasłania drugiego
+- ru_maxrss rośnie monotonicznie, więc przyrost w etapie = szczyt po - szczyt przed
+- RUSAGE_CHILDREN obejmuje tylko zakończone procesy potomne - pule są zamykane
+  przed końcem etapu, więc ich workery są już policzone; to maksimum jednego procesu,
+  nie suma wszystkich workerów
+
+regresje:
+- porównanie z zapisanym wynikiem (--baseline): etap wolniejszy albo komponent
+  z większym szczytowym RSS (własnym lub procesów potomnych) o więcej niż --tolerance
+  (domyślnie 25%)
+- różnice poniżej progu szumu (MIN_SECONDS, MIN_RSS_MB) pomijamy
+- kod wyjścia 1 gdy są regresje
+"""
+
+MIN_SECONDS = 0.01
+MIN_RSS_MB = 5.0
+
+
+def _peak_rss_mb(who: str = 'RUSAGE_SELF') -> Optional[float]:
+    """szczytowe RSS w MB - RUSAGE_SELF (ten proces) albo RUSAGE_CHILDREN (zakończone procesy potomne)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(getattr(resource, who)).ru_maxrss
+    # Linux podaje KB, macOS bajty
+    return peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+
+
+class _Stages:
+    """
+    pomiar kolejnych etapów jednego komponentu
+    """
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[None]:
+        rss, children = _peak_rss_mb(), _peak_rss_mb('RUSAGE_CHILDREN')
+        start = perf_counter()
+        yield
+        seconds = perf_counter() - start
+        entry: Dict[str, Any] = {'seconds': seconds}
+        if rows is not None:
+            entry['rows_per_sec'] = rows / seconds if seconds > 0 else None
+        if rss is not None:
+            entry['peak_rss_growth_mb'] = _peak_rss_mb() - rss
+            entry['peak_children_rss_growth_mb'] = _peak_rss_mb('RUSAGE_CHILDREN') - children
+        self.stages[name] = entry
+
+    def report(self) -> Dict[str, Any]:
+        return {'stages': self.stages, 'peak_rss_mb': _peak_rss_mb(),
+                'peak_children_rss_mb': _peak_rss_mb('RUSAGE_CHILDREN')}
+
+
+def bench_load_threaded(path: str, rows: int) -> Dict[str, Any]:
+    from ufo_project.src.parser import load_sightings_threaded
+    m = _Stages()
+    with m.stage('load', rows):
+        load_sightings_threaded(path)
+    return m.report()
+
+
+def bench_load_parallel(path: str, rows: int) -> Dict[str, Any]:
+    from ufo_project.src.parser import load_sightings_parallel
+    m = _Stages()
+    with m.stage('load', rows):
+        load_sightings_parallel(path)
+    return m.report()
+
+
+def bench_load_mmap(path: str, rows: int) -> Dict[str, Any]:
+    """zakresy 1 MB - przy 10k wierszy domyślne 16 MB to jeden zakres bez równoległości"""
+    from ufo_project.src.parser import load_sightings_mmap
+    m = _Stages()
+    with m.stage('load', rows):
+        load_sightings_mmap(path, range_size=1 << 20)
+    return m.report()
+
+
+def bench_load_async(path: str, rows: int) -> Dict[str, Any]:
+    from ufo_project.src.parser import load_sightings_async
+    m = _Stages()
+    with m.stage('load', rows):
+        asyncio.run(load_sightings_async(path))
+    return m.report()
+
+
+def bench_load_bulk(path: str, rows: int) -> Dict[str, Any]:
+    """
+    tryb wsadowy + load_sightings_threaded w tym samym procesie jako punkt odniesienia
+    - speedup_vs_threaded > 1 - tryb wsadowy szybszy od loadera, który ma zastąpić
+    """
+    from ufo_project.src.bulk import load_sightings_bulk
+    from ufo_project.src.parser import load_sightings_threaded
+    m = _Stages()
+    with m.stage('load', rows):
+        load_sightings_bulk(path)
+    with m.stage('threaded_reference', rows):
+        load_sightings_threaded(path)
+    report = m.report()
+    report['speedup_vs_threaded'] = m.stages['threaded_reference']['seconds'] / m.stages['load']['seconds']
+    return report
+
+
+def bench_repository(path: str, rows: int) -> Dict[str, Any]:
+    """budowa repository (indeksy) + typowe zapytania"""
+    from ufo_project.src.models import UFOShape
+    from ufo_project.src.parser import load_sightings_threaded
+    from ufo_project.src.repository import SightingRepository
+    sightings = load_sightings_threaded(path)
+    m = _Stages()
+    with m.stage('build', len(sightings)):
+        repo = SightingRepository(sightings)
+    with m.stage('by_shape'):
+        repo.by_shape(UFOShape.TRIANGLE)
+    with m.stage('by_country'):
+        repo.by_country('us')
+    with m.stage('by_date_range'):
+        repo.by_date_range(datetime(1990, 1, 1), datetime(2000, 1, 1))
+    with m.stage('query'):
+        repo.query(shape=UFOShape.TRIANGLE, country='us', start=datetime(1990, 1, 1),
+                   end=datetime(2000, 1, 1), min_duration=300)
+    with m.stage('within_radius'):
+        repo.within_radius(40.0, -100.0, 500)
+    with m.stage('search_comments'):
+        repo.search_comments('green light OR orange disk')
+    with m.stage('top_shapes'):
+        repo.top_shapes(6)
+    with m.stage('count_by'):
+        repo.count_by('country', 'year')
+    return m.report()
+
+
+def bench_snapshot(path: str, rows: int) -> Dict[str, Any]:
+    """
+    repository przez snapshot: pierwszy start (parsowanie + zapis), kolejny start
+    (snapshot + indeksy z kolumn) i samo parsowanie CSV jako punkt odniesienia
+    - warm_speedup_vs_parse > 1 - start ze snapshotu szybszy niż parsowanie
+    """
+    from ufo_project.src.parser import load_sightings_threaded
+    from ufo_project.src.snapshot import load_repository_cached, snapshot_path_for
+    snapshot = snapshot_path_for(path)
+    if os.path.exists(snapshot):
+        os.remove(snapshot)
+    m = _Stages()
+    try:
+        with m.stage('cold', rows):
+            load_repository_cached(path, load_sightings_threaded)
+        with m.stage('warm', rows):
+            load_repository_cached(path, load_sightings_threaded)
+        with m.stage('parse_reference', rows):
+            load_sightings_threaded(path)
+    finally:
+        if os.path.exists(snapshot):
+            os.remove(snapshot)
+    report = m.report()
+    report['warm_speedup_vs_parse'] = m.stages['parse_reference']['seconds'] / m.stages['warm']['seconds']
+    return report
+
+
+def bench_export(path: str, rows: int) -> Dict[str, Any]:
+    """eksport JSON w pamięci, strumieniowy NDJSON i kolumnowy"""
+    from ufo_project.src.parser import load_sightings_threaded
+    from ufo_project.src.repository import SightingRepository
+    repo = SightingRepository(load_sightings_threaded(path))
+    n = len(repo)
+    m = _Stages()
+    with tempfile.TemporaryDirectory() as tmp:
+        with m.stage('export_json', n):
+            repo.export_json()
+        with m.stage('export_ndjson', n):
+            repo.export(os.path.join(tmp, 'out.ndjson'))
+        with m.stage('export_columns', n):
+            repo.export_columns(os.path.join(tmp, 'out.ucol'))
+    return m.report()
+
+
+COMPONENTS: Dict[str, Callable[[str, int], Dict[str, Any]]] = {
+    'load_threaded': bench_load_threaded,
+    'load_parallel': bench_load_parallel,
+    'load_mmap': bench_load_mmap,
+    'load_async': bench_load_async,
+    'load_bulk': bench_load_bulk,
+    'repository': bench_repository,
+    'snapshot': bench_snapshot,
+    'export': bench_export,
+}
+
+
+def parse_rows(value: str) -> int:
+    """'10k' / '1M' / '10000' -> liczba wierszy"""
+    value = value.strip().lower()
+    scale = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    return int(float(value[:-1] if scale > 1 else value) * scale)
+
+
+def run_benchmarks(sizes: Sequence[int], components: Optional[Sequence[str]] = None, seed: int = 0,
+                   workdir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    uruchomienie komponentów dla każdego rozmiaru danych
+    - plik CSV generowany raz na rozmiar (w workdir albo katalogu tymczasowym)
+    - każdy komponent w osobnym procesie
+    """
+    names = list(components or COMPONENTS)
+    unknown = [n for n in names if n not in COMPONENTS]
+    if unknown:
+        raise ValueError(f'nieznane komponenty: {unknown} (dostępne: {", ".join(COMPONENTS)})')
+    results: Dict[str, Any] = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'started': datetime.now(timezone.utc).isoformat(),
+        },
+        'results': {},
+    }
+    ctx = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f'nuforc_{rows}.csv')
+            start = perf_counter()
+            generate_csv(path, rows, seed)
+            size_result: Dict[str, Any] = {'generate_seconds': perf_counter() - start,
+                                           'csv_bytes': os.path.getsize(path)}
+            for name in names:
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+                    size_result[name] = ex.submit(COMPONENTS[name], path, rows).result()
+            results['results'][str(rows)] = size_result
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25) -> List[str]:
+    """
+    regresje względem baseline - lista opisów (pusta = brak regresji)
+    - porównujemy tylko rozmiary, komponenty i etapy obecne w obu wynikach
+    """
+    regressions: List[str] = []
+    for size, components in current.get('results', {}).items():
+        base_components = baseline.get('results', {}).get(size, {})
+        for name, result in components.items():
+            base = base_components.get(name)
+            if not isinstance(result, dict) or not isinstance(base, dict):
+                continue
+            for stage, entry in result.get('stages', {}).items():
+                base_entry = base.get('stages', {}).get(stage)
+                if base_entry is None:
+                    continue
+                now, before = entry['seconds'], base_entry['seconds']
+                if now > before * (1 + tolerance) and now - before > MIN_SECONDS:
+                    regressions.append(f'{size} {name}.{stage}: {before:.3f}s -> {now:.3f}s (+{(now / before - 1) * 100:.0f}%)')
+            for key, label in (('peak_rss_mb', 'peak_rss'), ('peak_children_rss_mb', 'peak_children_rss')):
+                now_rss, before_rss = result.get(key), base.get(key)
+                if now_rss is None or before_rss is None:
+                    continue
+                if now_rss > before_rss * (1 + tolerance) and now_rss - before_rss > MIN_RSS_MB:
+                    regressions.append(f'{size} {name}.{label}: {before_rss:.1f} MB -> {now_rss:.1f} MB')
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    cli = argparse.ArgumentParser(description='benchmarki ufo_project na syntetycznych danych NUFORC')
+    cli.add_argument('--rows', nargs='+', default=['10k'], help='rozmiary danych, np. 10k 100k 1M 10M')
+    cli.add_argument('--components', nargs='+', choices=list(COMPONENTS), help='domyślnie wszystkie')
+    cli.add_argument('--seed', type=int, default=0)
+    cli.add_argument('--output', help='plik JSON z wynikami (domyślnie stdout)')
+    cli.add_argument('--baseline', help='plik JSON z wcześniejszymi wynikami do porównania')
+    cli.add_argument('--tolerance', type=float, default=0.25, help='dopuszczalne spowolnienie (0.25 = 25%%)')
+    cli.add_argument('--workdir', help='katalog na wygenerowane pliki CSV')
+    args = cli.parse_args(argv)
+
+    results = run_benchmarks([parse_rows(r) for r in args.rows], args.components, args.seed, args.workdir)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload, encoding='utf-8')
+    else:
+        print(payload)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f'REGRESJA {line}', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from ufo_project.src.parser import load_sightings_threaded, load_sightings_async
 from ufo_project.src.repository import SightingRepository
+from ufo_project.src.metrics import IngestMetrics
 from pathlib import Path
 import asyncio
 
@@ -32,15 +33,34 @@ def run_with_loader(loader_func, *args, **kwargs):
     - asyncio.iscoroutinefunction() sprawdza czy funkcja jest async
     - asyncio.run() uruchamia async funkcję
     - jednocześnie działa z normalnym multithreading - multi jako default
+
+    metryki:
+    =====================
+    - metrics=IngestMetrics() trafia do loadera, budowa repository mierzona jako etap 'index'
     """
+    metrics = kwargs.get('metrics')
     if asyncio.iscoroutinefunction(loader_func):
         sightings = asyncio.run(loader_func(*args, **kwargs))
     else:
         sightings = loader_func(*args, **kwargs)
     
     # repository pattern - wstrzykujemy dane do repository
-    repo = SightingRepository(sightings)
-    total = len(repo.all())
+    if metrics is None:
+        repo = SightingRepository(sightings)
+    else:
+        with metrics.stage('index'):
+            repo = SightingRepository(sightings)
+    print_summary(repo)
+    return repo
+
+
+def print_summary(repo: SightingRepository) -> None:
+    """
+    raport: liczba obserwacji + top 6 kształtów
+    - ten sam raport dla danych z loadera i ze snapshotu
+    - liczby z kostki zliczeń repository - bez przechodzenia po obserwacjach
+    """
+    total = len(repo)
     print(f'Załadowano {total:,} obserwacji UFO z pliku scrubbed.csv')
     print('Top 6 kształtów UFO:')
     for shape, cnt in repo.top_shapes(6):
@@ -48,6 +68,33 @@ def run_with_loader(loader_func, *args, **kwargs):
         print(f'  {shape.name}: {cnt:,} ({percent:.0f}%)')
 
 
+def print_memory(repo: SightingRepository) -> None:
+    """
+    raport pamięci obiektów obserwacji - ile oszczędza współdzielenie Location i napisów
+    """
+    usage = repo.memory_usage()
+    if 'shared_bytes' not in usage:
+        print(f'Pamięć kolumn: {usage["column_bytes"] / 2**20:.1f} MB')
+        return
+    mb = 2 ** 20
+    print(f'Pamięć obiektów: {usage["shared_bytes"] / mb:.1f} MB '
+          f'(bez współdzielenia {usage["unshared_bytes"] / mb:.1f} MB, oszczędność {usage["saved_bytes"] / mb:.1f} MB; '
+          f'{usage["locations"]:,} unikalnych Location na {usage["rows"]:,} obserwacji)')
+
+
+def print_metrics(metrics: IngestMetrics) -> None:
+    """
+    raport ładowania: odrzucone wiersze wg powodu, czasy etapów, przepustowość
+    """
+    rate = metrics.throughput()
+    print(f'Wczytano {metrics.rows_read:,} wierszy, odrzucono {metrics.rows_rejected:,}'
+          + (f' ({rate:,.0f} wierszy/s)' if rate else ''))
+    for reason, cnt in metrics.rejects.most_common():
+        print(f'  odrzucone [{reason}]: {cnt:,}')
+    for stage, seconds in metrics.as_dict()['timers'].items():
+        print(f'  etap {stage}: {seconds:.2f}s')
+
+
 def main():
     """
     program demonstruje **obie implementacje równolegle**:
@@ -57,11 +104,18 @@ def main():
     oba loadery ładują te same dane, różnica tylko w podejściu:
     - multithreading: równoległe przetwarzanie wierszy w wątkach
     - async: nieblokujące I/O z asyncio event loop
+
+    snapshot:
+    - po pierwszym parsowaniu zapisujemy scrubbed.csv.snapshot obok CSV
+    - kolejne uruchomienia mapują snapshot zamiast parsować CSV od nowa
+      (bez parsowania nie ma czego porównywać - oba loadery uruchamia tylko pierwszy start)
+    - zmiana CSV (rozmiar/mtime/hash) unieważnia snapshot
+    - odczyt / zapis przez load_repository_cached, multithreading loader jako loader_func
     
     obsługa błędów:
     ===============
     - sprawdzamy czy plik istnieje
-    - opcjonalne zależności (async) nie przerywają działania programu
+    - opcjonalne zależności (async, numpy dla snapshotu) nie przerywają działania programu
     """
     # ścieżka względna do CSV 
     data_csv = Path(__file__).parent / 'data' / 'scrubbed.csv'
@@ -69,9 +123,34 @@ def main():
         print('Umieść plik scrubbed.csv w ufo_project/data/ i uruchom ponownie')
         return
 
-    # przykład 1: multithreading loader 
-    print('Ładowanie obserwacji (multithreading loader z 8 workerami)...')
-    run_with_loader(load_sightings_threaded, str(data_csv), max_workers=8)
+    metrics = IngestMetrics()
+
+    def parse_csv(path: str):
+        # przykład 1: multithreading loader - wołany tylko gdy brak aktualnego snapshotu
+        # zwraca same obserwacje (metryki mierzą tylko parsowanie),
+        # indeksy buduje raz load_repository_cached
+        print('Ładowanie obserwacji (multithreading loader z 8 workerami)...')
+        return load_sightings_threaded(path, max_workers=8, metrics=metrics)
+
+    try:
+        # snapshot wymaga numpy (SightingFrame) - import dopiero tutaj
+        from ufo_project.src.snapshot import load_repository_cached
+    except ImportError:
+        print('Snapshot pominięty (brak opcjonalnej biblioteki numpy)')
+        print('Ładowanie obserwacji (multithreading loader z 8 workerami)...')
+        repo = run_with_loader(load_sightings_threaded, str(data_csv), max_workers=8, metrics=metrics)
+        print_metrics(metrics)
+        print_memory(repo)
+    else:
+        repo = load_repository_cached(str(data_csv), loader_func=parse_csv)
+        if not metrics.timers:
+            # loader nie był wywołany - dane ze snapshotu
+            print('Wczytano snapshot sparsowanych danych (bez parsowania CSV)...')
+            print_summary(repo)
+            return
+        print_summary(repo)
+        print_metrics(metrics)
+        print_memory(repo)
 
     # przykład 2: async loader
     try:
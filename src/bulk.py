@@ -0,0 +1,176 @@
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import LATITUDE_RANGE, LONGITUDE_RANGE, MIN_DURATION_SECONDS, Location, Sighting, trusted_constructor
+from .parser import LEARN_SAMPLE, read_csv_columns
+from .utils import (PARSE_CACHE, intern_text, learn_datetime_formats, parse_datetimes_batch, parse_durations_batch,
+                    us_to_datetime)
+
+"""
+zaufany tryb wsadowy - walidacja kolumn zamiast walidacji pydantic wiersz po wierszu
+============================================================================
+dlaczego
+1. parse_row_to_sighting buduje pełne Location i Sighting dla każdego wiersza -
+   field_validator dla latitude, longitude i duration uruchamiane osobno dla każdego
+2. tutaj te same reguły sprawdzamy raz dla całych kolumn (numpy), a obiekty
+   budujemy przez trusted_constructor - bez ponownej walidacji
+3. odrzucone wiersze nie znikają po cichu - raport: raw_id, pole, powód
+
+reguły (zakresy lat/lon, nieujemny czas trwania) pochodzą ze stałych w models.py -
+tych samych, których używają walidatory pydantic
+
+zgodność z parse_row_to_sighting:
+- te same aliasy kolumn (datetime / date_time / time, duration (seconds) / duration_seconds / duration)
+- wiersz bez daty jest pomijany, tu dodatkowo trafia do raportu
+- wiersz, który pydantic by odrzucił, tu jest odrzucony z powodem
+"""
+
+_DATETIME_COLUMNS = ('datetime', 'date_time', 'time')
+_DURATION_COLUMNS = ('duration (seconds)', 'duration_seconds', 'duration')
+_OTHER_COLUMNS = ('city', 'state', 'country', 'latitude', 'longitude', 'shape', 'comments')
+_LOCATION_FIELDS = ('city', 'state', 'country', 'latitude', 'longitude')
+
+
+class RejectedRow(NamedTuple):
+    """odrzucony wiersz: numer rekordu w CSV (raw_id), pole i powód"""
+    raw_id: int
+    field: str
+    reason: str
+
+
+class BulkResult(NamedTuple):
+    """
+    wynik trybu wsadowego
+    - sightings: poprawne obserwacje (kolejność z pliku)
+    - rejected: odrzucone wiersze, posortowane po raw_id
+    """
+    sightings: List[Sighting]
+    rejected: List[RejectedRow]
+
+    def reject_counts(self) -> Dict[str, int]:
+        """liczba odrzuconych wierszy per pole"""
+        return dict(Counter(r.field for r in self.rejected))
+
+
+def _coalesce(columns: Dict[str, List[str]], names: Sequence[str], n: int) -> List[str]:
+    """pierwsza niepusta wartość z kolumn-aliasów (jak row.get(a) or row.get(b) ...)"""
+    present = [columns[name] for name in names if name in columns]
+    if not present:
+        return [''] * n
+    if len(present) == 1:
+        return present[0]
+    return [next((v for v in values if v), '') for values in zip(*present)]
+
+
+def _floats(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    kolumna tekstowa -> float64
+    - zwraca (wartości, maska pustych, maska nieparsowalnych)
+    - wektorowe astype, a gdy kolumna ma śmieci - float() dla unikalnych wartości
+    """
+    arr = np.asarray(values, dtype=str)
+    empty = arr == ''
+    try:
+        result = np.where(empty, 'nan', arr).astype(np.float64)
+        return result, empty, np.zeros(len(arr), dtype=bool)
+    except ValueError:
+        uniques, inverse = np.unique(arr, return_inverse=True)
+        parsed = np.empty(len(uniques), dtype=np.float64)
+        bad = np.zeros(len(uniques), dtype=bool)
+        for i, raw in enumerate(uniques.tolist()):
+            try:
+                parsed[i] = float(raw) if raw else np.nan
+            except ValueError:
+                parsed[i], bad[i] = np.nan, True
+        return parsed[inverse], empty, bad[inverse]
+
+
+def _outside(values: np.ndarray, low: float, high: float) -> np.ndarray:
+    # porównanie z NaN daje False - NaN (np. tekst "nan") też jest poza zakresem
+    with np.errstate(invalid='ignore'):
+        return ~((values >= low) & (values <= high))
+
+
+def validate_columns(latitude: np.ndarray, longitude: np.ndarray, duration: np.ndarray,
+                     lat_empty: Optional[np.ndarray] = None, lon_empty: Optional[np.ndarray] = None
+                     ) -> Dict[str, np.ndarray]:
+    """
+    wsadowe sprawdzenie reguł z models.py
+    - latitude / longitude: w zakresie LATITUDE_RANGE / LONGITUDE_RANGE (puste pomijamy)
+    - duration: >= MIN_DURATION_SECONDS (NaN = brak czasu trwania, dozwolony)
+    - zwraca pole -> maska wierszy łamiących regułę
+    """
+    lat_empty = np.isnan(latitude) if lat_empty is None else lat_empty
+    lon_empty = np.isnan(longitude) if lon_empty is None else lon_empty
+    with np.errstate(invalid='ignore'):
+        negative = duration < MIN_DURATION_SECONDS
+    return {
+        'latitude': ~lat_empty & _outside(latitude, *LATITUDE_RANGE),
+        'longitude': ~lon_empty & _outside(longitude, *LONGITUDE_RANGE),
+        'duration_seconds': negative,
+    }
+
+
+def load_sightings_bulk(path: str) -> BulkResult:
+    """
+    wczytanie CSV w trybie wsadowym (zaufane dane, jeden proces)
+
+    1. read_csv_columns - tylko potrzebne kolumny
+    2. parse_datetimes_batch / parse_durations_batch, lat/lon wektorowo
+    3. validate_columns - reguły z models.py dla całych kolumn
+    4. trusted_constructor dla poprawnych wierszy, raport dla odrzuconych
+    """
+    columns = read_csv_columns(path, _DATETIME_COLUMNS + _DURATION_COLUMNS + _OTHER_COLUMNS)
+    n = max((len(v) for v in columns.values()), default=0)
+    if n == 0:
+        return BulkResult([], [])
+    datetimes = _coalesce(columns, _DATETIME_COLUMNS, n)
+    # formaty dat per-load, wyuczone na początku kolumny
+    learn_datetime_formats(datetimes[:LEARN_SAMPLE])
+    dt, dt_bad = parse_datetimes_batch(datetimes)
+    duration, _ = parse_durations_batch(_coalesce(columns, _DURATION_COLUMNS, n))
+    lat_raw, lon_raw = _coalesce(columns, ('latitude',), n), _coalesce(columns, ('longitude',), n)
+    lat, lat_empty, lat_bad = _floats(lat_raw)
+    lon, lon_empty, lon_bad = _floats(lon_raw)
+    violations = validate_columns(lat, lon, duration, lat_empty, lon_empty)
+
+    rejected: List[RejectedRow] = []
+    reject = np.zeros(n, dtype=bool)
+
+    def report(mask: np.ndarray, field: str, message) -> None:
+        rows = np.flatnonzero(mask & ~reject)
+        for i in rows.tolist():
+            rejected.append(RejectedRow(i + 1, field, message(i)))
+        reject[rows] = True
+
+    report(dt_bad, 'datetime_utc', lambda i: f'brak lub nieparsowalna data: {datetimes[i]!r}')
+    report(lat_bad, 'latitude', lambda i: f'latitude nie jest liczbą: {lat_raw[i]!r}')
+    report(lon_bad, 'longitude', lambda i: f'longitude nie jest liczbą: {lon_raw[i]!r}')
+    report(violations['latitude'], 'latitude', lambda i: f'latitude poza zakresem: {lat[i]}')
+    report(violations['longitude'], 'longitude', lambda i: f'longitude poza zakresem: {lon[i]}')
+    report(violations['duration_seconds'], 'duration_seconds',
+           lambda i: f'duration_seconds musi być >= {MIN_DURATION_SECONDS:g}: {duration[i]}')
+    rejected.sort(key=lambda r: r.raw_id)
+
+    cities, states, countries = (_coalesce(columns, (name,), n) for name in ('city', 'state', 'country'))
+    shapes, comments = _coalesce(columns, ('shape',), n), _coalesce(columns, ('comments',), n)
+    # kolumny -> listy skalarów Pythona raz, zamiast .item() dla każdej komórki
+    dt_us = dt.astype(np.int64).tolist()
+    lat_list, lon_list, dur_list = lat.tolist(), lon.tolist(), duration.tolist()
+    build_location, build_sighting = trusted_constructor(Location), trusted_constructor(Sighting)
+    # flyweight - jeden obiekt Location na unikalne miejsce, nazwy internowane
+    cities, states, countries = ([intern_text(v) for v in values] for values in (cities, states, countries))
+    locations: Dict[Tuple, Location] = {}
+    sightings: List[Sighting] = []
+    for i in np.flatnonzero(~reject).tolist():
+        la, lo, du = lat_list[i], lon_list[i], dur_list[i]
+        key = (cities[i], states[i], countries[i], None if la != la else la, None if lo != lo else lo)
+        loc = locations.get(key)
+        if loc is None:
+            loc = locations[key] = build_location(dict(zip(_LOCATION_FIELDS, key)))
+        sightings.append(build_sighting({
+            'datetime_utc': us_to_datetime(dt_us[i]), 'duration_seconds': None if du != du else du,
+            'comments': comments[i] or None, 'location': loc, 'shape': PARSE_CACHE.shape(shapes[i]), 'raw_id': i + 1}))
+    return BulkResult(sightings, rejected)
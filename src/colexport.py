@@ -0,0 +1,102 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .colfile import ColumnFile, ColumnValue, write_columns
+from .frame import SightingFrame, _SHAPES
+
+"""
+kolumnowy eksport obserwacji - plik dla zadań, które potrzebują kilku pól
+============================================================================
+dlaczego
+1. export_json zmusza odbiorcę do przeczytania i zdekodowania wszystkich pól,
+   nawet gdy potrzebuje tylko datetime_utc + shape albo latitude/longitude
+2. tutaj każde pole to osobny, typowany blok w pliku colfile (opcjonalnie skompresowany)
+3. czytelnik mapuje plik (mmap) i czyta tylko bloki żądanych pól
+
+pola (nazwy jak w Sighting / Location):
+- datetime_utc: datetime64[us] (UTC)
+- duration_seconds / latitude / longitude: float64 (NaN = brak)
+- raw_id: int64 (-1 = brak)
+- shape / city / state / country / comments: kategorie -
+  bloki '<pole>.values' (unikalne napisy) + '<pole>.codes' (int, -1 = brak)
+"""
+
+EXPORT_FORMAT = 'ufo-sightings-columns'
+EXPORT_VERSION = 1
+
+_NUMERIC_FIELDS = {
+    'datetime_utc': 'datetime_us',
+    'duration_seconds': 'duration',
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'raw_id': 'raw_id',
+}
+_CATEGORY_FIELDS = ('shape', 'city', 'state', 'country', 'comments')
+FIELDS = tuple(_NUMERIC_FIELDS) + _CATEGORY_FIELDS
+
+
+def _check_fields(fields: Optional[Iterable[str]]) -> List[str]:
+    if fields is None:
+        return list(FIELDS)
+    fields = list(fields)
+    unknown = [f for f in fields if f not in FIELDS]
+    if unknown:
+        raise ValueError(f'nieznane pola: {unknown} (dostępne: {", ".join(FIELDS)})')
+    return fields
+
+
+def export_columns(frame: SightingFrame, path: str, fields: Optional[Iterable[str]] = None,
+                   compression: Optional[str] = 'zlib') -> int:
+    """
+    zapis wybranych pól frame do pliku kolumnowego
+    - compression: kompresja bloków (colfile.COMPRESSIONS) albo None - bez
+      kompresji kolumny numeryczne czytane są bez kopiowania
+    - zwraca liczbę zapisanych obserwacji
+    """
+    fields = _check_fields(fields)
+    columns: Dict[str, ColumnValue] = {}
+    for field in fields:
+        if field in _NUMERIC_FIELDS:
+            arr = getattr(frame, _NUMERIC_FIELDS[field]).view()
+            columns[field] = arr.view('M8[us]') if field == 'datetime_utc' else arr
+        elif field == 'shape':
+            columns['shape.values'] = [shape.value for shape in _SHAPES]
+            columns['shape.codes'] = frame.shape.view()
+        else:
+            col = getattr(frame, field)
+            columns[f'{field}.values'] = col.values
+            columns[f'{field}.codes'] = col.codes.view()
+    meta = {'format': EXPORT_FORMAT, 'version': EXPORT_VERSION, 'rows': len(frame), 'fields': fields}
+    write_columns(path, columns, meta, compression=compression)
+    return len(frame)
+
+
+def _decode_category(values: Sequence[str], codes: np.ndarray) -> List[Optional[str]]:
+    return [values[c] if c >= 0 else None for c in codes.tolist()]
+
+
+def read_columns(path: str, fields: Optional[Iterable[str]] = None,
+                 decode: bool = True) -> Dict[str, Union[np.ndarray, List[Optional[str]], Any]]:
+    """
+    odczyt wybranych pól - z pliku czytane są tylko ich bloki
+    - pola numeryczne: tablice numpy (widok mmap, gdy blok nie jest skompresowany)
+    - kategorie: lista napisów (None = brak); decode=False - para (values, codes)
+      bez budowania napisów dla każdego wiersza
+    """
+    with ColumnFile(path) as cf:
+        if cf.meta.get('format') != EXPORT_FORMAT:
+            raise ValueError(f'{path} nie jest kolumnowym eksportem obserwacji')
+        available = cf.meta.get('fields', [])
+        fields = _check_fields(fields if fields is not None else available)
+        missing = [f for f in fields if f not in available]
+        if missing:
+            raise ValueError(f'pól {missing} nie ma w pliku {path} (zapisane: {", ".join(available)})')
+        result: Dict[str, Any] = {}
+        for field in fields:
+            if field in _NUMERIC_FIELDS:
+                result[field] = cf.column(field)
+                continue
+            values, codes = cf.column(f'{field}.values'), cf.column(f'{field}.codes')
+            result[field] = _decode_category(values, codes) if decode else (values, codes)
+        return result
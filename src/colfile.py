@@ -0,0 +1,212 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+import bz2
+import json
+import lzma
+import mmap
+import struct
+import zlib
+
+import numpy as np
+
+"""
+format pliku kolumnowego - prosty kontener na tablice numpy i listy napisów
+============================================================================
+układ pliku:
+1. MAGIC (8 bajtów) + długość nagłówka (uint64, little endian)
+2. nagłówek JSON: meta + opis kolumn (nazwa, typ, offset, rozmiar)
+3. bloki kolumn, każdy wyrównany do 64 bajtów
+
+dlaczego tak
+- kolumny numeryczne czytamy przez mmap + np.frombuffer - bez kopiowania
+- nagłówek JSON jest czytelny i łatwo go rozszerzać
+- kolumny napisów: blok offsetów int64 + jeden blok UTF-8
+
+kompresja (opcjonalna, per kolumna):
+- blok kompresowany osobno (zlib / bz2 / lzma), w nagłówku 'compression' i 'raw_nbytes'
+- zostawiamy surowy blok, gdy kompresja nic nie daje (np. losowe float64)
+- kolumnę skompresowaną trzeba rozpakować - zero-copy tylko dla bloków bez kompresji
+"""
+
+MAGIC = b'UFOCOL1\n'
+_ALIGN = 64
+_PREFIX = struct.Struct('<8sQ')
+
+ColumnValue = Union[np.ndarray, List[str]]
+
+_CODECS = {
+    'zlib': (zlib.compress, zlib.decompress),
+    'bz2': (bz2.compress, bz2.decompress),
+    'lzma': (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+COMPRESSIONS = tuple(_CODECS)
+
+
+def _padding(pos: int) -> int:
+    return (-pos) % _ALIGN
+
+
+def _encode_strings(values: Iterable[str]) -> bytes:
+    """
+    lista napisów -> [n (int64)][offsety (int64, n+1)][dane UTF-8]
+    """
+    encoded = [v.encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype='<i8')
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return struct.pack('<q', len(encoded)) + offsets.tobytes() + b''.join(encoded)
+
+
+def _decode_strings(buf: memoryview) -> List[str]:
+    (n,) = struct.unpack_from('<q', buf, 0)
+    if n < 0 or 8 + 8 * (n + 1) > len(buf):
+        raise ValueError('liczba napisów poza blokiem')
+    offsets = np.frombuffer(buf, dtype='<i8', count=n + 1, offset=8).tolist()
+    data = bytes(buf[8 + 8 * (n + 1):])
+    if offsets[0] != 0 or offsets[-1] > len(data) or any(a > b for a, b in zip(offsets, offsets[1:])):
+        raise ValueError('offsety napisów poza blokiem')
+    return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(n)]
+
+
+def write_columns(path: str, columns: Mapping[str, ColumnValue], meta: Optional[Dict[str, Any]] = None,
+                  compression: Optional[str] = None, level: int = 6) -> None:
+    """
+    zapis kolumn do pliku
+
+    - np.ndarray -> surowe bajty (dtype zapisany w nagłówku)
+    - List[str] -> kolumna napisów (bez None)
+    - compression: None albo jedna z COMPRESSIONS - każda kolumna kompresowana osobno
+    """
+    if compression is not None and compression not in _CODECS:
+        raise ValueError(f'nieznana kompresja: {compression} (dostępne: {", ".join(COMPRESSIONS)})')
+    blocks: List[bytes] = []
+    entries: List[Dict[str, Any]] = []
+    for name, value in columns.items():
+        if isinstance(value, np.ndarray):
+            arr = np.ascontiguousarray(value)
+            blocks.append(arr.tobytes())
+            entries.append({'name': name, 'kind': 'array', 'dtype': arr.dtype.str, 'count': len(arr)})
+        else:
+            blocks.append(_encode_strings(value))
+            entries.append({'name': name, 'kind': 'strings', 'count': len(value)})
+        if compression is not None:
+            packed = _CODECS[compression][0](blocks[-1], level)
+            if len(packed) < len(blocks[-1]):
+                entries[-1].update(compression=compression, raw_nbytes=len(blocks[-1]))
+                blocks[-1] = packed
+
+    # offsety liczymy względem początku sekcji danych (po nagłówku i wyrównaniu)
+    pos = 0
+    for entry, block in zip(entries, blocks):
+        entry['offset'] = pos
+        entry['nbytes'] = len(block)
+        pos += len(block) + _padding(len(block))
+    header = json.dumps({'meta': meta or {}, 'columns': entries}).encode('utf-8')
+    data_start = _PREFIX.size + len(header)
+    data_start += _padding(data_start)
+
+    with open(path, 'wb') as fh:
+        fh.write(_PREFIX.pack(MAGIC, len(header)))
+        fh.write(header)
+        fh.write(b'\0' * (data_start - _PREFIX.size - len(header)))
+        for block in blocks:
+            fh.write(block)
+            fh.write(b'\0' * _padding(len(block)))
+
+
+class ColumnFile:
+    """
+    odczyt pliku kolumnowego przez mmap
+    ============================================================================
+    - meta / names - z nagłówka, bez czytania danych
+    - column(name) - tablice numpy jako widok na mmap (zero-copy, tylko do odczytu)
+    - kolumny napisów dekodowane przy odczycie (obiekty str trzeba zbudować)
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, 'rb')
+        self._mm: Optional[mmap.mmap] = None
+        try:
+            # pusty plik nie da się zmapować (ValueError)
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            self._read_header()
+        except (ValueError, KeyError, TypeError, AttributeError, struct.error) as e:
+            self.close()
+            raise ValueError(f'niepoprawny plik kolumnowy: {path}') from e
+
+    def _read_header(self) -> None:
+        """
+        nagłówek i opis kolumn - każdy blok musi mieścić się w pliku
+        - obcięty / obcy plik -> ValueError zanim dotkniemy danych
+        """
+        size = len(self._mm)
+        if size < _PREFIX.size:
+            raise ValueError('plik krótszy niż prefiks')
+        magic, header_len = _PREFIX.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError('zły MAGIC')
+        start = _PREFIX.size + header_len
+        if start > size:
+            raise ValueError('nagłówek poza plikiem')
+        header = json.loads(self._mm[_PREFIX.size:start].decode('utf-8'))
+        self.meta: Dict[str, Any] = dict(header['meta'])
+        self._data_start = start + _padding(start)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        for entry in header['columns']:
+            offset, nbytes, count = int(entry['offset']), int(entry['nbytes']), int(entry['count'])
+            if min(offset, nbytes, count) < 0 or self._data_start + offset + nbytes > size:
+                raise ValueError(f'kolumna {entry["name"]} poza plikiem')
+            if entry['kind'] == 'array':
+                itemsize = np.dtype(entry['dtype']).itemsize
+                if 'compression' not in entry and count * itemsize > nbytes:
+                    raise ValueError(f'kolumna {entry["name"]} dłuższa niż blok')
+            elif entry['kind'] != 'strings':
+                raise ValueError(f'nieznany typ kolumny: {entry["kind"]}')
+            if entry.get('compression', None) not in (None, *_CODECS):
+                raise ValueError(f'nieznana kompresja: {entry["compression"]}')
+            self._entries[entry['name']] = entry
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def column(self, name: str) -> ColumnValue:
+        """
+        jedna kolumna - czytane są tylko bajty jej bloku
+        - KeyError dla nieistniejącej kolumny
+        - ValueError dla uszkodzonego bloku (zła kompresja, offsety napisów, UTF-8)
+        """
+        entry = self._entries[name]
+        offset = self._data_start + entry['offset']
+        compression = entry.get('compression')
+        try:
+            if compression is not None:
+                buf = _CODECS[compression][1](self._mm[offset:offset + entry['nbytes']])
+                offset = 0
+            else:
+                buf = self._mm
+            if entry['kind'] == 'array':
+                return np.frombuffer(buf, dtype=np.dtype(entry['dtype']), count=entry['count'], offset=offset)
+            return _decode_strings(memoryview(buf)[offset:offset + entry.get('raw_nbytes', entry['nbytes'])])
+        except (zlib.error, lzma.LZMAError, OSError, EOFError, struct.error) as e:
+            raise ValueError(f'uszkodzona kolumna {name}: {self.path}') from e
+
+    def read(self, names: Optional[Iterable[str]] = None) -> Dict[str, ColumnValue]:
+        """odczyt wybranych kolumn (None = wszystkie)"""
+        return {name: self.column(name) for name in (self.names if names is None else names)}
+
+    def close(self) -> None:
+        """
+        zamknięcie pliku - mmap zostaje otwarty dopóki istnieją widoki numpy,
+        więc zamykamy tylko gdy nic z niego nie korzysta
+        """
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass
+        self._fh.close()
+
+    def __enter__(self) -> 'ColumnFile':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
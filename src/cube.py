@@ -0,0 +1,158 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import UFOShape
+from .utils import us_to_datetime
+
+"""
+kostka zliczeń (count cube) - agregaty liczone przy add, nie przy zapytaniu
+============================================================================
+dlaczego
+1. top_shapes budowało i sortowało listę liczników przy każdym wywołaniu
+2. każda inna agregacja (kraj x rok, stan x kształt) wymagała przejścia po obserwacjach
+3. kostka trzyma liczbę obserwacji dla każdej kombinacji wymiarów - komórek
+   jest dużo mniej niż obserwacji, a zapytanie sumuje tylko komórki
+
+wymiary: shape, country, state (znormalizowane jak indeksy miejsc), year, month, hour
+- domyślnie shape x country x state x year, month / hour opcjonalnie (więcej komórek)
+
+roll-upy:
+- group_by bez filtrów dla danego zestawu wymiarów liczymy raz z komórek,
+  potem aktualizujemy przyrostowo w add - kolejne wywołania to odczyt słownika
+"""
+
+DIMENSIONS = ('shape', 'country', 'state', 'year', 'month', 'hour')
+DEFAULT_DIMENSIONS = ('shape', 'country', 'state', 'year')
+_TIME_DIMENSIONS = {'year', 'month', 'hour'}
+_HOUR_US = 3_600_000_000
+_DAY_US = 24 * _HOUR_US
+
+
+class CountCube:
+    """
+    przyrostowo aktualizowana kostka zliczeń
+    ============================================================================
+    - add(shape, country, state, datetime_us) - jedna obserwacja
+    - add_many(rows) - paczka obserwacji, merge(other) - kostka częściowa
+    - group_by(*dims, **where) - liczby dla kombinacji wybranych wymiarów
+    - top(dims, n, **where) - n największych grup
+    - count(**where) - liczba obserwacji spełniających filtry
+
+    where: równość wartości wymiaru, np. country='us', year=1999, shape=UFOShape.DISK
+    """
+    def __init__(self, dims: Sequence[str] = DEFAULT_DIMENSIONS):
+        unknown = [d for d in dims if d not in DIMENSIONS]
+        if unknown or not dims:
+            raise ValueError(f'nieznane wymiary kostki: {unknown} (dostępne: {", ".join(DIMENSIONS)})')
+        self.dims: Tuple[str, ...] = tuple(dims)
+        self._source = [DIMENSIONS.index(d) for d in self.dims]
+        self._needs_time = bool(_TIME_DIMENSIONS & set(self.dims))
+        self._cells: Counter = Counter()
+        self._rollups: Dict[Tuple[int, ...], Counter] = {}
+        self.total = 0
+
+    def __len__(self) -> int:
+        """liczba niepustych komórek"""
+        return len(self._cells)
+
+    def add(self, shape: UFOShape, country: Optional[str], state: Optional[str], datetime_us: int) -> None:
+        values: Tuple[Any, ...] = (shape, country, state)
+        if self._needs_time:
+            dt = us_to_datetime(datetime_us)
+            values += (dt.year, dt.month, dt.hour)
+        key = tuple(values[p] for p in self._source)
+        self._cells[key] += 1
+        self.total += 1
+        for positions, counter in self._rollups.items():
+            counter[tuple(key[p] for p in positions)] += 1
+
+    def add_many(self, rows: Iterable[Tuple[UFOShape, Optional[str], Optional[str], int]]) -> None:
+        """
+        dodanie paczki (shape, country, state, datetime_us)
+        - komórki paczki zliczamy osobno i dodajemy raz - roll-upy aktualizowane na komórkę, nie na wiersz
+        - rok / miesiąc liczone raz na dzień (UTC), godzina z reszty dzielenia
+        """
+        batch: Counter = Counter()
+        if self._needs_time:
+            days: Dict[int, Tuple[int, int]] = {}
+            for shape, country, state, us in rows:
+                day = us // _DAY_US
+                parts = days.get(day)
+                if parts is None:
+                    dt = us_to_datetime(day * _DAY_US)
+                    parts = days[day] = (dt.year, dt.month)
+                batch[(shape, country, state) + parts + (us // _HOUR_US % 24,)] += 1
+        else:
+            for shape, country, state, _ in rows:
+                batch[(shape, country, state)] += 1
+        cells: Counter = Counter()
+        for values, n in batch.items():
+            cells[tuple(values[p] for p in self._source)] += n
+        self._add_cells(cells)
+
+    def merge(self, other: 'CountCube') -> None:
+        """dodanie komórek kostki częściowej (te same wymiary)"""
+        if other.dims != self.dims:
+            raise ValueError(f'różne wymiary kostek: {self.dims} != {other.dims}')
+        self._add_cells(other._cells)
+
+    def _add_cells(self, cells: Counter) -> None:
+        self._cells.update(cells)
+        self.total += sum(cells.values())
+        for positions, counter in self._rollups.items():
+            for key, n in cells.items():
+                counter[tuple(key[p] for p in positions)] += n
+
+    def _positions(self, dims: Iterable[str]) -> Tuple[int, ...]:
+        positions = []
+        for d in dims:
+            if d not in self.dims:
+                raise ValueError(f'wymiar {d!r} nie należy do kostki (wymiary: {", ".join(self.dims)})')
+            positions.append(self.dims.index(d))
+        return tuple(positions)
+
+    def _grouped(self, dims: Sequence[str], where: Dict[str, Any]) -> Counter:
+        positions = self._positions(dims)
+        if not where:
+            counter = self._rollups.get(positions)
+            if counter is None:
+                counter = Counter()
+                for key, n in self._cells.items():
+                    counter[tuple(key[p] for p in positions)] += n
+                self._rollups[positions] = counter
+            return counter
+        # z filtrami - suma po pasujących komórkach (bez zapamiętywania)
+        filters = list(zip(self._positions(where), where.values()))
+        counter = Counter()
+        for key, n in self._cells.items():
+            if all(key[p] == v for p, v in filters):
+                counter[tuple(key[p] for p in positions)] += n
+        return counter
+
+    @staticmethod
+    def _unwrap(items: Iterable[Tuple[Tuple, int]], dims: Sequence[str]) -> Iterable[Tuple[Any, int]]:
+        # jeden wymiar -> klucz to sama wartość, nie krotka jednoelementowa
+        if len(dims) == 1:
+            return ((key[0], n) for key, n in items)
+        return items
+
+    def group_by(self, *dims: str, **where: Any) -> Dict[Any, int]:
+        """
+        liczby obserwacji dla każdej kombinacji wymiarów dims
+        - klucz: wartość (jeden wymiar) lub krotka wartości w kolejności dims
+        """
+        return dict(self._unwrap(self._grouped(dims, where).items(), dims))
+
+    def top(self, dims, n: int = 10, **where: Any) -> List[Tuple[Any, int]]:
+        """
+        n największych grup, malejąco (przy remisie - kolejność pojawienia się)
+        - dims: nazwa wymiaru lub sekwencja nazw
+        """
+        dims = (dims,) if isinstance(dims, str) else tuple(dims)
+        return list(self._unwrap(self._grouped(dims, where).most_common(n), dims))
+
+    def count(self, **where: Any) -> int:
+        """liczba obserwacji spełniających filtry (bez filtrów - wszystkie)"""
+        if not where:
+            return self.total
+        return sum(self._grouped((), where).values())
@@ -0,0 +1,189 @@
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Union
+import gzip
+import io
+import json
+
+from .models import Sighting
+
+try:
+    import orjson
+except Exception:
+    # opcjonalna zależność - szybszy enkoder JSON, bez niej używamy json ze stdlib
+    orjson = None
+
+"""
+strumieniowy eksport obserwacji - NDJSON albo tablica JSON
+============================================================================
+dlaczego
+1. export_json budował słownik dla każdej obserwacji, całą listę payload
+   i jeden ogromny string z json.dumps - pamięć kilka razy większa od danych
+2. tutaj każdy rekord kodujemy osobno i od razu zapisujemy (paczkami) do pliku -
+   pamięć stała, niezależna od liczby obserwacji
+3. cel: ścieżka (plik .gz -> gzip automatycznie) albo otwarty obiekt pliku
+
+formaty:
+- ndjson: jeden obiekt JSON na linię - można czytać i dzielić strumieniowo
+- json: tablica JSON, ta sama struktura co export_json
+
+enkoder: 'auto' (orjson jeśli jest, inaczej json), 'json', 'orjson' albo
+własna funkcja obj -> str | bytes
+"""
+
+Target = Union[str, Path, io.IOBase]
+Encoder = Callable[[Any], Union[str, bytes]]
+
+FORMATS = ('ndjson', 'json')
+_BATCH = 1024
+
+
+def sighting_to_dict(s: Sighting) -> Dict[str, Any]:
+    """rekord eksportu - ta sama struktura co w export_json"""
+    loc = s.location
+    return {
+        'datetime_utc': s.datetime_utc.isoformat(),
+        'duration_seconds': s.duration_seconds,
+        'comments': s.comments,
+        'location': {
+            'city': loc.city,
+            'state': loc.state,
+            'country': loc.country,
+            'latitude': loc.latitude,
+            'longitude': loc.longitude,
+        },
+        'shape': s.shape.value,
+    }
+
+
+def get_encoder(encoder: Union[str, Encoder] = 'auto', compact: bool = True, indent: bool = False) -> Encoder:
+    """
+    funkcja kodująca pojedynczy rekord
+    - compact: bez spacji po ',' i ':' (orjson zawsze pisze zwięźle)
+    - indent: wcięcie 2 spacje, przesunięte o poziom tablicy (rekord wewnątrz [...]);
+      znaki nowej linii w stringach JSON są escapowane, więc replace jest bezpieczne
+    """
+    if callable(encoder):
+        return encoder
+    if encoder == 'auto':
+        encoder = 'orjson' if orjson is not None else 'json'
+    if encoder == 'orjson':
+        if orjson is None:
+            raise ImportError('orjson nie jest zainstalowany (pip install orjson)')
+        if indent:
+            return lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8').replace('\n', '\n  ')
+        return orjson.dumps
+    if encoder == 'json':
+        if indent:
+            return lambda obj: json.dumps(obj, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+        separators = (',', ':') if compact else (', ', ': ')
+        return lambda obj: json.dumps(obj, ensure_ascii=False, separators=separators)
+    raise ValueError(f'nieznany enkoder: {encoder} (dostępne: auto, json, orjson)')
+
+
+class _Sink:
+    """
+    wspólny zapis str/bytes do pliku tekstowego lub binarnego
+    - otwiera ścieżkę (gzip dla .gz lub compress=True), obiekt pliku zostawia otwarty
+    - compress dla obiektu pliku wymaga pliku binarnego
+    """
+    def __init__(self, target: Target, compress: Optional[bool]):
+        self._owned = []
+        if isinstance(target, (str, Path)):
+            if compress is None:
+                compress = str(target).endswith('.gz')
+            fh = gzip.open(target, 'wb') if compress else open(target, 'wb')
+            self._owned.append(fh)
+        elif compress:
+            fh = gzip.GzipFile(fileobj=target, mode='wb')
+            self._owned.append(fh)
+        else:
+            fh = target
+        self._fh = fh
+        self._text = isinstance(fh, io.TextIOBase)
+
+    def write(self, chunk: Union[str, bytes]) -> None:
+        if self._text:
+            self._fh.write(chunk.decode('utf-8') if isinstance(chunk, bytes) else chunk)
+        else:
+            self._fh.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+
+    def close(self) -> None:
+        for fh in reversed(self._owned):
+            fh.close()
+
+
+def _as_text(encoded: Union[str, bytes]) -> str:
+    return encoded.decode('utf-8') if isinstance(encoded, bytes) else encoded
+
+
+def _lines(records: Iterable[Dict[str, Any]], encode: Encoder) -> Iterator[str]:
+    for record in records:
+        yield _as_text(encode(record))
+
+
+def write_ndjson(sightings: Iterable[Sighting], target: Target, compress: Optional[bool] = None,
+                 compact: bool = True, encoder: Union[str, Encoder] = 'auto') -> int:
+    """
+    zapis NDJSON - jedna obserwacja na linię
+    - zwraca liczbę zapisanych obserwacji
+    """
+    encode = get_encoder(encoder, compact)
+    sink = _Sink(target, compress)
+    count = 0
+    try:
+        batch = []
+        for line in _lines(map(sighting_to_dict, sightings), encode):
+            batch.append(line)
+            if len(batch) >= _BATCH:
+                sink.write('\n'.join(batch) + '\n')
+                count += len(batch)
+                batch = []
+        if batch:
+            sink.write('\n'.join(batch) + '\n')
+            count += len(batch)
+    finally:
+        sink.close()
+    return count
+
+
+def write_json_array(sightings: Iterable[Sighting], target: Target, compress: Optional[bool] = None,
+                     compact: bool = True, encoder: Union[str, Encoder] = 'auto') -> int:
+    """
+    zapis tablicy JSON rekord po rekordzie
+    - compact=False: wcięcie 2 spacje, jak json.dumps(..., indent=2) w export_json
+    - zwraca liczbę zapisanych obserwacji
+    """
+    encode = get_encoder(encoder, compact=True, indent=not compact)
+    if compact:
+        first_sep, sep, end = '[', ',', ']'
+    else:
+        first_sep, sep, end = '[\n  ', ',\n  ', '\n]'
+    sink = _Sink(target, compress)
+    count = 0
+    try:
+        batch = []
+        for item in _lines(map(sighting_to_dict, sightings), encode):
+            batch.append(item)
+            if len(batch) >= _BATCH:
+                sink.write((first_sep if not count else sep) + sep.join(batch))
+                count += len(batch)
+                batch = []
+        if batch:
+            sink.write((first_sep if not count else sep) + sep.join(batch))
+            count += len(batch)
+        sink.write(end if count else '[]')
+    finally:
+        sink.close()
+    return count
+
+
+def export_sightings(sightings: Iterable[Sighting], target: Target, fmt: str = 'ndjson', **kwargs) -> int:
+    """
+    eksport w wybranym formacie: 'ndjson' albo 'json'
+    - kwargs: compress, compact, encoder
+    """
+    if fmt == 'ndjson':
+        return write_ndjson(sightings, target, **kwargs)
+    if fmt == 'json':
+        return write_json_array(sightings, target, **kwargs)
+    raise ValueError(f'nieznany format eksportu: {fmt} (dostępne: {", ".join(FORMATS)})')
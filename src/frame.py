@@ -0,0 +1,271 @@
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from .models import Sighting, Location, UFOShape
+from .repository import IndexRow
+from .utils import datetime_to_us, us_to_datetime
+
+import numpy as np
+
+"""
+kolumnowe przechowywanie obserwacji - SightingFrame
+============================================================================
+dlaczego kolumny zamiast List[Sighting]
+1. każdy Sighting + Location to dwa obiekty pydantic ze słownikami i nagłówkami
+   - przy milionach wierszy to gigabajty narzutu
+2. kolumny numpy: jeden ciągły bufor na pole (8 bajtów na wartość)
+3. napisy (city/state/country/comments) kodowane słownikowo - każdy unikalny
+   napis trzymany raz, w wierszu tylko kod int32
+
+obiekty Sighting budujemy dopiero na żądanie (get/take) - materializacja
+"""
+
+_SHAPES: List[UFOShape] = list(UFOShape)
+_SHAPE_CODES: Dict[UFOShape, int] = {shape: code for code, shape in enumerate(_SHAPES)}
+
+ColumnValue = Union[np.ndarray, List[str]]
+
+
+class NumericColumn:
+    """
+    rosnąca kolumna numpy (amortyzowane O(1) append, jak list)
+    - bufor podwajany przy przepełnieniu
+    - view() zwraca widok bez kopiowania
+    """
+    def __init__(self, dtype, capacity: int = 1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    @classmethod
+    def from_array(cls, arr: np.ndarray) -> 'NumericColumn':
+        """
+        kolumna na istniejącej tablicy (np. widok mmap) - bez kopiowania
+        - pierwszy append i tak przepełnia bufor, a np.resize robi zapisywalną kopię
+        """
+        col = cls.__new__(cls)
+        col._data = arr
+        col._size = len(arr)
+        return col
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value) -> None:
+        if self._size == len(self._data):
+            self._data = np.resize(self._data, max(1024, len(self._data) * 2))
+        self._data[self._size] = value
+        self._size += 1
+
+    def view(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def item(self, i: int):
+        """pojedyncza wartość jako skalar Pythona (bez obiektu numpy)"""
+        if not -self._size <= i < self._size:
+            raise IndexError(f'indeks poza zakresem: {i}')
+        return self._data.item(i % self._size)
+
+
+class StringColumn:
+    """
+    kolumna napisów kodowana słownikowo (dictionary encoding)
+    - values: lista unikalnych napisów, codes: int32 (-1 = None)
+    - powtarzające się miasta/stany/kraje zajmują miejsce tylko raz
+    """
+    def __init__(self):
+        self.values: List[str] = []
+        self._lookup: Optional[Dict[str, int]] = {}
+        self.codes = NumericColumn(np.int32)
+
+    @classmethod
+    def from_arrays(cls, values: List[str], codes: np.ndarray) -> 'StringColumn':
+        """
+        kolumna z gotowego słownika i kodów (np. ze snapshotu)
+        - słownik odwrotny (napis -> kod) budujemy dopiero przy pierwszym encode
+        """
+        col = cls.__new__(cls)
+        col.values = values
+        col._lookup = None
+        col.codes = NumericColumn.from_array(codes)
+        return col
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def encode(self, value: Optional[str]) -> int:
+        """kod napisu (dopisuje nowy napis do słownika)"""
+        if value is None:
+            return -1
+        if self._lookup is None:
+            self._lookup = {v: code for code, v in enumerate(self.values)}
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self._lookup[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value: Optional[str]) -> None:
+        self.codes.append(self.encode(value))
+
+    def get(self, i: int) -> Optional[str]:
+        code = self.codes.item(i)
+        return None if code < 0 else self.values[code]
+
+
+class SightingFrame:
+    """
+    kolumnowy magazyn obserwacji - ten sam interfejs co ListStorage
+    ============================================================================
+    kolumny:
+    - datetime_us: int64 (mikrosekundy od epoki, UTC)
+    - duration / latitude / longitude: float64 (NaN = None)
+    - shape: uint8 (kod UFOShape)
+    - raw_id: int64 (-1 = None)
+    - city / state / country / comments: StringColumn (kody int32)
+
+    interfejs magazynu (używany przez SightingRepository):
+    - append(s) -> id, extend(sightings), get(id), take(ids), index_rows(), comment_texts(), __len__, __iter__
+    - category_codes(name) - kody kolumny do wektorowej budowy indeksów (from_storage)
+    """
+    def __init__(self, sightings: Iterable[Sighting] = ()):
+        self.datetime_us = NumericColumn(np.int64)
+        self.duration = NumericColumn(np.float64)
+        self.latitude = NumericColumn(np.float64)
+        self.longitude = NumericColumn(np.float64)
+        self.shape = NumericColumn(np.uint8)
+        self.raw_id = NumericColumn(np.int64)
+        self.city = StringColumn()
+        self.state = StringColumn()
+        self.country = StringColumn()
+        self.comments = StringColumn()
+        for s in sightings:
+            self.append(s)
+
+    _NUMERIC = ('datetime_us', 'duration', 'latitude', 'longitude', 'shape', 'raw_id')
+    _STRINGS = ('city', 'state', 'country', 'comments')
+
+    def to_columns(self) -> Dict[str, ColumnValue]:
+        """
+        kolumny jako słownik tablic / list napisów (np. do zapisu w colfile)
+        - napisy: '<nazwa>.values' (słownik) + '<nazwa>.codes' (int32)
+        """
+        columns: Dict[str, ColumnValue] = {name: getattr(self, name).view() for name in self._NUMERIC}
+        for name in self._STRINGS:
+            col: StringColumn = getattr(self, name)
+            columns[f'{name}.values'] = col.values
+            columns[f'{name}.codes'] = col.codes.view()
+        return columns
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, ColumnValue]) -> 'SightingFrame':
+        """
+        frame z gotowych kolumn (odwrotność to_columns) - tablice nie są kopiowane
+        """
+        frame = cls.__new__(cls)
+        for name in cls._NUMERIC:
+            setattr(frame, name, NumericColumn.from_array(columns[name]))
+        for name in cls._STRINGS:
+            setattr(frame, name, StringColumn.from_arrays(list(columns[f'{name}.values']), columns[f'{name}.codes']))
+        return frame
+
+    def __len__(self) -> int:
+        return len(self.datetime_us)
+
+    def __iter__(self) -> Iterator[Sighting]:
+        return (self.get(i) for i in range(len(self)))
+
+    def append(self, s: Sighting) -> int:
+        """
+        dodanie obserwacji - rozbicie na kolumny
+        - zwraca id wiersza (pozycję w kolumnach)
+        """
+        loc = s.location
+        idx = len(self)
+        self.datetime_us.append(datetime_to_us(s.datetime_utc))
+        self.duration.append(np.nan if s.duration_seconds is None else s.duration_seconds)
+        self.latitude.append(np.nan if loc.latitude is None else loc.latitude)
+        self.longitude.append(np.nan if loc.longitude is None else loc.longitude)
+        self.shape.append(_SHAPE_CODES[s.shape])
+        self.raw_id.append(-1 if s.raw_id is None else s.raw_id)
+        self.city.append(loc.city)
+        self.state.append(loc.state)
+        self.country.append(loc.country)
+        self.comments.append(s.comments)
+        return idx
+
+    def extend(self, sightings: Iterable[Sighting]) -> None:
+        for s in sightings:
+            self.append(s)
+
+    def get(self, i: int) -> Sighting:
+        """
+        materializacja jednego wiersza do Sighting
+        - model_construct - dane były zwalidowane przy dodawaniu, nie walidujemy drugi raz
+        """
+        duration = self.duration.item(i)
+        lat = self.latitude.item(i)
+        lon = self.longitude.item(i)
+        raw_id = self.raw_id.item(i)
+        loc = Location.model_construct(
+            city=self.city.get(i),
+            state=self.state.get(i),
+            country=self.country.get(i),
+            # NaN != NaN - szybszy test braku wartości niż np.isnan na skalarze
+            latitude=None if lat != lat else lat,
+            longitude=None if lon != lon else lon,
+        )
+        return Sighting.model_construct(
+            datetime_utc=us_to_datetime(self.datetime_us.item(i)),
+            duration_seconds=None if duration != duration else duration,
+            comments=self.comments.get(i),
+            location=loc,
+            shape=_SHAPES[self.shape.item(i)],
+            raw_id=None if raw_id < 0 else raw_id,
+        )
+
+    def take(self, ids: Iterable[int]) -> List[Sighting]:
+        """materializacja wielu wierszy (w kolejności ids)"""
+        return [self.get(i) for i in ids]
+
+    def index_rows(self) -> Iterator[IndexRow]:
+        """
+        pola potrzebne indeksom repository - prosto z kolumn, bez materializacji Sighting
+        - tolist() zamienia całe kolumny na obiekty Pythona jednym wywołaniem w C
+        """
+        def decode(col: StringColumn) -> List[Optional[str]]:
+            values = col.values
+            return [None if c < 0 else values[c] for c in col.codes.view().tolist()]
+        def floats(col: NumericColumn) -> List[Optional[float]]:
+            return [None if v != v else v for v in col.view().tolist()]
+        shapes = [_SHAPES[c] for c in self.shape.view().tolist()]
+        columns = zip(shapes, decode(self.city), decode(self.state), decode(self.country),
+                      self.datetime_us.view().tolist(), floats(self.latitude), floats(self.longitude),
+                      decode(self.comments))
+        for idx, row in enumerate(columns):
+            yield IndexRow(idx, *row)
+
+    def category_codes(self, name: str) -> Tuple[np.ndarray, Sequence]:
+        """
+        kolumna kategorialna jako (kody wierszy int64, słownik wartości), -1 = None
+        - shape: kody UFOShape, city / state / country / comments: słownik StringColumn
+        - indeksy repository grupują wiersze po kodach zamiast dekodować każdy wiersz
+        """
+        if name == 'shape':
+            return self.shape.view().astype(np.int64), _SHAPES
+        if name not in self._STRINGS:
+            raise ValueError(f'{name!r} nie jest kolumną kategorialną (dostępne: shape, {", ".join(self._STRINGS)})')
+        col: StringColumn = getattr(self, name)
+        return col.codes.view().astype(np.int64), col.values
+
+    def comment_texts(self) -> List[Optional[str]]:
+        """kolumna comments jako lista napisów (dla indeksu tekstowego repository)"""
+        values = self.comments.values
+        return [None if c < 0 else values[c] for c in self.comments.codes.view().tolist()]
+
+    def nbytes(self) -> int:
+        """
+        przybliżony rozmiar kolumn numerycznych i kodów w bajtach
+        (bez słowników napisów)
+        """
+        numeric = (self.datetime_us, self.duration, self.latitude, self.longitude, self.shape, self.raw_id)
+        strings = (self.city, self.state, self.country, self.comments)
+        return sum(c.view().nbytes for c in numeric) + sum(c.codes.view().nbytes for c in strings)
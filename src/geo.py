@@ -0,0 +1,219 @@
+from array import array
+from collections import defaultdict
+from math import asin, cos, degrees, floor, pi, radians, sin, sqrt
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import heapq
+
+"""
+indeks geograficzny - siatka komórek (grid bucket map)
+============================================================================
+dlaczego siatka
+1. Location.latitude/longitude były tylko walidowane, nigdy nie służyły do wyszukiwania
+2. mapa (dashboard) liczyła haversine po wszystkich obserwacjach przy każdym przesunięciu
+3. siatka cell_deg x cell_deg stopni: zapytanie sprawdza tylko komórki, które
+   mogą zawierać wynik, a dokładny dystans liczy tylko dla ich punktów
+
+komórka trzyma trzy zwarte tablice (array): id, lat, lon - bez obiektów na punkt
+
+budowa wsadowa z kolumn numpy (add_columns, np. SightingFrame ze snapshotu):
+komórki liczone wektorowo, punkty grupowane sortowaniem po kluczu komórki
+"""
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """odległość po wielkim kole (km) między dwoma punktami"""
+    p1, p2 = radians(lat1), radians(lat2)
+    dlat = p2 - p1
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(p1) * cos(p2) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+class _Cell:
+    __slots__ = ('ids', 'lats', 'lons')
+
+    def __init__(self):
+        self.ids = array('q')
+        self.lats = array('d')
+        self.lons = array('d')
+
+
+class GridIndex:
+    """
+    siatka komórek z id obserwacji
+    ============================================================================
+    zapytania (zwracają id):
+    - in_bbox - prostokąt lat/lon (także przez antypołudnik, gdy min_lon > max_lon),
+      wynik w kolejności dodania
+    - within_radius - okrąg o promieniu km, wynik posortowany po odległości
+    - nearest - k najbliższych (rozszerzanie pierścieni komórek + dokładne zapytanie promieniem)
+    """
+    def __init__(self, cell_deg: float = 1.0):
+        if not 0 < cell_deg <= 90:
+            raise ValueError(f'cell_deg musi być w zakresie (0, 90]: {cell_deg}')
+        self.cell_deg = cell_deg
+        self._n_lat = int(round(180 / cell_deg))
+        self._n_lon = int(round(360 / cell_deg))
+        self._cells: Dict[Tuple[int, int], _Cell] = defaultdict(_Cell)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _lat_cell(self, lat: float) -> int:
+        return min(self._n_lat - 1, max(0, floor((lat + 90) / self.cell_deg)))
+
+    def _lon_cell(self, lon: float) -> int:
+        return floor((lon + 180) / self.cell_deg) % self._n_lon
+
+    def add(self, idx: int, lat: Optional[float], lon: Optional[float]) -> None:
+        """dodanie punktu - obserwacje bez współrzędnych pomijamy"""
+        if lat is None or lon is None:
+            return
+        cell = self._cells[(self._lat_cell(lat), self._lon_cell(lon))]
+        cell.ids.append(idx)
+        cell.lats.append(lat)
+        cell.lons.append(lon)
+        self._size += 1
+
+    def add_columns(self, ids: Any, lats: Any, lons: Any) -> None:
+        """
+        dodanie punktów z kolumn numpy (id, lat, lon) - NaN = brak współrzędnych
+        - komórki: wektorowe floor-dzielenie (te same wzory co _lat_cell / _lon_cell)
+        - stabilne sortowanie po kluczu komórki - w komórce id zostają w kolejności
+          wejścia, tablice komórki wypełniane raz (frombytes) zamiast append na punkt
+        """
+        import numpy as np
+        ids = np.asarray(ids, dtype=np.int64)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        present = ~(np.isnan(lats) | np.isnan(lons))
+        ids, lats, lons = ids[present], lats[present], lons[present]
+        if not len(ids):
+            return
+        lat_cells = np.clip(np.floor((lats + 90) / self.cell_deg), 0, self._n_lat - 1).astype(np.int64)
+        lon_cells = np.floor((lons + 180) / self.cell_deg).astype(np.int64) % self._n_lon
+        keys = lat_cells * self._n_lon + lon_cells
+        order = np.argsort(keys, kind='stable')
+        keys, ids, lats, lons = keys[order], ids[order], lats[order], lons[order]
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1, [len(keys)])).tolist()
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            cell = self._cells[divmod(int(keys[lo]), self._n_lon)]
+            cell.ids.frombytes(ids[lo:hi].tobytes())
+            cell.lats.frombytes(lats[lo:hi].tobytes())
+            cell.lons.frombytes(lons[lo:hi].tobytes())
+        self._size += len(ids)
+
+    def merge(self, other: 'GridIndex', offset: int = 0) -> None:
+        """
+        dopisanie siatki częściowej - id z other przesunięte o offset
+        - ta sama wielkość komórki, więc komórki scalamy bez ponownego liczenia
+        """
+        if other.cell_deg != self.cell_deg:
+            raise ValueError(f'różne cell_deg siatek: {self.cell_deg} != {other.cell_deg}')
+        for key, src in other._cells.items():
+            cell = self._cells[key]
+            cell.ids.extend(src.ids if not offset else array('q', [i + offset for i in src.ids]))
+            cell.lats.extend(src.lats)
+            cell.lons.extend(src.lons)
+        self._size += other._size
+
+    def _cells_in(self, min_lat: float, max_lat: float, lon_cells: Iterator[int]) -> Iterator[_Cell]:
+        lon_cells = list(lon_cells)
+        for i in range(self._lat_cell(min_lat), self._lat_cell(max_lat) + 1):
+            for j in lon_cells:
+                cell = self._cells.get((i, j))
+                if cell is not None:
+                    yield cell
+
+    def _lon_range(self, min_lon: float, max_lon: float) -> Iterator[int]:
+        """komórki długości od min_lon do max_lon (na wschód, z zawinięciem)"""
+        first, last = self._lon_cell(min_lon), self._lon_cell(max_lon)
+        if max_lon - min_lon >= 360 - self.cell_deg or (min_lon > max_lon and first == last):
+            # pełne okrążenie (także zawinięty zakres zaczynający i kończący się w tej samej komórce)
+            return iter(range(self._n_lon))
+        count = (last - first) % self._n_lon + 1
+        return ((first + k) % self._n_lon for k in range(count))
+
+    def in_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[int]:
+        """
+        id punktów w prostokącie (granice włącznie), rosnąco (kolejność dodania)
+        - min_lon > max_lon oznacza prostokąt przechodzący przez antypołudnik (180°)
+        - komórki zwracają id w kolejności siatki, więc wynik sortujemy
+        """
+        wraps = min_lon > max_lon
+        result: List[int] = []
+        for cell in self._cells_in(min_lat, max_lat, self._lon_range(min_lon, max_lon)):
+            for idx, lat, lon in zip(cell.ids, cell.lats, cell.lons):
+                if not min_lat <= lat <= max_lat:
+                    continue
+                inside = (lon >= min_lon or lon <= max_lon) if wraps else (min_lon <= lon <= max_lon)
+                if inside:
+                    result.append(idx)
+        result.sort()
+        return result
+
+    def within_radius(self, lat: float, lon: float, km: float) -> List[Tuple[float, int]]:
+        """
+        (odległość km, id) punktów w promieniu km, posortowane po odległości
+
+        prostokąt ograniczający okrąg na sferze:
+        - szerokość: lat +/- km / R
+        - długość: lon +/- asin(sin(km / R) / cos(lat)); gdy okrąg obejmuje biegun - wszystkie długości
+        """
+        dist = km / EARTH_RADIUS_KM
+        dlat = degrees(dist)
+        min_lat, max_lat = lat - dlat, lat + dlat
+        if min_lat <= -90 or max_lat >= 90 or dist >= 1.5:
+            lon_cells = iter(range(self._n_lon))
+        else:
+            ratio = sin(dist) / cos(radians(lat))
+            if ratio >= 1:
+                lon_cells = iter(range(self._n_lon))
+            else:
+                dlon = degrees(asin(ratio))
+                lon_cells = self._lon_range(lon - dlon, lon + dlon)
+        found: List[Tuple[float, int]] = []
+        for cell in self._cells_in(max(-90.0, min_lat), min(90.0, max_lat), lon_cells):
+            for idx, plat, plon in zip(cell.ids, cell.lats, cell.lons):
+                d = haversine_km(lat, lon, plat, plon)
+                if d <= km:
+                    found.append((d, idx))
+        found.sort()
+        return found
+
+    def nearest(self, lat: float, lon: float, k: int = 10) -> List[Tuple[float, int]]:
+        """
+        k najbliższych punktów: (odległość km, id)
+
+        1. rozszerzamy pierścienie komórek wokół punktu aż zbierzemy k kandydatów
+        2. k-ty dystans jest górnym ograniczeniem - dokładne within_radius z tym
+           promieniem daje poprawny wynik także przy biegunach i antypołudniku
+        """
+        if k < 1 or not self._size:
+            return []
+        if k >= self._size:
+            return self.within_radius(lat, lon, pi * EARTH_RADIUS_KM)[:k]
+        ci, cj = self._lat_cell(lat), self._lon_cell(lon)
+        candidates: List[Tuple[float, int]] = []
+        visited: Set[Tuple[int, int]] = set()
+        r = 0
+        # k < liczba punktów, więc pętla kończy się najpóźniej po objęciu całej siatki
+        while len(candidates) < k:
+            for i in range(ci - r, ci + r + 1):
+                if not 0 <= i < self._n_lat:
+                    continue
+                ring_js = range(cj - r, cj + r + 1) if i in (ci - r, ci + r) else (cj - r, cj + r)
+                for j in ring_js:
+                    key = (i, j % self._n_lon)
+                    cell = self._cells.get(key)
+                    if cell is None or key in visited:
+                        continue
+                    visited.add(key)
+                    for idx, plat, plon in zip(cell.ids, cell.lats, cell.lons):
+                        candidates.append((haversine_km(lat, lon, plat, plon), idx))
+            r += 1
+        bound = heapq.nsmallest(k, candidates)[-1][0]
+        return self.within_radius(lat, lon, bound)[:k]
@@ -0,0 +1,187 @@
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .utils import datetime_to_us, us_to_datetime
+
+"""
+indeksy pomocnicze repository
+============================================================================
+- każdy indeks trzyma tylko id wierszy magazynu (int), nie obiekty Sighting
+- aktualizowane przyrostowo w SightingRepository.add / add_many
+- merge(other, offset) - scalenie indeksu częściowego repository (id przesunięte o offset)
+"""
+
+_HOUR_US = 3_600_000_000
+_DAY_US = 24 * _HOUR_US
+
+
+def intersect_sorted(lists: Sequence[Sequence[int]]) -> List[int]:
+    """
+    przecięcie posortowanych list id - od najkrótszej, reszta przez wyszukiwanie binarne
+    - koszt ~ najkrótsza lista * log(dłuższe), nie suma długości
+    """
+    if not lists:
+        return []
+    lists = sorted(lists, key=len)
+    result = list(lists[0])
+    for other in lists[1:]:
+        n = len(other)
+        kept = []
+        for idx in result:
+            pos = bisect_left(other, idx)
+            if pos < n and other[pos] == idx:
+                kept.append(idx)
+        result = kept
+        if not result:
+            break
+    return result
+
+
+class TimeIndex:
+    """
+    posortowany indeks czasu + histogramy
+    ============================================================================
+    dlaczego tak
+    - zapytania "obserwacje między X i Y" bez liniowego przejścia po all()
+    - klucze to mikrosekundy od epoki (int) - bisect na liście liczb
+
+    posortowanie:
+    - dane zwykle przychodzą chronologicznie - wtedy append na koniec (O(1))
+    - wartość spoza kolejności trafia do bufora, bufor scalamy (sort) przy
+      najbliższym zapytaniu - add zostaje tani także dla nieposortowanych danych
+
+    histogramy (Counter, aktualizowane w add):
+    - year, month (1-12), weekday (0 = poniedziałek), hour (0-23)
+    """
+    UNITS = ('year', 'month', 'weekday', 'hour')
+
+    def __init__(self):
+        self._keys: List[int] = []
+        self._ids: List[int] = []
+        self._pending: List[Tuple[int, int]] = []
+        self.histograms: Dict[str, Counter] = {unit: Counter() for unit in self.UNITS}
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._pending)
+
+    def add(self, idx: int, datetime_us: int) -> None:
+        if not self._pending and (not self._keys or datetime_us >= self._keys[-1]):
+            self._keys.append(datetime_us)
+            self._ids.append(idx)
+        else:
+            self._pending.append((datetime_us, idx))
+        dt = us_to_datetime(datetime_us)
+        h = self.histograms
+        h['year'][dt.year] += 1
+        h['month'][dt.month] += 1
+        h['weekday'][dt.weekday()] += 1
+        h['hour'][dt.hour] += 1
+
+    def add_many(self, items: Sequence[Tuple[int, int]]) -> None:
+        """
+        dodanie paczki (idx, datetime_us)
+        - rok / miesiąc / dzień tygodnia zależą tylko od dnia (UTC), godzina to reszta
+          z dzielenia - datetime budujemy raz na dzień, nie na wiersz
+        """
+        days: Counter = Counter()
+        hours: Counter = Counter()
+        for idx, us in items:
+            if not self._pending and (not self._keys or us >= self._keys[-1]):
+                self._keys.append(us)
+                self._ids.append(idx)
+            else:
+                self._pending.append((us, idx))
+            days[us // _DAY_US] += 1
+            hours[us // _HOUR_US % 24] += 1
+        h = self.histograms
+        for day, n in days.items():
+            dt = us_to_datetime(day * _DAY_US)
+            h['year'][dt.year] += n
+            h['month'][dt.month] += n
+            h['weekday'][dt.weekday()] += n
+        h['hour'].update(hours)
+
+    def add_columns(self, ids: Any, keys: Any) -> None:
+        """
+        dodanie kolumn numpy (id, datetime_us) naraz, id rosnące
+        - stabilne sortowanie po czasie - remisy w kolejności id, jak w _flush
+        - histogramy wektorowo: rok / miesiąc z datetime64 dnia, dzień tygodnia
+          z numeru dnia (1970-01-01 to czwartek), godzina z reszty dzielenia
+        """
+        import numpy as np
+        ids = np.asarray(ids, dtype=np.int64)
+        keys = np.asarray(keys, dtype=np.int64)
+        if not len(keys):
+            return
+        order = np.argsort(keys, kind='stable')
+        sorted_keys, sorted_ids = keys[order].tolist(), ids[order].tolist()
+        if not self._pending and (not self._keys or sorted_keys[0] >= self._keys[-1]):
+            self._keys.extend(sorted_keys)
+            self._ids.extend(sorted_ids)
+        else:
+            self._pending.extend(zip(sorted_keys, sorted_ids))
+        days = np.floor_divide(keys, _DAY_US)
+        dates = days.astype('datetime64[D]')
+        units = {
+            'year': dates.astype('datetime64[Y]').astype(np.int64) + 1970,
+            'month': dates.astype('datetime64[M]').astype(np.int64) % 12 + 1,
+            'weekday': (days + 3) % 7,
+            'hour': np.floor_divide(keys, _HOUR_US) % 24,
+        }
+        for unit, values in units.items():
+            found, counts = np.unique(values, return_counts=True)
+            self.histograms[unit].update(dict(zip(found.tolist(), counts.tolist())))
+
+    def merge(self, other: 'TimeIndex', offset: int = 0) -> None:
+        """
+        dopisanie indeksu częściowego - id z other przesunięte o offset
+        - zakres czasu other za naszym końcem: sklejenie list
+        - w przeciwnym razie do bufora, scalenie (sort dwóch serii) przy zapytaniu
+        """
+        other._flush()
+        ids = other._ids if not offset else [i + offset for i in other._ids]
+        if not self._pending and (not self._keys or not other._keys or other._keys[0] >= self._keys[-1]):
+            self._keys.extend(other._keys)
+            self._ids.extend(ids)
+        else:
+            self._pending.extend(zip(other._keys, ids))
+        for unit, counter in other.histograms.items():
+            self.histograms[unit].update(counter)
+
+    def _flush(self) -> None:
+        """scalenie bufora z posortowaną częścią (timsort wykorzystuje istniejące serie)"""
+        if not self._pending:
+            return
+        merged = list(zip(self._keys, self._ids)) + self._pending
+        merged.sort()
+        self._keys = [k for k, _ in merged]
+        self._ids = [i for _, i in merged]
+        self._pending = []
+
+    def range_ids(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[int]:
+        """
+        id obserwacji z przedziału [start, end) w kolejności czasu
+        - None = brak ograniczenia z tej strony
+        - dwa wyszukiwania binarne + wycinek listy: O(log n + wynik)
+        """
+        lo, hi = self._bounds(start, end)
+        return self._ids[lo:hi]
+
+    def count(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> int:
+        """liczba obserwacji w [start, end) bez budowania listy - O(log n)"""
+        lo, hi = self._bounds(start, end)
+        return max(0, hi - lo)
+
+    def _bounds(self, start: Optional[datetime], end: Optional[datetime]) -> Tuple[int, int]:
+        self._flush()
+        lo = 0 if start is None else bisect_left(self._keys, datetime_to_us(start))
+        hi = len(self._keys) if end is None else bisect_left(self._keys, datetime_to_us(end))
+        return lo, max(lo, hi)
+
+    def histogram(self, unit: str) -> Dict[int, int]:
+        """histogram dla jednostki czasu, posortowany po kluczu"""
+        if unit not in self.histograms:
+            raise ValueError(f'nieznana jednostka histogramu: {unit} (dostępne: {", ".join(self.UNITS)})')
+        return dict(sorted(self.histograms[unit].items()))
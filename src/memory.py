@@ -0,0 +1,59 @@
+from enum import Enum
+from typing import Any, Dict, Iterable
+import sys
+
+from .models import Location, Sighting
+
+"""
+pomiar pamięci obserwacji - ile daje współdzielenie obiektów (flyweight)
+============================================================================
+- sys.getsizeof dla obiektów Sighting / Location, ich __dict__, napisów, dat i liczb
+- shared: każdy obiekt liczony raz (po id) - faktyczne zużycie
+- unshared: każde wystąpienie liczone osobno - zużycie, gdyby każdy wiersz
+  miał własne Location, napisy i daty (nic nie byłoby współdzielone)
+- singletony (None, bool, członkowie UFOShape) pomijamy
+
+pomiar jest przybliżony (bez narzutu list i indeksów repository), ale
+obie liczby liczone są tak samo, więc różnica pokazuje oszczędność
+"""
+
+_SKIP = (type(None), bool, Enum)
+
+
+def _parts(obj: Any) -> Iterable[Any]:
+    """obiekt pydantic + jego __dict__, zbiór pól i wartości"""
+    yield obj
+    yield obj.__dict__
+    yield obj.__pydantic_fields_set__
+    for value in obj.__dict__.values():
+        if isinstance(value, Location):
+            yield from _parts(value)
+        elif not isinstance(value, _SKIP):
+            yield value
+
+
+def measure_sightings(sightings: Iterable[Sighting]) -> Dict[str, int]:
+    """
+    zużycie pamięci przez obiekty obserwacji
+    - rows, locations (unikalne obiekty Location), strings (unikalne obiekty str)
+    - shared_bytes / unshared_bytes / saved_bytes
+    """
+    seen = set()
+    shared = unshared = rows = locations = strings = 0
+    getsizeof = sys.getsizeof
+    for s in sightings:
+        rows += 1
+        for obj in _parts(s):
+            size = getsizeof(obj)
+            unshared += size
+            key = id(obj)
+            if key in seen:
+                continue
+            seen.add(key)
+            shared += size
+            if type(obj) is str:
+                strings += 1
+            elif type(obj) is Location:
+                locations += 1
+    return {'rows': rows, 'locations': locations, 'strings': strings,
+            'shared_bytes': shared, 'unshared_bytes': unshared, 'saved_bytes': unshared - shared}
@@ -1,7 +1,7 @@
 from __future__ import annotations
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator
 from enum import Enum
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Type, TypeVar
 from datetime import datetime
 
 """
@@ -15,6 +15,13 @@ spełnienie wytycznych:
 """
 
 
+# zakresy walidacji - jedyne źródło reguł dla walidatorów pydantic
+# i dla wsadowej walidacji kolumn (bulk.validate_columns)
+LATITUDE_RANGE = (-90.0, 90.0)
+LONGITUDE_RANGE = (-180.0, 180.0)
+MIN_DURATION_SECONDS = 0.0
+
+
 class UFOShape(Enum):
     """
     enum do reprezentacji kształtów UFO
@@ -69,7 +76,12 @@ class Location(BaseModel):
     pydantic validators:
     - automatyczna walidacja zakresu współrzędnych przy tworzeniu obiektu
     - lepsze komunikaty błędów niż ręczne sprawdzanie
+
+    frozen: jeden obiekt Location dzielą obserwacje z tego samego miejsca (PARSE_CACHE),
+    więc zmiana pola w jednej obserwacji zmieniłaby wszystkie - przypisanie rzuca ValidationError
     """
+    model_config = ConfigDict(frozen=True)
+
     city: Optional[str]
     state: Optional[str]
     country: Optional[str]
@@ -86,7 +98,7 @@ class Location(BaseModel):
         """
         if v is None:
             return v
-        if not (-90.0 <= v <= 90.0):
+        if not (LATITUDE_RANGE[0] <= v <= LATITUDE_RANGE[1]):
             raise ValueError(f'latitude poza zakresem: {v}')
         return v
 
@@ -100,7 +112,7 @@ class Location(BaseModel):
         """
         if v is None:
             return v
-        if not (-180.0 <= v <= 180.0):
+        if not (LONGITUDE_RANGE[0] <= v <= LONGITUDE_RANGE[1]):
             raise ValueError(f'longitude poza zakresem: {v}')
         return v
 
@@ -141,8 +153,42 @@ class Sighting(BaseModel):
         if v is None:
             return v
         try:
-            if v < 0:
-                raise ValueError(f'duration_seconds musi być >= 0: {v}')
+            if v < MIN_DURATION_SECONDS:
+                raise ValueError(f'duration_seconds musi być >= {MIN_DURATION_SECONDS:g}: {v}')
         except TypeError:
             raise ValueError(f'duration_seconds musi być liczbą: {v}')
         return v
+
+
+_M = TypeVar('_M', bound=BaseModel)
+
+
+def trusted_constructor(cls: Type[_M]) -> Callable[[Dict[str, Any]], _M]:
+    """
+    konstruktor dla danych już sprawdzonych (np. wsadowo w bulk.py)
+    ============================================================================
+    - bez walidatorów - ten sam stan obiektu co model_construct
+    - model_construct przy każdym wywołaniu przechodzi po polach (aliasy, domyślne,
+      fields_set) - przy setkach tysięcy obiektów to koszt większy niż oszczędzona walidacja
+    - tutaj zbiór pól liczony raz, values staje się __dict__ obiektu (bez kopiowania)
+    - values musi zawierać wszystkie pola modelu (słownik przechodzi na własność obiektu)
+    - modele z model_post_init / extra='allow' / RootModel - zwykłe model_construct
+    """
+    if cls.__pydantic_post_init__ or cls.__pydantic_root_model__ or cls.model_config.get('extra') == 'allow':
+        construct = cls.model_construct
+
+        def build_constructed(values: Dict[str, Any]) -> _M:
+            return construct(**values)
+        return build_constructed
+
+    fields_set = set(cls.model_fields)
+    new, setattr_ = cls.__new__, object.__setattr__
+
+    def build(values: Dict[str, Any]) -> _M:
+        m = new(cls)
+        setattr_(m, '__dict__', values)
+        setattr_(m, '__pydantic_fields_set__', set(fields_set))
+        setattr_(m, '__pydantic_extra__', None)
+        setattr_(m, '__pydantic_private__', None)
+        return m
+    return build
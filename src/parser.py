@@ -1,21 +1,37 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Iterable, List, Optional, Dict, Any
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor
+from collections import deque
+from typing import AsyncIterator, Deque, Iterable, Iterator, List, Optional, Dict, Any, Sequence, Tuple
+from itertools import islice
 import csv
+import io
+import mmap
+import os
 from pathlib import Path
-from .models import Sighting, Location, UFOShape
-from .utils import parse_datetime_to_utc, parse_duration_seconds
+from time import perf_counter
+from pydantic import ValidationError
+from .models import Location, Sighting, UFOShape, trusted_constructor
+from .metrics import IngestMetrics, timed_iter
+from .cube import DEFAULT_DIMENSIONS
+from .repository import SightingRepository
+from .utils import DATETIME_PARSER, PARSE_CACHE, intern_text, learn_datetime_formats
 import asyncio
 
 """
 parser CSV - async/multithreading
 ============================================================================
-dlaczego dwie implementacje
+dlaczego trzy implementacje
 1. ThreadPoolExecutor (load_sightings_threaded) - prosty multithreading
 2. Async/await (load_sightings_async) - pełna asynchroniczność z aiofiles
+3. ProcessPoolExecutor (load_sightings_parallel) - prawdziwa równoległość na wielu rdzeniach
+4. iter_sightings / aiter_sightings - strumieniowe generatory pod wszystkimi loaderami
+5. iter_sightings_mmap / load_sightings_mmap - plik dzielony na zakresy bajtów,
+   każdy proces czyta i tokenizuje swój zakres (równoległe I/O i parsowanie CSV)
 
 use cases
 - threaded: szybsze dla średnich plików, łatwiejsze w debugowaniu
 - async: lepsze dla bardzo dużych plików (nie blokuje I/O)
+- parallel: parsowanie jest CPU-bound (dateutil, regex, pydantic) - GIL blokuje wątki,
+  procesy skalują się z liczbą rdzeni
 
 wytyczne:
 - wykorzystanie async/multithreading
@@ -32,7 +48,7 @@ except Exception:
     AsyncDictReader = None
 
 
-def parse_row_to_sighting(row: Dict[str, Any]) -> Optional[Sighting]:
+def parse_row_to_sighting(row: Dict[str, Any], raw_id: Optional[int] = None) -> Optional[Sighting]:
     """
     konwersja wiersza CSV na obiekt Sighting
     
@@ -49,22 +65,75 @@ def parse_row_to_sighting(row: Dict[str, Any]) -> Optional[Sighting]:
     zwięzłość kodu
     - używamy dict.get() zamiast if-ów
     - UFOShape.normalize() zamiast długich warunków
+    - datetime/duration/shape przez PARSE_CACHE - każda unikalna wartość parsowana raz
+    - Location przez PARSE_CACHE.location - obiekt współdzielony przez obserwacje z tego samego miejsca
+
+    raw_id:
+    - numer rekordu w pliku źródłowym (1 = pierwszy wiersz danych po nagłówku)
+    - loadery wypełniają go same, dzięki temu obserwację da się odnaleźć w CSV
     """
-    dt = parse_datetime_to_utc(row.get('datetime') or row.get('date_time') or row.get('time'))
+    dt = PARSE_CACHE.datetime(_row_datetime(row))
     if dt is None:
         # bez daty nie możemy utworzyć obserwacji - pomijamy wiersz
         return None
-    dur = parse_duration_seconds(row.get('duration (seconds)') or row.get('duration_seconds') or row.get('duration'))
-    loc = Location(
-        city=row.get('city') or None,
-        state=row.get('state') or None,
-        country=row.get('country') or None,
-        latitude=float(row['latitude']) if row.get('latitude') else None,
-        longitude=float(row['longitude']) if row.get('longitude') else None,
+    dur = PARSE_CACHE.duration(_row_duration(row))
+    return _build_sighting(row, dt, dur, raw_id)
+
+
+def _row_datetime(row: Dict[str, Any]) -> Optional[str]:
+    return row.get('datetime') or row.get('date_time') or row.get('time')
+
+
+def _row_duration(row: Dict[str, Any]) -> Optional[str]:
+    return row.get('duration (seconds)') or row.get('duration_seconds') or row.get('duration')
+
+
+def _build_sighting(row: Dict[str, Any], dt, dur: Optional[float], raw_id: Optional[int]) -> Sighting:
+    """
+    Location + Sighting z gotowych daty i czasu trwania (walidacja pydantic)
+    - wspólne dla parse_row_to_sighting i wersji z metrykami
+    """
+    # flyweight - identyczne miejsca dzielą jeden obiekt Location i te same napisy
+    loc = PARSE_CACHE.location(
+        row.get('city') or None,
+        row.get('state') or None,
+        row.get('country') or None,
+        float(row['latitude']) if row.get('latitude') else None,
+        float(row['longitude']) if row.get('longitude') else None,
     )
-    shape = UFOShape.normalize(row.get('shape'))
-    s = Sighting(datetime_utc=dt, duration_seconds=dur, comments=row.get('comments') or None, location=loc, shape=shape)
-    return s
+    shape = PARSE_CACHE.shape(row.get('shape'))
+    return Sighting(datetime_utc=dt, duration_seconds=dur, comments=row.get('comments') or None, location=loc, shape=shape, raw_id=raw_id)
+
+
+def _parse_row_measured(row: Dict[str, Any], raw_id: Optional[int], metrics: IngestMetrics) -> Optional[Sighting]:
+    """
+    parse_row_to_sighting z pomiarem etapów i powodem odrzucenia
+    - używane tylko gdy loader dostał metrics - ścieżka bez metryk się nie zmienia
+    """
+    t0 = perf_counter()
+    dt = PARSE_CACHE.datetime(_row_datetime(row))
+    t1 = perf_counter()
+    metrics.timers['datetime'] += t1 - t0
+    if dt is None:
+        metrics.reject('datetime')
+        return None
+    dur = PARSE_CACHE.duration(_row_duration(row))
+    t2 = perf_counter()
+    metrics.timers['duration'] += t2 - t1
+    try:
+        return _build_sighting(row, dt, dur, raw_id)
+    except ValidationError as e:
+        # pole z pierwszego błędu walidatora: latitude / longitude / duration_seconds
+        loc = e.errors()[0].get('loc') or ('error',)
+        metrics.reject(str(loc[0]))
+    except ValueError:
+        # float() na współrzędnej, która nie jest liczbą
+        metrics.reject('coordinates')
+    except Exception:
+        metrics.reject('error')
+    finally:
+        metrics.timers['validation'] += perf_counter() - t2
+    return None
 
 
 def read_csv(path: str) -> Iterable[Dict[str, Any]]:
@@ -80,36 +149,226 @@ def read_csv(path: str) -> Iterable[Dict[str, Any]]:
             yield row
 
 
-def load_sightings_threaded(path: str, max_workers: int = 8) -> List[Sighting]:
+def read_csv_columns(path: str, columns: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+    """
+    kolumnowe czytanie CSV - słownik nazwa kolumny -> lista surowych wartości
+
+    - wejście dla wsadowych parserów (parse_datetimes_batch, parse_durations_batch)
+    - columns ogranicza czytanie do potrzebnych kolumn (None = wszystkie)
+    - brakujące wartości jako '' (tak jak csv.DictReader dla pustych pól)
+    - puste rekordy (same '\n') pomijane jak w csv.DictReader - raw_id zgodne z loaderami
+    """
+    with open(path, newline='', encoding='utf-8') as fh:
+        reader = csv.reader(fh)
+        header = next(reader, [])
+        wanted = list(header) if columns is None else [c for c in columns if c in header]
+        result: Dict[str, List[str]] = {name: [] for name in wanted}
+        sinks = [(result[name].append, header.index(name)) for name in wanted]
+        for row in reader:
+            if not row:
+                continue
+            n = len(row)
+            for append, pos in sinks:
+                append(row[pos] if pos < n else '')
+    return result
+
+
+def _chunked(rows: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    podział strumienia wierszy na paczki (chunki) o stałym rozmiarze
+    - islice zamiast ręcznego licznika
+    - ostatnia paczka może być krótsza
+    - razem z paczką zwracamy numer jej pierwszego rekordu (raw_id)
+    """
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size musi być >= 1: {chunk_size}')
+    it = iter(rows)
+    start = 1
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _parse_chunk(start: int, rows: List[Dict[str, Any]]) -> List[Sighting]:
+    """
+    parsowanie całej paczki wierszy w jednym wywołaniu
+
+    - funkcja na poziomie modułu - musi dać się zpicklować dla ProcessPoolExecutor
+    - jeden task na paczkę zamiast jednego na wiersz (mniejszy narzut IPC)
+    - raw_id = start + pozycja w paczce
+    - błędne wiersze pomijamy, tak jak w pozostałych loaderach
+    """
+    sightings: List[Sighting] = []
+    for i, row in enumerate(rows):
+        try:
+            res = parse_row_to_sighting(row, raw_id=start + i)
+        except Exception:
+            continue
+        if res is not None:
+            sightings.append(res)
+    return sightings
+
+
+def _parse_chunk_measured(start: int, rows: List[Dict[str, Any]]) -> Tuple[List[Sighting], IngestMetrics]:
+    """
+    _parse_chunk z metrykami - każda paczka ma własne liczniki (bez blokad między wątkami),
+    wynik wraca razem z obserwacjami i jest scalany w wątku / procesie głównym
+    """
+    metrics = IngestMetrics()
+    sightings: List[Sighting] = []
+    for i, row in enumerate(rows):
+        res = _parse_row_measured(row, start + i, metrics)
+        if res is not None:
+            sightings.append(res)
+    metrics.rows_read = len(rows)
+    metrics.rows_loaded = len(sightings)
+    return sightings, metrics
+
+
+def _iter_in_order(ex: Executor, chunks: Iterable[Tuple[int, List[Dict[str, Any]]]], max_in_flight: int,
+                   metrics: Optional[IngestMetrics] = None) -> Iterator[Sighting]:
+    """
+    zgłaszanie paczek do executora z ograniczonym oknem (bounded in-flight window)
+
+    dlaczego tak
+    ================================================================
+    - jeden Future na paczkę zamiast jednego na wiersz - mniej bookkeepingu
+    - w kolejce czeka najwyżej max_in_flight paczek - pamięć nie rośnie z rozmiarem pliku
+    - odbieramy wyniki FIFO (deque.popleft) - kolejność wyników = kolejność w pliku
+    """
+    if max_in_flight < 1:
+        raise ValueError(f'max_in_flight musi być >= 1: {max_in_flight}')
+    if metrics is not None:
+        yield from _iter_in_order_measured(ex, chunks, max_in_flight, metrics)
+        return
+    pending: Deque[Future] = deque()
+    for start, rows in chunks:
+        pending.append(ex.submit(_parse_chunk, start, rows))
+        if len(pending) >= max_in_flight:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _iter_in_order_measured(ex: Executor, chunks: Iterable[Tuple[int, List[Dict[str, Any]]]], max_in_flight: int,
+                            metrics: IngestMetrics) -> Iterator[Sighting]:
+    """_iter_in_order dla paczek z metrykami - liczniki paczek scalane przy odbiorze"""
+    pending: Deque[Future] = deque()
+
+    def drain() -> List[Sighting]:
+        sightings, chunk_metrics = pending.popleft().result()
+        metrics.merge(chunk_metrics)
+        return sightings
+
+    for start, rows in chunks:
+        pending.append(ex.submit(_parse_chunk_measured, start, rows))
+        if len(pending) >= max_in_flight:
+            yield from drain()
+    while pending:
+        yield from drain()
+
+
+# liczba pierwszych wierszy pliku, na których loader uczy się formatów dat
+LEARN_SAMPLE = 1000
+
+
+def _start_load(path: str) -> Tuple[str, ...]:
+    """
+    początek ładowania: czyste cache normalizatorów i parser dat wyuczony na
+    pierwszych LEARN_SAMPLE wierszach pliku (nic nie przechodzi z poprzedniego ładowania)
+    - zwraca wyuczone formaty (dla procesów roboczych)
+    """
+    PARSE_CACHE.clear()
+    rows = read_csv(path)
+    try:
+        sample = [_row_datetime(row) for row in islice(rows, LEARN_SAMPLE)]
+    finally:
+        rows.close()
+    return tuple(learn_datetime_formats(sample))
+
+
+def _init_worker(formats: Tuple[str, ...]) -> None:
+    """inicjalizacja procesu puli - formaty dat wyuczone w procesie głównym"""
+    PARSE_CACHE.clear()
+    DATETIME_PARSER.reset(formats)
+
+
+def _make_executor(max_workers: Optional[int], processes: bool, formats: Tuple[str, ...] = ()) -> Executor:
+    """
+    wybór executora: pula procesów (CPU-bound parsowanie) albo pula wątków
+    - procesy dostają formaty dat przez initializer (wątki współdzielą DATETIME_PARSER)
+    """
+    if processes:
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(formats,))
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def iter_sightings(path: str, max_workers: Optional[int] = 8, chunk_size: int = 500,
+                   max_in_flight: Optional[int] = None, processes: bool = False,
+                   metrics: Optional[IngestMetrics] = None) -> Iterator[Sighting]:
+    """
+    strumieniowe ładowanie - generator obserwacji ze stałym zużyciem pamięci
+
+    dlaczego generator
+    ================================================================
+    1. plik 10 GB nie mieści się w pamięci jako List[Sighting]
+    2. obserwacje oddajemy od razu po sparsowaniu paczki - można je przekazać dalej
+       (SightingRepository.add, eksport) bez budowania listy
+    3. backpressure: kolejna paczka jest czytana dopiero gdy w locie jest mniej niż
+       max_in_flight paczek, a generator stoi gdy klient nie pobiera wyników
+
+    pamięć ~ max_in_flight * chunk_size wierszy, niezależnie od rozmiaru pliku
+
+    parametry:
+    - max_workers: liczba wątków/procesów (None = os.cpu_count())
+    - chunk_size: liczba wierszy w jednej paczce
+    - max_in_flight: limit paczek w locie (domyślnie 2 * liczba workerów)
+    - processes: True = ProcessPoolExecutor (omija GIL), False = ThreadPoolExecutor
+    - metrics: IngestMetrics do wypełnienia (czasy etapów, odrzucone wiersze) - None = bez pomiarów
+    """
+    workers = max_workers or os.cpu_count() or 1
+    window = max_in_flight or workers * 2
+    started = perf_counter()
+    # cache normalizatorów i formaty dat są per-load
+    formats = _start_load(path)
+    rows = read_csv(path) if metrics is None else timed_iter(read_csv(path), metrics)
+    chunks = _chunked(rows, chunk_size)
+    ex = _make_executor(workers, processes, formats)
+    try:
+        yield from _iter_in_order(ex, chunks, window, metrics)
+    finally:
+        # przerwana iteracja (break, wyjątek) - nie czekamy na niepotrzebne paczki
+        ex.shutdown(wait=True, cancel_futures=True)
+        if metrics is not None:
+            metrics.wall_seconds += perf_counter() - started
+
+
+def load_sightings_threaded(path: str, max_workers: int = 8, chunk_size: int = 500,
+                            max_in_flight: Optional[int] = None,
+                            metrics: Optional[IngestMetrics] = None) -> List[Sighting]:
     """
     multithreading - ładowanie z równoległym parsowaniem
     
     threadpoolexecutor
     ================================================================
-    1. parsowanie wielu wierszy równocześnie (8 wątków = 8x szybciej) - zawsze wymaga dotunowania do wątków cpu - można przedobrzyć
-    2. proste w użyciu - submit() + as_completed()
-    
-    zwięzłość kodu:
-    - list comprehension: [ex.submit(...) for row in rows]
-    - pomijamy błędne wiersze bez przerywania procesu
+    1. parsowanie wielu paczek wierszy równocześnie - zawsze wymaga dotunowania do wątków cpu - można przedobrzyć
+    2. plik czytamy strumieniowo (iter_sightings), w pamięci jest tylko okno max_in_flight paczek
+    3. wyniki wracają w kolejności pliku, raw_id = numer rekordu
+
+    parametry:
+    - chunk_size: liczba wierszy w jednym tasku
+    - max_in_flight: limit paczek w locie (domyślnie max_workers * 2)
+    - metrics: opcjonalne IngestMetrics wypełniane w trakcie ładowania
     """
-    rows = list(read_csv(path))
-    sightings: List[Sighting] = []
-    with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        # tworzenie tasków dla wszystkich wierszy
-        futures = [ex.submit(parse_row_to_sighting, row) for row in rows]
-        for fut in as_completed(futures):
-            try:
-                res = fut.result()
-                if res is not None:
-                    sightings.append(res)
-            except Exception:
-                # błędne wiersze pomijamy - nie przerywamy całego procesu
-                continue
-    return sightings
+    return list(iter_sightings(path, max_workers, chunk_size, max_in_flight, metrics=metrics))
 
 
-async def load_sightings_async(path: str, max_workers: int = 8) -> List[Sighting]:
+async def load_sightings_async(path: str, max_workers: int = 8, chunk_size: int = 500,
+                              max_in_flight: Optional[int] = None, processes: bool = False,
+                              metrics: Optional[IngestMetrics] = None) -> List[Sighting]:
     """
     async/await - pełna asynchroniczność
     
@@ -117,56 +376,313 @@ async def load_sightings_async(path: str, max_workers: int = 8) -> List[Sighting
     ================================================================
     1. aiofiles - nie blokuje I/O podczas czytania pliku
     2. AsyncDictReader - strumieniowe czytanie CSV bez blokowania
-    3. Semaphore - kontrola równoległości (backpressure)
+    3. wiersze czytamy blokami (chunk_size) i cały blok idzie do executora
+       jednym run_in_executor - zamiast Task + Semaphore + executor na każdy wiersz
     4. run_in_executor - parsowanie CPU-bound w tle bez blokowania event loop
+       (processes=True - pula procesów, omija GIL)
 
     Do użytku przy bardzo dużych plikach lub bardzo dużej liczbie plików.
     
     mechanizm backpressure:
-    - Semaphore(max_workers * 2) kaganiec liczby zadań
-    - gdy tasks >= max_workers * 10, czekamy na zakończenie części
-    
+    - deque oczekujących bloków, najwyżej max_in_flight (domyślnie max_workers * 2)
+    - czekamy zawsze na najstarszy blok - bez przebudowy listy pending przy każdym wybudzeniu
+    - wyniki w kolejności pliku, raw_id = numer rekordu
+    """
+    return [s async for s in aiter_sightings(path, max_workers, chunk_size, max_in_flight, processes, metrics)]
+
+
+def load_sightings_parallel(path: str, max_workers: Optional[int] = None, chunk_size: int = 2000,
+                            max_in_flight: Optional[int] = None,
+                            metrics: Optional[IngestMetrics] = None) -> List[Sighting]:
+    """
+    multiprocessing - ładowanie z parsowaniem w puli procesów
+
+    processpoolexecutor
+    ================================================================
+    1. parsowanie (dateutil, regex, pydantic) jest CPU-bound - wątki trzyma GIL
+    2. każdy proces ma własny interpreter, więc skalujemy się z liczbą rdzeni
+    3. wiersze wysyłamy paczkami (chunk_size) - koszt pickle/IPC rozkłada się na wiele wierszy
+    4. ograniczone okno paczek w locie - nie wczytujemy całego pliku do kolejki executora
+
+    parametry:
+    - max_workers: liczba procesów (None = os.cpu_count())
+    - chunk_size: liczba wierszy w jednej paczce
+    - max_in_flight: limit paczek w locie (domyślnie 2 * liczba procesów)
+    - metrics: opcjonalne IngestMetrics - liczniki z procesów wracają z każdą paczką i są sumowane
+
+    zwraca tę samą List[Sighting] co pozostałe loadery (w kolejności pliku)
+    """
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size musi być >= 1: {chunk_size}')
+    return list(iter_sightings(path, max_workers, chunk_size, max_in_flight, processes=True, metrics=metrics))
+
+
+def _index_chunk(start: int, rows: List[Dict[str, Any]], cube_dims: Tuple[str, ...]) -> SightingRepository:
+    """paczka -> repository częściowe (parsowanie i indeksy w procesie roboczym)"""
+    return SightingRepository(_parse_chunk(start, rows), cube_dims=cube_dims)
+
+
+def load_repository_parallel(path: str, max_workers: Optional[int] = None, chunk_size: int = 20000,
+                             max_in_flight: Optional[int] = None,
+                             cube_dims: Sequence[str] = DEFAULT_DIMENSIONS) -> SightingRepository:
+    """
+    repository z indeksami budowanymi równolegle z parsowaniem
+
+    repository częściowe
+    ================================================================
+    1. proces roboczy parsuje paczkę i od razu buduje dla niej SightingRepository
+    2. wyniki odbieramy w kolejności pliku i scalamy (merge) - id przesunięte o
+       rozmiar dotychczasowego repository, indeksów nie liczymy drugi raz
+    3. etap indeksowania skaluje się z liczbą procesów tak jak parsowanie
+
+    - większy chunk_size niż w load_sightings_parallel: repository częściowe
+      (obserwacje + indeksy) wraca przez pickle, mniej paczek = mniej narzutu
+    - zwraca SightingRepository z obserwacjami w kolejności pliku
+    """
+    workers = max_workers or os.cpu_count() or 1
+    window = max_in_flight or workers * 2
+    dims = tuple(cube_dims)
+    formats = _start_load(path)
+    repo = SightingRepository(cube_dims=dims)
+    ex = _make_executor(workers, True, formats)
+    pending: Deque[Future] = deque()
+    try:
+        for start, rows in _chunked(read_csv(path), chunk_size):
+            pending.append(ex.submit(_index_chunk, start, rows, dims))
+            if len(pending) >= window:
+                repo.merge(pending.popleft().result())
+        while pending:
+            repo.merge(pending.popleft().result())
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+    return repo
+
+
+async def aiter_sightings(path: str, max_workers: Optional[int] = 8, chunk_size: int = 500,
+                          max_in_flight: Optional[int] = None, processes: bool = False,
+                          metrics: Optional[IngestMetrics] = None) -> AsyncIterator[Sighting]:
+    """
+    async odpowiednik iter_sightings - async generator obserwacji
+
+    async
+    ================================================================
+    1. AsyncDictReader czyta wiersze bez blokowania event loop
+    2. wiersze zbieramy w paczki i wysyłamy całą paczkę przez run_in_executor
+    3. deque oczekujących paczek - czekamy na najstarszą (FIFO), więc kolejność = kolejność pliku
+    4. backpressure: najwyżej max_in_flight paczek w locie, a czytanie stoi
+       dopóki klient nie pobierze wyników (`async for`)
     """
     if aiofiles is None or AsyncDictReader is None:
         raise ImportError('aiofiles i aiocsv są wymagane dla async loadera')
-
-    sightings: List[Sighting] = []
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size musi być >= 1: {chunk_size}')
+    workers = max_workers or os.cpu_count() or 1
+    window = max_in_flight or workers * 2
+    started = perf_counter()
+    parse = _parse_chunk if metrics is None else _parse_chunk_measured
     loop = asyncio.get_running_loop()
+    # próbka do uczenia formatów dat - krótki odczyt początku pliku poza event loop
+    formats = await loop.run_in_executor(None, _start_load, path)
+    ex = _make_executor(workers, processes, formats)
+    pending: Deque[asyncio.Future] = deque()
 
-    # semaphore ogranicza liczbę równoczesnych zadań - zapobiega zużyciu pamięci
-    semaphore = asyncio.Semaphore(max_workers * 2)
-
-    async def _parse_row_async(row: Dict[str, Any]):
-        """parsowanie w executorze - nie blokuje event loop"""
-        async with semaphore:
-            return await loop.run_in_executor(None, parse_row_to_sighting, row)
-
-    tasks: List[asyncio.Task] = []
-
-    async with aiofiles.open(path, mode='r', encoding='utf-8', newline='') as afp:
-        async for row in AsyncDictReader(afp):
-            # harmonogramujemy parsowanie w tle (nie czekamy na wynik)
-            task = asyncio.create_task(_parse_row_async(row))
-            tasks.append(task)
-            # backpressure: gdy zbierze się zbyt wiele zadań, czekamy na część
-            if len(tasks) >= max_workers * 10:
-                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
-                for d in done:
-                    try:
-                        res = d.result()
-                        if res is not None:
-                            sightings.append(res)
-                    except Exception:
-                        continue
-                tasks = list(pending)
-
-    # zbieramy pozostałe zadania po zakończeniu czytania pliku
-    if tasks:
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        for r in results:
-            if isinstance(r, Exception):
-                continue
-            if r is not None:
-                sightings.append(r)
+    async def drain() -> List[Sighting]:
+        result = await pending.popleft()
+        if metrics is None:
+            return result
+        sightings, chunk_metrics = result
+        metrics.merge(chunk_metrics)
+        return sightings
 
-    return sightings
+    try:
+        async with aiofiles.open(path, mode='r', encoding='utf-8', newline='') as afp:
+            start, chunk = 1, []
+            # przy metrykach: czas czytania = czas zbierania paczki (bez oczekiwania na wyniki)
+            read_started = perf_counter()
+            async for row in AsyncDictReader(afp):
+                chunk.append(row)
+                if len(chunk) < chunk_size:
+                    continue
+                if metrics is not None:
+                    metrics.timers['read'] += perf_counter() - read_started
+                pending.append(loop.run_in_executor(ex, parse, start, chunk))
+                start, chunk = start + len(chunk), []
+                if len(pending) >= window:
+                    for s in await drain():
+                        yield s
+                read_started = perf_counter()
+            if metrics is not None:
+                metrics.timers['read'] += perf_counter() - read_started
+            if chunk:
+                pending.append(loop.run_in_executor(ex, parse, start, chunk))
+        while pending:
+            for s in await drain():
+                yield s
+    finally:
+        for fut in pending:
+            fut.cancel()
+        ex.shutdown(wait=False, cancel_futures=True)
+        if metrics is not None:
+            metrics.wall_seconds += perf_counter() - started
+
+
+def _next_record_start(mm: mmap.mmap, pos: int, in_quotes: bool) -> int:
+    """
+    pierwsza granica rekordu za pozycją pos
+
+    - in_quotes: czy pos leży wewnątrz pola w cudzysłowie (nieparzysta liczba '"' od początku danych)
+    - '\n' kończy rekord tylko przy parzystej liczbie cudzysłowów - nowa linia
+      w cudzysłowie (np. wieloliniowe comments) należy do pola
+    - podwojony cudzysłów ("") nie zmienia parzystości, więc nie wymaga osobnej obsługi
+    """
+    while True:
+        nl = mm.find(b'\n', pos)
+        if nl == -1:
+            return len(mm)
+        in_quotes ^= bool(mm[pos:nl].count(b'"') & 1)
+        if not in_quotes:
+            return nl + 1
+        pos = nl + 1
+
+
+# rekord zakresu w zwartej postaci do IPC: (raw_id, datetime_utc, duration_seconds, comments, nr Location, shape)
+_RangeRecord = Tuple[int, Any, Optional[float], Optional[str], int, UFOShape]
+_LOCATION_FIELDS = ('city', 'state', 'country', 'latitude', 'longitude')
+
+
+def _parse_range(path: str, start: int, end: int, fieldnames: List[str], align_start: bool,
+                 start_in_quotes: Optional[bool] = None
+                 ) -> Tuple[bool, int, int, List[Tuple], List[_RangeRecord]]:
+    """
+    parsowanie zakresu bajtów w procesie roboczym
+
+    - zakres [start, end) jest przybliżony - proces sam wyrównuje oba końce do
+      granic rekordów (_next_record_start), sąsiednie zakresy wyrównują się identycznie
+    - parzystość cudzysłowów na starcie nieznana (start_in_quotes=None): zgadujemy, że
+      pierwsza nowa linia za start kończy rekord (nowe linie w polach są rzadkie);
+      konsument sprawdza zgadnięcie sumą cudzysłowów poprzednich zakresów
+    - mmap - system operacyjny wczytuje tylko strony z tego zakresu
+    - wynik w zwartej postaci - krotki zamiast obiektów pydantic (pickle obiektów
+      kosztował więcej niż samo parsowanie), Location raz na unikalne miejsce
+
+    zwraca (przyjęta parzystość na starcie, liczba '"' w [start, end), liczba rekordów,
+    miejsca (pola Location), rekordy z lokalnym raw_id od 1)
+    """
+    with open(path, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        quotes = mm[start:end].count(b'"')
+        if not align_start:
+            start_in_quotes = False
+        elif start_in_quotes is None:
+            nl = mm.find(b'\n', start)
+            start_in_quotes = nl != -1 and bool(mm[start:nl].count(b'"') & 1)
+        end_in_quotes = start_in_quotes ^ bool(quotes & 1)
+        first = _next_record_start(mm, start, start_in_quotes) if align_start else start
+        last = _next_record_start(mm, end, end_in_quotes) if end < len(mm) else len(mm)
+        if first >= last:
+            return start_in_quotes, quotes, 0, [], []
+        text = mm[first:last].decode('utf-8')
+    rows = list(csv.DictReader(io.StringIO(text, newline=''), fieldnames=fieldnames))
+    locations: Dict[int, int] = {}
+    places: List[Tuple] = []
+    records: List[_RangeRecord] = []
+    for s in _parse_chunk(1, rows):
+        loc = s.location
+        # PARSE_CACHE.location współdzieli obiekty, więc id() wystarcza jako klucz miejsca
+        pos = locations.get(id(loc))
+        if pos is None:
+            pos = locations[id(loc)] = len(places)
+            places.append((loc.city, loc.state, loc.country, loc.latitude, loc.longitude))
+        records.append((s.raw_id, s.datetime_utc, s.duration_seconds, s.comments, pos, s.shape))
+    return start_in_quotes, quotes, len(rows), places, records
+
+
+def iter_sightings_mmap(path: str, max_workers: Optional[int] = None, range_size: int = 16 * 1024 * 1024,
+                        max_in_flight: Optional[int] = None) -> Iterator[Sighting]:
+    """
+    równoległe czytanie CSV podzielonego na zakresy bajtów (mmap)
+
+    dlaczego
+    ================================================================
+    1. read_csv to jeden sekwencyjny csv.DictReader - etap czytania się nie skaluje
+    2. plik dzielimy na zakresy po range_size bajtów, każdy proces czyta (mmap),
+       dekoduje i tokenizuje tylko swój zakres
+    3. cudzysłowy (nowe linie w comments): proces zgaduje parzystość na starcie
+       zakresu i zwraca liczbę '"' w zakresie; konsument zna prawdziwą parzystość
+       (suma po poprzednich zakresach) i tylko przy złym zgadnięciu parsuje zakres
+       ponownie - bez osobnego przebiegu po pliku
+    4. procesy zwracają krotki, obiekty budujemy w procesie głównym
+       (trusted_constructor, Location przez PARSE_CACHE)
+
+    kiedy się opłaca
+    - zysk tylko przy wielu rdzeniach i dużych plikach: parsowanie dzieli się na
+      procesy, ale budowa obiektów i IPC zostają w procesie głównym; na 1-2 rdzeniach
+      load_sightings_threaded jest szybszy (dlatego nie jest domyślnym loaderem)
+
+    wyniki w kolejności pliku, raw_id = globalny numer rekordu
+    pamięć ~ max_in_flight * range_size
+    """
+    if range_size < 1:
+        raise ValueError(f'range_size musi być >= 1: {range_size}')
+    with open(path, 'rb') as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data_start = _next_record_start(mm, 0, False)
+            header = mm[:data_start].decode('utf-8')
+    fieldnames = next(csv.reader(io.StringIO(header, newline='')), [])
+    bounds = list(range(data_start, size, range_size)) + [size]
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+    workers = max_workers or os.cpu_count() or 1
+    window = max_in_flight or workers * 2
+    formats = _start_load(path)
+    build_location, build_sighting = trusted_constructor(Location), trusted_constructor(Sighting)
+    shared: Dict[Tuple, Location] = {}
+
+    ex = _make_executor(workers, True, formats)
+    try:
+        pending: Deque[Tuple[int, Future]] = deque()
+        offset = 0
+        in_quotes = False
+
+        def drain() -> Iterator[Sighting]:
+            nonlocal offset, in_quotes
+            i, fut = pending.popleft()
+            guessed, quotes, count, places, records = fut.result()
+            if guessed != in_quotes:
+                # złe zgadnięcie (start w polu z nową linią) - ponownie ze znaną parzystością
+                start, end = ranges[i]
+                guessed, quotes, count, places, records = ex.submit(
+                    _parse_range, path, start, end, fieldnames, True, in_quotes).result()
+            in_quotes ^= bool(quotes & 1)
+            # miejsca już sprawdzone w procesie roboczym - bez ponownej walidacji;
+            # flyweight jak w PARSE_CACHE - jeden Location na miejsce we wszystkich zakresach
+            locations = []
+            for city, state, country, lat, lon in places:
+                key = (intern_text(city), intern_text(state), intern_text(country), lat, lon)
+                loc = shared.get(key)
+                if loc is None:
+                    loc = shared[key] = build_location(dict(zip(_LOCATION_FIELDS, key)))
+                locations.append(loc)
+            for raw_id, dt, dur, comments, pos, shape in records:
+                yield build_sighting({'datetime_utc': dt, 'duration_seconds': dur, 'comments': comments,
+                                      'location': locations[pos], 'shape': shape, 'raw_id': raw_id + offset})
+            offset += count
+
+        for i, (start, end) in enumerate(ranges):
+            pending.append((i, ex.submit(_parse_range, path, start, end, fieldnames, i > 0)))
+            if len(pending) >= window:
+                yield from drain()
+        while pending:
+            yield from drain()
+    finally:
+        # przerwana iteracja (break, close) - zakresy w kolejce anulujemy zamiast je parsować
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+def load_sightings_mmap(path: str, max_workers: Optional[int] = None, range_size: int = 16 * 1024 * 1024,
+                        max_in_flight: Optional[int] = None) -> List[Sighting]:
+    """
+    lista obserwacji z równoległego czytnika zakresów bajtów (iter_sightings_mmap)
+    """
+    return list(iter_sightings_mmap(path, max_workers, range_size, max_in_flight))
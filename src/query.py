@@ -0,0 +1,77 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, model_validator
+
+from .models import Sighting, UFOShape
+from .utils import datetime_to_us
+
+"""
+zapytania złożone - opis predykatów dla SightingRepository.query
+============================================================================
+dlaczego
+1. pytania typu "trójkąty w US w latach 90. trwające ponad 5 minut" wymagały
+   filtrowania w Pythonie wyniku by_shape (materializacja wszystkich trójkątów)
+2. SightingQuery tylko opisuje warunki - wykonanie (wybór indeksów, przecięcie
+   list id) robi repository, bo to ono zna swoje indeksy
+3. pydantic - walidacja warunków (np. pusty przedział) przy tworzeniu zapytania
+
+wszystkie warunki łączone przez AND, None = brak warunku
+"""
+
+
+class SightingQuery(BaseModel):
+    """
+    predykaty zapytania
+    ============================================================================
+    - shape: kształt
+    - country / state / city: miejsce (porównanie po normalize_place)
+    - start / end: przedział czasu [start, end), daty "naive" = UTC
+    - min_duration / max_duration: czas trwania w sekundach, granice włącznie
+      (obserwacje bez czasu trwania nie spełniają warunku)
+    - text: zapytanie pełnotekstowe do comments (składnia search_comments)
+    - limit: najwyżej limit wyników (w kolejności dodania)
+    """
+    shape: Optional[UFOShape] = None
+    country: Optional[str] = None
+    state: Optional[str] = None
+    city: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    min_duration: Optional[float] = None
+    max_duration: Optional[float] = None
+    text: Optional[str] = None
+    limit: Optional[int] = None
+
+    @model_validator(mode='after')
+    def check_ranges(self):
+        if self.start is not None and self.end is not None and datetime_to_us(self.start) > datetime_to_us(self.end):
+            raise ValueError('start musi być <= end')
+        if self.min_duration is not None and self.max_duration is not None and self.min_duration > self.max_duration:
+            raise ValueError('min_duration musi być <= max_duration')
+        if self.limit is not None and self.limit < 0:
+            raise ValueError('limit nie może być ujemny')
+        return self
+
+    def has_time(self) -> bool:
+        return self.start is not None or self.end is not None
+
+    def has_duration(self) -> bool:
+        return self.min_duration is not None or self.max_duration is not None
+
+    def match_time(self, s: Sighting) -> bool:
+        """warunek czasu na gotowym obiekcie (gdy indeks czasu nie był użyty do kandydatów)"""
+        us = datetime_to_us(s.datetime_utc)
+        if self.start is not None and us < datetime_to_us(self.start):
+            return False
+        return self.end is None or us < datetime_to_us(self.end)
+
+    def match_duration(self, s: Sighting) -> bool:
+        """warunek czasu trwania - nie ma dla niego indeksu, zawsze sprawdzany na końcu"""
+        d = s.duration_seconds
+        if d is None:
+            return False
+        if self.min_duration is not None and d < self.min_duration:
+            return False
+        return self.max_duration is None or d <= self.max_duration
@@ -1,6 +1,17 @@
-from typing import List, Dict, Iterable, Tuple
-from collections import defaultdict
-from .models import Sighting, UFOShape, Location
+from typing import Any, Callable, List, Dict, Iterable, Iterator, NamedTuple, Optional, Protocol, Sequence, Tuple
+from collections import Counter, defaultdict
+from datetime import datetime
+import io
+from itertools import islice
+from .models import Sighting, UFOShape
+from .indexes import TimeIndex, intersect_sorted
+from .geo import GridIndex
+from .text_index import InvertedIndex
+from .query import SightingQuery
+from .cube import CountCube, DEFAULT_DIMENSIONS
+from .export import export_sightings, write_json_array
+from .memory import measure_sightings
+from .utils import datetime_to_us
 
 """
 repository pattern - SOLID
@@ -30,6 +41,122 @@ D - dependency inversion:
 """
 
 
+def normalize_place(value: Optional[str]) -> Optional[str]:
+    """
+    normalizacja nazwy miejsca do klucza indeksu
+    - strip + lower, puste -> None (brak wpisu w indeksie)
+    """
+    if not value:
+        return None
+    value = value.strip().lower()
+    return value or None
+
+
+def _place_normalizer() -> Callable[[Optional[str]], Optional[str]]:
+    """
+    normalize_place z pamięcią wyników - przy budowie wsadowej nazwy miejsc
+    powtarzają się, więc każdą unikalną normalizujemy raz
+    """
+    names: Dict[Optional[str], Optional[str]] = {}
+
+    def place(value: Optional[str]) -> Optional[str]:
+        key = names.get(value, names)
+        if key is names:
+            key = names[value] = normalize_place(value)
+        return key
+    return place
+
+
+def _group_ids(keys: Any) -> List[Tuple[int, List[int]]]:
+    """
+    grupowanie numerów wierszy po kluczu (tablica numpy int, -1 = brak klucza)
+    - (klucz, rosnące id) w kolejności pierwszego wystąpienia klucza - jak przy
+      dopisywaniu wiersz po wierszu do defaultdict(list)
+    - stabilne sortowanie po kluczu, granice grup z np.diff
+    """
+    import numpy as np
+    ids = np.flatnonzero(keys >= 0)
+    if not len(ids):
+        return []
+    order = np.argsort(keys[ids], kind='stable')
+    ids, sorted_keys = ids[order], keys[ids][order]
+    bounds = [0] + (np.flatnonzero(np.diff(sorted_keys)) + 1).tolist() + [len(ids)]
+    groups = [(int(sorted_keys[lo]), ids[lo:hi].tolist()) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    groups.sort(key=lambda group: group[1][0])
+    return groups
+
+
+class IndexRow(NamedTuple):
+    """
+    pola obserwacji potrzebne indeksom repository
+    - magazyn kolumnowy podaje je prosto z kolumn, bez budowania obiektów Sighting
+    """
+    idx: int
+    shape: UFOShape
+    city: Optional[str]
+    state: Optional[str]
+    country: Optional[str]
+    datetime_us: int
+    latitude: Optional[float]
+    longitude: Optional[float]
+    comments: Optional[str]
+
+    @classmethod
+    def from_sighting(cls, idx: int, s: Sighting) -> 'IndexRow':
+        loc = s.location
+        return cls(idx, s.shape, loc.city, loc.state, loc.country, datetime_to_us(s.datetime_utc),
+                   loc.latitude, loc.longitude, s.comments)
+
+
+class SightingStorage(Protocol):
+    """
+    interfejs magazynu obserwacji (lista w pamięci, kolumny numpy, ...)
+    - append zwraca id (pozycję), indeksy repository trzymają tylko id
+    """
+    def append(self, s: Sighting) -> int: ...
+    def extend(self, sightings: Iterable[Sighting]) -> None: ...
+    def get(self, i: int) -> Sighting: ...
+    def take(self, ids: Iterable[int]) -> List[Sighting]: ...
+    def index_rows(self) -> Iterator[IndexRow]: ...
+    def comment_texts(self) -> List[Optional[str]]: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[Sighting]: ...
+
+
+class ListStorage:
+    """
+    domyślny magazyn - zwykła lista obiektów Sighting
+    """
+    def __init__(self):
+        self._items: List[Sighting] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Sighting]:
+        return iter(self._items)
+
+    def append(self, s: Sighting) -> int:
+        self._items.append(s)
+        return len(self._items) - 1
+
+    def extend(self, sightings: Iterable[Sighting]) -> None:
+        self._items.extend(sightings)
+
+    def get(self, i: int) -> Sighting:
+        return self._items[i]
+
+    def take(self, ids: Iterable[int]) -> List[Sighting]:
+        items = self._items
+        return [items[i] for i in ids]
+
+    def index_rows(self) -> Iterator[IndexRow]:
+        return (IndexRow.from_sighting(i, s) for i, s in enumerate(self._items))
+
+    def comment_texts(self) -> List[Optional[str]]:
+        return [s.comments for s in self._items]
+
+
 class SightingRepository:
     """
     repository przechowujące obserwacje UFO z indeksami do szybkiego wyszukiwania
@@ -41,19 +168,44 @@ class SightingRepository:
     
     indeksy:
     =========
-    _by_shape: Dict[UFOShape, List[Sighting]] - szybkie wyszukiwanie po kształcie
-    _by_location: Dict[str, List[Sighting]] - szybkie wyszukiwanie po lokalizacji
-    _all: List[Sighting] - wszystkie obserwacje
+    _by_shape: Dict[UFOShape, List[int]] - szybkie wyszukiwanie po kształcie
+    _by_country / _by_state / _by_city: Dict[str, List[int]] - osobne indeksy miejsc
+    _by_state_country: Dict[Tuple[str, str], List[int]] - stan w konkretnym kraju
+    _by_time: TimeIndex - posortowany indeks czasu + histogramy rok/miesiąc/dzień tygodnia/godzina
+    _by_geo: GridIndex - siatka komórek lat/lon dla zapytań przestrzennych
+    _by_text: InvertedIndex - słowa z comments -> posortowane id; budowany leniwie
+              (_text_index) przy pierwszym zapytaniu tekstowym, None do tego czasu
+    _cube: CountCube - liczniki shape x country x state x year (cube_dims: także month / hour);
+           wypełniana leniwie (_count_cube) przy pierwszym count_by / top_groups
+    _store: SightingStorage - wszystkie obserwacje (ListStorage lub SightingFrame)
     
     dlaczego indeksy?
     - zamiast przeszukiwać listę za każdym razem (O(n)), używamy słowników (O(1))
+    - indeksy trzymają id wierszy (int), nie obiekty - magazyn można wymienić
+      na kolumnowy (frame.SightingFrame) bez zmian w API
+
+    budowa wsadowa i scalanie:
+    ==========================
+    - add_many / from_batches - indeksy wypełniane paczkami (INDEX_BLOCK wierszy)
+    - merge(other) - repository częściowe (np. zbudowane w osobnym procesie dla
+      fragmentu pliku) dopisane na koniec: id z other przesunięte o len(self)
     """
-    def __init__(self, sightings: Iterable[Sighting] = ()): 
-        self._by_shape: Dict[UFOShape, List[Sighting]] = defaultdict(list)
-        self._by_location: Dict[str, List[Sighting]] = defaultdict(list)
-        self._all: List[Sighting] = []
-        for s in sightings:
-            self.add(s)
+    INDEX_BLOCK = 65536
+
+    def __init__(self, sightings: Iterable[Sighting] = (), storage: Optional[SightingStorage] = None,
+                 cube_dims: Sequence[str] = DEFAULT_DIMENSIONS):
+        self._by_shape: Dict[UFOShape, List[int]] = defaultdict(list)
+        self._by_country: Dict[str, List[int]] = defaultdict(list)
+        self._by_state: Dict[str, List[int]] = defaultdict(list)
+        self._by_city: Dict[str, List[int]] = defaultdict(list)
+        self._by_state_country: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._by_time = TimeIndex()
+        self._by_geo = GridIndex()
+        self._by_text: Optional[InvertedIndex] = None
+        self._cube = CountCube(cube_dims)
+        self._cube_ready = False
+        self._store: SightingStorage = storage if storage is not None else ListStorage()
+        self.add_many(sightings)
 
     def add(self, s: Sighting) -> None:
         """
@@ -62,10 +214,190 @@ class SightingRepository:
         - wszystkie indeksy zawsze spójne
         - łatwe testowanie (dodaj 1 obiekt, sprawdź czy jest we wszystkich indeksach)
         """
-        self._all.append(s)
-        self._by_shape[s.shape].append(s)
-        key = f"{s.location.city or ''},{s.location.state or ''},{s.location.country or ''}".lower()
-        self._by_location[key].append(s)
+        idx = self._store.append(s)
+        self._index(IndexRow.from_sighting(idx, s))
+
+    def add_many(self, sightings: Iterable[Sighting]) -> int:
+        """
+        dodanie wielu obserwacji naraz - zwraca liczbę dodanych
+        - magazyn dostaje całą paczkę (extend), indeksy wypełniane blokami:
+          normalizacja nazw miejsc raz na unikalną wartość, czas i kostka zliczeń raz na blok
+        """
+        added = 0
+        it = iter(sightings)
+        while True:
+            block = list(islice(it, self.INDEX_BLOCK))
+            if not block:
+                return added
+            start = len(self._store)
+            self._store.extend(block)
+            self._index_many([IndexRow.from_sighting(start + i, s) for i, s in enumerate(block)])
+            added += len(block)
+
+    def _index(self, row: IndexRow) -> None:
+        """
+        wpisanie jednego wiersza do indeksów (add)
+        """
+        idx = row.idx
+        self._by_shape[row.shape].append(idx)
+        # klucze znormalizowane (strip + lower) - "US", " us" i "us" to ten sam kraj
+        country = normalize_place(row.country)
+        state = normalize_place(row.state)
+        city = normalize_place(row.city)
+        if country:
+            self._by_country[country].append(idx)
+        if state:
+            self._by_state[state].append(idx)
+            if country:
+                self._by_state_country[(state, country)].append(idx)
+        if city:
+            self._by_city[city].append(idx)
+        self._by_time.add(idx, row.datetime_us)
+        self._by_geo.add(idx, row.latitude, row.longitude)
+        if self._by_text is not None:
+            self._by_text.add(idx, row.comments)
+        if self._cube_ready:
+            self._cube.add(row.shape, country, state, row.datetime_us)
+
+    def _index_many(self, rows: Sequence[IndexRow]) -> None:
+        """
+        wpisanie bloku wierszy do indeksów (add_many, from_storage)
+        - te same klucze co _index, nazwy miejsc normalizowane raz na unikalną wartość
+        """
+        place = _place_normalizer()
+        by_shape, by_country, by_state, by_city = self._by_shape, self._by_country, self._by_state, self._by_city
+        by_state_country, geo_add = self._by_state_country, self._by_geo.add
+        text_add = self._by_text.add if self._by_text is not None else None
+        cube_rows = []
+        for row in rows:
+            idx = row.idx
+            by_shape[row.shape].append(idx)
+            country, state, city = place(row.country), place(row.state), place(row.city)
+            if country:
+                by_country[country].append(idx)
+            if state:
+                by_state[state].append(idx)
+                if country:
+                    by_state_country[(state, country)].append(idx)
+            if city:
+                by_city[city].append(idx)
+            geo_add(idx, row.latitude, row.longitude)
+            if text_add is not None:
+                text_add(idx, row.comments)
+            if self._cube_ready:
+                cube_rows.append((row.shape, country, state, row.datetime_us))
+        self._by_time.add_many([(row.idx, row.datetime_us) for row in rows])
+        if cube_rows:
+            self._cube.add_many(cube_rows)
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[Iterable[Sighting]], storage: Optional[SightingStorage] = None,
+                     cube_dims: Sequence[str] = DEFAULT_DIMENSIONS) -> 'SightingRepository':
+        """
+        repository z kolejnych paczek obserwacji (np. wyniki loadera paczka po paczce)
+        """
+        repo = cls(storage=storage, cube_dims=cube_dims)
+        for batch in batches:
+            repo.add_many(batch)
+        return repo
+
+    def merge(self, other: 'SightingRepository') -> None:
+        """
+        dopisanie repository częściowego na koniec tego repository
+        - obserwacje trafiają do naszego magazynu, id z indeksów other przesunięte
+          o dotychczasowy rozmiar (offset) - indeksów nie budujemy od nowa
+        - kolejność jak przy add: najpierw nasze obserwacje, potem other
+        - other musi mieć te same wymiary kostki
+        """
+        if other is self:
+            raise ValueError('nie można scalić repository z samym sobą')
+        if other._cube.dims != self._cube.dims:
+            raise ValueError(f'różne wymiary kostek: {self._cube.dims} != {other._cube.dims}')
+        offset = len(self._store)
+        self._store.extend(other._store)
+        for mine, theirs in ((self._by_shape, other._by_shape), (self._by_country, other._by_country),
+                             (self._by_state, other._by_state), (self._by_city, other._by_city),
+                             (self._by_state_country, other._by_state_country)):
+            for key, ids in theirs.items():
+                mine[key].extend(ids if not offset else [i + offset for i in ids])
+        self._by_time.merge(other._by_time, offset)
+        self._by_geo.merge(other._by_geo, offset)
+        if self._by_text is not None:
+            self._by_text.merge(other._text_index(), offset)
+        if self._cube_ready:
+            self._cube.merge(other._count_cube())
+
+    @classmethod
+    def from_parts(cls, parts: Iterable['SightingRepository']) -> 'SightingRepository':
+        """
+        scalenie repository częściowych w kolejności parts (np. paczek pliku z procesów)
+        - pierwsze repository jest rozszerzane w miejscu i zwracane
+        """
+        it = iter(parts)
+        repo = next(it, None)
+        if repo is None:
+            return cls()
+        for part in it:
+            repo.merge(part)
+        return repo
+
+    @classmethod
+    def from_storage(cls, storage: SightingStorage, cube_dims: Sequence[str] = DEFAULT_DIMENSIONS) -> 'SightingRepository':
+        """
+        repository na już wypełnionym magazynie (np. SightingFrame ze snapshotu)
+        - indeksy budujemy z index_rows() - bez materializacji obiektów Sighting
+        - SightingFrame (np. snapshot): indeksy wprost z kolumn numpy (_index_frame),
+          bez przechodzenia po wierszach w Pythonie
+        """
+        from .frame import SightingFrame
+        repo = cls(storage=storage, cube_dims=cube_dims)
+        if isinstance(storage, SightingFrame):
+            repo._index_frame(storage)
+            return repo
+        rows = iter(storage.index_rows())
+        while True:
+            block = list(islice(rows, cls.INDEX_BLOCK))
+            if not block:
+                return repo
+            repo._index_many(block)
+
+    def _index_frame(self, frame: 'SightingFrame') -> None:
+        """
+        indeksy kształtu, miejsc, czasu i siatki z kolumn SightingFrame (pusty repository)
+        - klucze miejsc normalizowane raz na wartość słownika kolumny, nie na wiersz
+        - wiersze grupowane po kodzie klucza (_group_ids) - te same listy id i ta sama
+          kolejność kluczy co przy _index_many
+        - czas i siatka: TimeIndex.add_columns / GridIndex.add_columns
+        - tekst i kostka zostają leniwe (_text_index, _count_cube)
+        """
+        import numpy as np
+        codes, shapes = frame.category_codes('shape')
+        for code, ids in _group_ids(codes):
+            self._by_shape[shapes[code]] = ids
+        keys: Dict[str, Tuple[Any, List[str]]] = {}
+        for name, index in (('country', self._by_country), ('state', self._by_state), ('city', self._by_city)):
+            codes, values = frame.category_codes(name)
+            labels: Dict[str, int] = {}
+            mapping = [-1 if key is None else labels.setdefault(key, len(labels))
+                       for key in map(normalize_place, values)]
+            # kod -1 (None) wskazuje ostatni element - dopisane -1
+            row_keys = np.append(np.asarray(mapping, dtype=np.int64), -1)[codes]
+            names = list(labels)
+            for key, ids in _group_ids(row_keys):
+                index[names[key]] = ids
+            keys[name] = (row_keys, names)
+        (state_keys, states), (country_keys, countries) = keys['state'], keys['country']
+        pairs = np.where((state_keys >= 0) & (country_keys >= 0), state_keys * len(countries) + country_keys, -1)
+        for key, ids in _group_ids(pairs):
+            state, country = divmod(key, len(countries))
+            self._by_state_country[(states[state], countries[country])] = ids
+        row_ids = np.arange(len(frame))
+        self._by_time.add_columns(row_ids, frame.datetime_us.view())
+        self._by_geo.add_columns(row_ids, frame.latitude.view(), frame.longitude.view())
+
+    def __len__(self) -> int:
+        """liczba obserwacji bez kopiowania listy (all() buduje nową listę)"""
+        return len(self._store)
 
     def all(self) -> List[Sighting]:
         """
@@ -73,7 +405,7 @@ class SightingRepository:
         - chroni wewnętrzny stan repository przed modyfikacją z zewnątrz
         - immutability pattern - bezpieczniejszy kod
         """
-        return list(self._all)
+        return list(self._store)
 
     def by_shape(self, shape: UFOShape) -> List[Sighting]:
         """
@@ -82,54 +414,246 @@ class SightingRepository:
         - shape: UFOShape - IDE podpowiada możliwe wartości
         - -> List[Sighting] - wiadomo co zwraca funkcja
         """
-        return list(self._by_shape.get(shape, []))
+        return self._store.take(self._by_shape.get(shape, []))
+
+    def _lookup(self, index: Dict, key) -> List[Sighting]:
+        # get() zamiast [] - zapytanie o brakujący klucz nie dopisuje go do defaultdict
+        return self._store.take(index.get(key, []))
 
     def by_country(self, country: str) -> List[Sighting]:
         """
         wyszukiwanie po kraju
-        
-        TODO: można ulepszyć używając normalizacji nazw krajów lub geospatial indexing
+        - osobny indeks krajów: O(1) + rozmiar wyniku
+        - dokładne dopasowanie znormalizowanej nazwy ("us" nie pasuje do "aus")
+        """
+        return self._lookup(self._by_country, normalize_place(country))
+
+    def by_state(self, state: str, country: Optional[str] = None) -> List[Sighting]:
+        """
+        wyszukiwanie po stanie, opcjonalnie zawężone do kraju
+        (ten sam skrót stanu może wystąpić w różnych krajach)
+        """
+        if country is None:
+            return self._lookup(self._by_state, normalize_place(state))
+        return self._lookup(self._by_state_country, (normalize_place(state), normalize_place(country)))
+
+    def by_city(self, city: str) -> List[Sighting]:
+        """
+        wyszukiwanie po mieście
+        """
+        return self._lookup(self._by_city, normalize_place(city))
+
+    def by_date_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Sighting]:
+        """
+        obserwacje z przedziału czasu [start, end), posortowane chronologicznie
+        - wyszukiwanie binarne w posortowanym indeksie czasu zamiast przejścia po all()
+        - None = przedział otwarty z tej strony, daty "naive" traktujemy jak UTC
+        """
+        return self._store.take(self._by_time.range_ids(start, end))
+
+    def time_histogram(self, unit: str = 'year') -> Dict[int, int]:
+        """
+        liczba obserwacji w jednostce czasu: 'year', 'month', 'weekday', 'hour'
+        - histogramy aktualizowane przyrostowo w add - odczyt bez liczenia
+        """
+        return self._by_time.histogram(unit)
+
+    def within_radius(self, lat: float, lon: float, km: float) -> List[Sighting]:
+        """
+        obserwacje w promieniu km od punktu, od najbliższej
+        - siatka komórek: haversine liczymy tylko dla punktów z pobliskich komórek
+        """
+        return self._store.take(idx for _, idx in self._by_geo.within_radius(lat, lon, km))
+
+    def in_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[Sighting]:
+        """
+        obserwacje w prostokącie (np. widok mapy), w kolejności dodania
+        - min_lon > max_lon - prostokąt przez antypołudnik
+        """
+        return self._store.take(self._by_geo.in_bbox(min_lat, min_lon, max_lat, max_lon))
+
+    def nearest(self, lat: float, lon: float, k: int = 10) -> List[Sighting]:
+        """
+        k obserwacji najbliższych punktowi, od najbliższej
+        """
+        return self._store.take(idx for _, idx in self._by_geo.nearest(lat, lon, k))
+
+    def search_comments(self, query: str, limit: Optional[int] = None) -> List[Sighting]:
+        """
+        wyszukiwanie pełnotekstowe w comments
+        - "green light" = oba słowa, "green OR orange" = dowolne z nich
+        - wielkość liter i encje HTML (&#44) nie mają znaczenia
+        - wyniki w kolejności dodania, najwyżej limit
+        """
+        return self._store.take(self._text_index().search(query, limit))
+
+    def _text_index(self) -> InvertedIndex:
         """
-        key_suffix = f",,,{country}".lower()
-        results = []
-        for k, v in self._by_location.items():
-            if k.endswith(country.lower()):
-                results.extend(v)
-        return results
+        indeks comments - budowany przy pierwszym zapytaniu tekstowym
+        - tokenizacja to najdroższa część budowy indeksów, a wiele sesji nie szuka w tekście
+        - jednym przebiegiem po kolumnie comments magazynu (InvertedIndex.from_texts),
+          potem aktualizowany przyrostowo w add / add_many / merge
+        """
+        if self._by_text is None:
+            self._by_text = InvertedIndex.from_texts(self._store.comment_texts())
+        return self._by_text
+
+    def _plan(self, q: SightingQuery) -> Tuple[List[Tuple[str, Sequence[int]]], List[str]]:
+        """
+        wybór indeksów dla zapytania
+        - źródła kandydatów: posortowane listy id z indeksów kształtu, miejsc i tekstu
+        - indeks czasu zwraca id w kolejności czasu - sortujemy go tylko gdy jest
+          najbardziej selektywny (liczność znamy z count() bez budowania listy),
+          w przeciwnym razie czas sprawdzamy na końcu razem z czasem trwania
+        - zwraca (źródła od najmniejszego, warunki sprawdzane na obiektach)
+        """
+        sources: List[Tuple[str, Sequence[int]]] = []
+        if q.shape is not None:
+            sources.append(('shape', self._by_shape.get(q.shape, [])))
+        country, state, city = normalize_place(q.country), normalize_place(q.state), normalize_place(q.city)
+        if state and country:
+            sources.append(('state_country', self._by_state_country.get((state, country), [])))
+        elif country:
+            sources.append(('country', self._by_country.get(country, [])))
+        elif state:
+            sources.append(('state', self._by_state.get(state, [])))
+        if city:
+            sources.append(('city', self._by_city.get(city, [])))
+        if q.text is not None:
+            sources.append(('text', self._text_index().search(q.text)))
+        sources.sort(key=lambda src: len(src[1]))
+        residual: List[str] = []
+        if q.has_time():
+            if not sources or self._by_time.count(q.start, q.end) < len(sources[0][1]):
+                sources.insert(0, ('time', sorted(self._by_time.range_ids(q.start, q.end))))
+            else:
+                residual.append('time')
+        if q.has_duration():
+            residual.append('duration')
+        return sources, residual
+
+    def query(self, q: Optional[SightingQuery] = None, **predicates) -> List[Sighting]:
+        """
+        zapytanie złożone - wszystkie warunki łączone przez AND
+        - q: SightingQuery albo te same pola jako argumenty nazwane
+          repo.query(shape=UFOShape.TRIANGLE, country='us', start=datetime(1990, 1, 1),
+                     end=datetime(2000, 1, 1), min_duration=300)
+        - przecięcie list id od najmniejszej, obiekty budujemy tylko dla kandydatów
+        - wynik w kolejności dodania
+        """
+        q = q if q is not None else SightingQuery(**predicates)
+        if q.limit == 0:
+            return []
+        sources, residual = self._plan(q)
+        ids: Sequence[int] = intersect_sorted([ids for _, ids in sources]) if sources else range(len(self._store))
+        if not residual:
+            return self._store.take(ids if q.limit is None else ids[:q.limit])
+        checks = [q.match_time if name == 'time' else q.match_duration for name in residual]
+        result: List[Sighting] = []
+        block = 1024
+        for pos in range(0, len(ids), block):
+            for s in self._store.take(ids[pos:pos + block]):
+                if all(check(s) for check in checks):
+                    result.append(s)
+                    if q.limit is not None and len(result) >= q.limit:
+                        return result
+        return result
+
+    def explain(self, q: Optional[SightingQuery] = None, **predicates) -> Dict[str, Any]:
+        """
+        plan zapytania bez materializacji obiektów
+        - sources: użyte indeksy (nazwa, liczba id) od najbardziej selektywnego
+        - residual: warunki sprawdzane na obiektach po przecięciu
+        - candidates: liczba id po przecięciu
+        """
+        q = q if q is not None else SightingQuery(**predicates)
+        sources, residual = self._plan(q)
+        candidates = len(intersect_sorted([ids for _, ids in sources])) if sources else len(self._store)
+        return {'sources': [(name, len(ids)) for name, ids in sources], 'residual': residual, 'candidates': candidates}
 
     def top_shapes(self, n: int = 10):
         """
         agregacja: najpopularniejsze kształty UFO
-        - list comprehension zamiast pętli for
-        - lambda function w sort()
-        - slice [:n] zamiast oddzielnej pętli
+        - długości list indeksu kształtów - bez kostki, więc także dla cube_dims bez 'shape'
+        - remis: kolejność pierwszego wystąpienia kształtu (jak w kostce)
+        """
+        return Counter({shape: len(ids) for shape, ids in self._by_shape.items() if ids}).most_common(n)
+
+    def _count_cube(self) -> CountCube:
+        """
+        kostka zliczeń - wypełniana przy pierwszym zapytaniu o agregat
+        - jeden przebieg po index_rows() magazynu: nazwy miejsc normalizowane raz na
+          unikalną wartość, wiersze zliczane w komórki wsadowo (CountCube.add_many)
+        - potem aktualizowana przyrostowo w add / add_many / merge
+        """
+        if not self._cube_ready:
+            place = _place_normalizer()
+            self._cube.add_many((row.shape, place(row.country), place(row.state), row.datetime_us)
+                                for row in self._store.index_rows())
+            self._cube_ready = True
+        return self._cube
+
+    @staticmethod
+    def _cube_filters(where: Dict[str, Any]) -> Dict[str, Any]:
+        # country / state w kostce są znormalizowane tak jak klucze indeksów miejsc
+        return {k: normalize_place(v) if k in ('country', 'state') else v for k, v in where.items()}
+
+    def count_by(self, *dims: str, **where: Any) -> Dict[Any, int]:
+        """
+        group by na kostce zliczeń - bez dotykania obserwacji
+        - repo.count_by('country', 'year', shape=UFOShape.DISK) -> {('us', 1999): 12, ...}
+        - jeden wymiar -> klucze to same wartości
+        """
+        return self._count_cube().group_by(*dims, **self._cube_filters(where))
+
+    def top_groups(self, dims, n: int = 10, **where: Any) -> List[Tuple[Any, int]]:
+        """
+        n najliczniejszych grup dla wymiaru lub zestawu wymiarów
+        - repo.top_groups(('state', 'shape'), 5, country='us')
+        """
+        return self._count_cube().top(dims, n, **self._cube_filters(where))
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        przybliżone zużycie pamięci przez obserwacje
+        - ListStorage: bajty obiektów liczone raz (shared) i tak, jakby nic nie było
+          współdzielone (unshared) - saved_bytes to zysk z internowania Location i napisów
+        - SightingFrame: bajty kolumn (obiekty Sighting powstają dopiero przy odczycie)
+        """
+        from .frame import SightingFrame
+        if isinstance(self._store, SightingFrame):
+            return {'rows': len(self._store), 'column_bytes': self._store.nbytes()}
+        return measure_sightings(self._store)
+
+    def export(self, target, fmt: str = 'ndjson', **kwargs) -> int:
+        """
+        strumieniowy eksport do pliku (ścieżka lub obiekt pliku) - pamięć stała
+        - fmt: 'ndjson' albo 'json' (tablica)
+        - kwargs: compress (gzip, domyślnie dla ścieżek .gz), compact, encoder ('auto' = orjson jeśli jest)
+        - zwraca liczbę zapisanych obserwacji
+        """
+        return export_sightings(self._store, target, fmt, **kwargs)
+
+    def export_columns(self, path: str, fields: Optional[Iterable[str]] = None,
+                       compression: Optional[str] = 'zlib') -> int:
+        """
+        eksport kolumnowy - każde pole osobnym typowanym blokiem (colexport)
+        - odbiorca czyta tylko potrzebne pola: colexport.read_columns(path, ['datetime_utc', 'shape'])
+        - magazyn SightingFrame zapisujemy prosto z kolumn, lista jest najpierw rozbijana na kolumny
+        - wymaga numpy
         """
-        counts: List[Tuple[UFOShape, int]] = [(shape, len(lst)) for shape, lst in self._by_shape.items()]
-        counts.sort(key=lambda x: x[1], reverse=True)
-        return counts[:n]
+        from .frame import SightingFrame
+        from .colexport import export_columns
+        frame = self._store if isinstance(self._store, SightingFrame) else SightingFrame(self._store)
+        return export_columns(frame, path, fields, compression)
 
     def export_json(self) -> str:
         """
-        eksport danych do JSON
+        eksport danych do JSON (string, wcięcie 2 spacje)
         - repository wie jak dane są przechowywane
         - separacja odpowiedzialności - eksport to część zarządzania danymi
+        - rekordy kodowane strumieniowo, bez listy słowników; dla dużych danych export(path)
         """
-        import json
-        def loc_to_dict(loc: Location):
-            return {
-                'city': loc.city,
-                'state': loc.state,
-                'country': loc.country,
-                'latitude': loc.latitude,
-                'longitude': loc.longitude,
-            }
-        payload = []
-        for s in self._all:
-            payload.append({
-                'datetime_utc': s.datetime_utc.isoformat(),
-                'duration_seconds': s.duration_seconds,
-                'comments': s.comments,
-                'location': loc_to_dict(s.location),
-                'shape': s.shape.value,
-            })
-        return json.dumps(payload, ensure_ascii=False, indent=2)
+        buf = io.StringIO()
+        write_json_array(self._store, buf, compact=False, encoder='json')
+        return buf.getvalue()
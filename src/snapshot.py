@@ -0,0 +1,136 @@
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from pathlib import Path
+import asyncio
+import hashlib
+import inspect
+import os
+
+from .colfile import ColumnFile, write_columns
+from .frame import SightingFrame
+from .models import Sighting
+from .parser import iter_sightings
+from .repository import SightingRepository
+
+"""
+snapshot - binarna kopia sparsowanych danych obok pliku CSV
+============================================================================
+dlaczego
+1. parsowanie CSV (dateutil, regex, pydantic) trwa sekundy przy każdym starcie
+2. snapshot to kolumny SightingFrame zapisane w formacie colfile
+3. przy kolejnym starcie kolumny mapujemy (mmap) - prawie bez kopiowania
+
+unieważnianie:
+- w meta snapshotu zapisujemy rozmiar, mtime i hash (blake2b) pliku CSV
+- inny rozmiar -> snapshot nieaktualny (bez liczenia hasha)
+- ten sam rozmiar i mtime -> aktualny
+- ten sam rozmiar, inny mtime (np. kopia, touch) -> decyduje hash zawartości
+"""
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.snapshot'
+
+
+def snapshot_path_for(csv_path: str) -> str:
+    """domyślna ścieżka snapshotu - obok CSV (scrubbed.csv -> scrubbed.csv.snapshot)"""
+    return str(csv_path) + SNAPSHOT_SUFFIX
+
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    """hash zawartości pliku czytanego blokami (stała pamięć)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def csv_fingerprint(path: str) -> Dict[str, Any]:
+    """
+    klucz snapshotu: rozmiar, mtime (ns) i hash pliku CSV
+    """
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'hash': file_hash(path)}
+
+
+def _is_fresh(meta: Dict[str, Any], csv_path: str) -> bool:
+    if meta.get('version') != SNAPSHOT_VERSION:
+        return False
+    source = meta.get('source', {})
+    st = os.stat(csv_path)
+    if source.get('size') != st.st_size:
+        return False
+    if source.get('mtime_ns') == st.st_mtime_ns:
+        return True
+    return source.get('hash') == file_hash(csv_path)
+
+
+def save_snapshot(frame: SightingFrame, csv_path: str, snapshot_path: Optional[str] = None,
+                  source: Optional[Dict[str, Any]] = None) -> str:
+    """
+    zapis snapshotu frame dla danego pliku CSV
+    - source: odcisk CSV z chwili rozpoczęcia parsowania (domyślnie liczony teraz)
+    - zapis do pliku tymczasowego + os.replace - przerwany zapis nie zostawia uszkodzonego snapshotu
+    - zwraca ścieżkę snapshotu
+    """
+    target = snapshot_path or snapshot_path_for(csv_path)
+    meta = {'version': SNAPSHOT_VERSION, 'source': source or csv_fingerprint(csv_path), 'rows': len(frame)}
+    tmp = f'{target}.tmp{os.getpid()}'
+    try:
+        write_columns(tmp, frame.to_columns(), meta)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return target
+
+
+def load_snapshot(csv_path: str, snapshot_path: Optional[str] = None) -> Optional[SightingFrame]:
+    """
+    wczytanie snapshotu przez mmap
+    - None gdy snapshotu nie ma, jest uszkodzony albo CSV się zmienił
+    """
+    target = snapshot_path or snapshot_path_for(csv_path)
+    if not Path(target).exists():
+        return None
+    try:
+        cf = ColumnFile(target)
+    except (ValueError, OSError):
+        return None
+    try:
+        if not _is_fresh(cf.meta, csv_path):
+            return None
+        return SightingFrame.from_columns(cf.read())
+    except (ValueError, KeyError, TypeError, IndexError, AttributeError):
+        # uszkodzone dane kolumn albo brak kolumny - parsujemy CSV od nowa
+        return None
+    finally:
+        # mmap zostaje otwarty tak długo, jak żyją widoki kolumn frame
+        cf.close()
+
+
+async def _collect(sightings: AsyncIterator[Sighting]) -> List[Sighting]:
+    return [s async for s in sightings]
+
+
+def load_repository_cached(csv_path: str, loader_func: Callable = iter_sightings,
+                           snapshot_path: Optional[str] = None, **loader_kwargs) -> SightingRepository:
+    """
+    repository ze snapshotu, a gdy go brak - z loadera + zapis nowego snapshotu
+
+    - loader_func: loader sync (lista lub generator obserwacji), korutyna
+      (load_sightings_async) albo async generator (aiter_sightings)
+    - wynik zawsze oparty o SightingFrame
+    """
+    frame = load_snapshot(csv_path, snapshot_path)
+    if frame is None:
+        # odcisk przed parsowaniem - zmiana CSV w trakcie ładowania unieważni snapshot
+        source = csv_fingerprint(csv_path)
+        if asyncio.iscoroutinefunction(loader_func):
+            sightings = asyncio.run(loader_func(csv_path, **loader_kwargs))
+        elif inspect.isasyncgenfunction(loader_func):
+            sightings = asyncio.run(_collect(loader_func(csv_path, **loader_kwargs)))
+        else:
+            sightings = loader_func(csv_path, **loader_kwargs)
+        frame = SightingFrame(sightings)
+        save_snapshot(frame, csv_path, snapshot_path, source)
+    return SightingRepository.from_storage(frame)
@@ -0,0 +1,473 @@
+from datetime import datetime
+from itertools import islice
+from math import asin, cos, degrees, pi, radians, sin
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import io
+import re
+import sqlite3
+
+from .models import Sighting, UFOShape, Location, trusted_constructor
+from .geo import EARTH_RADIUS_KM, haversine_km
+from .text_index import tokenize
+from .query import SightingQuery
+from .cube import DIMENSIONS
+from .export import export_sightings, write_json_array
+from .repository import normalize_place
+from .utils import datetime_to_us, us_to_datetime
+
+"""
+repository na pliku SQLite - dane większe niż pamięć
+============================================================================
+dlaczego
+1. SightingRepository trzyma obserwacje i indeksy w pamięci procesu
+2. docstring repository obiecuje wymianę magazynu "lista -> baza danych" -
+   to jest ta implementacja, z tym samym API (by_shape, query, count_by, ...)
+3. plik SQLite: bez serwera, indeksy B-drzewa na dysku, zapytania w SQL
+
+schemat:
+- sightings: kolumny obserwacji + klucze miejsc znormalizowane jak w repository
+  (country_key / state_key / city_key), czas jako mikrosekundy od epoki (int)
+- terms: słowo -> id (odwrotny indeks comments, ta sama tokenizacja co InvertedIndex)
+- indeksy: shape, country_key + state_key, state_key, city_key, datetime_us, latitude + longitude
+
+zapis: add_many w paczkach (batch_size) - jedna transakcja i executemany na paczkę
+odczyt: warunki zapytań trafiają do WHERE, wyniki czytane kursorem blokami
+(fetchmany) i zamieniane na Sighting dopiero przy iteracji - stream(), iter_all()
+"""
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sightings (
+    id INTEGER PRIMARY KEY,
+    datetime_us INTEGER NOT NULL,
+    duration REAL,
+    comments TEXT,
+    city TEXT,
+    state TEXT,
+    country TEXT,
+    city_key TEXT,
+    state_key TEXT,
+    country_key TEXT,
+    latitude REAL,
+    longitude REAL,
+    shape TEXT NOT NULL,
+    raw_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    PRIMARY KEY (term, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_sightings_shape ON sightings (shape);
+CREATE INDEX IF NOT EXISTS ix_sightings_country ON sightings (country_key, state_key);
+CREATE INDEX IF NOT EXISTS ix_sightings_state ON sightings (state_key);
+CREATE INDEX IF NOT EXISTS ix_sightings_city ON sightings (city_key);
+CREATE INDEX IF NOT EXISTS ix_sightings_datetime ON sightings (datetime_us);
+CREATE INDEX IF NOT EXISTS ix_sightings_geo ON sightings (latitude, longitude);
+'''
+
+_INSERT = ('INSERT INTO sightings (id, datetime_us, duration, comments, city, state, country, '
+           'city_key, state_key, country_key, latitude, longitude, shape, raw_id) '
+           'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+_COLUMNS = 'id, datetime_us, duration, comments, city, state, country, latitude, longitude, shape, raw_id'
+
+# czas jako data w SQL: sekundy od epoki -> strftime (UTC)
+_TIME = "datetime_us / 1000000.0, 'unixepoch'"
+_DIMENSION_SQL = {
+    'shape': 'shape',
+    'country': 'country_key',
+    'state': 'state_key',
+    'year': f"CAST(strftime('%Y', {_TIME}) AS INTEGER)",
+    'month': f"CAST(strftime('%m', {_TIME}) AS INTEGER)",
+    'hour': f"CAST(strftime('%H', {_TIME}) AS INTEGER)",
+}
+# weekday jak datetime.weekday(): 0 = poniedziałek (%w w SQLite: 0 = niedziela)
+_UNIT_SQL = {
+    'year': _DIMENSION_SQL['year'],
+    'month': _DIMENSION_SQL['month'],
+    'weekday': f"(CAST(strftime('%w', {_TIME}) AS INTEGER) + 6) % 7",
+    'hour': _DIMENSION_SQL['hour'],
+}
+_SHAPES = {shape.value: shape for shape in UFOShape}
+
+
+def _radius_bbox(lat: float, lon: float, km: float) -> Tuple[str, List[float]]:
+    """
+    warunek SQL prostokąta ograniczającego okrąg (jak GridIndex.within_radius)
+    - długość z zawinięciem przez antypołudnik, przy biegunie - wszystkie długości
+    """
+    dist = km / EARTH_RADIUS_KM
+    dlat = degrees(dist)
+    sql, params = 'latitude BETWEEN ? AND ?', [max(-90.0, lat - dlat), min(90.0, lat + dlat)]
+    if lat - dlat <= -90 or lat + dlat >= 90 or dist >= 1.5:
+        return sql + ' AND longitude IS NOT NULL', params
+    ratio = sin(dist) / cos(radians(lat))
+    if ratio >= 1:
+        return sql + ' AND longitude IS NOT NULL', params
+    dlon = degrees(asin(ratio))
+    return sql + ' AND ' + _lon_range(lon - dlon, lon + dlon, params), params
+
+
+def _lon_range(min_lon: float, max_lon: float, params: List[float]) -> str:
+    """warunek długości od min_lon do max_lon na wschód (wartości spoza [-180, 180] zawijane)"""
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    params += [min_lon, max_lon]
+    if min_lon > max_lon:
+        return '(longitude >= ? OR longitude <= ?)'
+    return 'longitude BETWEEN ? AND ?'
+
+
+def _text_sql(query: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    zapytanie pełnotekstowe -> podzapytanie id (składnia jak InvertedIndex.search)
+    - grupa AND = INTERSECT list słów, OR = UNION grup
+    - None gdy zapytanie nie zawiera żadnego słowa
+    """
+    groups, params = [], []
+    for part in re.split(r'\s+OR\s+', query.strip()):
+        tokens = sorted(set(tokenize(part)))
+        if tokens:
+            # INTERSECT i UNION mają w SQLite ten sam priorytet - grupa AND jako podzapytanie
+            groups.append('SELECT id FROM (' + ' INTERSECT '.join('SELECT id FROM terms WHERE term = ?' for _ in tokens) + ')')
+            params.extend(tokens)
+    if not groups:
+        return None
+    return ' UNION '.join(groups), params
+
+
+class SQLiteSightingRepository:
+    """
+    repository obserwacji UFO w pliku SQLite
+    ============================================================================
+    - to samo API co SightingRepository: add / add_many, by_*, query, explain,
+      within_radius / in_bbox / nearest, search_comments, time_histogram,
+      count_by / top_groups / top_shapes, export / export_json
+    - metody by_* i query zwracają listy (jak SightingRepository), stream() i
+      iter_all() - leniwe iteratory dla wyników większych niż pamięć
+    - path=':memory:' - baza w pamięci (testy), plik - dane zostają między uruchomieniami
+    - obiekty Sighting powstają przy odczycie (dane były zwalidowane przed zapisem)
+    """
+    FETCH_BLOCK = 1024
+
+    def __init__(self, path: str = ':memory:', sightings: Iterable[Sighting] = (), batch_size: int = 10000):
+        if batch_size < 1:
+            raise ValueError(f'batch_size musi być >= 1: {batch_size}')
+        self.path = path
+        self.batch_size = batch_size
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.execute('PRAGMA temp_store = MEMORY')
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+        self._next_id = self._conn.execute('SELECT COALESCE(MAX(id) + 1, 0) FROM sightings').fetchone()[0]
+        self._build_location = trusted_constructor(Location)
+        self._build_sighting = trusted_constructor(Sighting)
+        self.add_many(sightings)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'SQLiteSightingRepository':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def add(self, s: Sighting) -> None:
+        """dodanie jednej obserwacji (osobna transakcja - dla wielu obserwacji add_many)"""
+        self.add_many((s,))
+
+    def add_many(self, sightings: Iterable[Sighting]) -> int:
+        """
+        dodanie obserwacji paczkami po batch_size
+        - jedna transakcja na paczkę: executemany dla obserwacji i słów comments
+        - błąd w paczce wycofuje całą paczkę (wcześniejsze paczki zostają)
+        - zwraca liczbę dodanych
+        """
+        added = 0
+        it = iter(sightings)
+        while True:
+            batch = list(islice(it, self.batch_size))
+            if not batch:
+                return added
+            rows, terms = [], []
+            for idx, s in enumerate(batch, self._next_id):
+                loc = s.location
+                rows.append((idx, datetime_to_us(s.datetime_utc), s.duration_seconds, s.comments,
+                             loc.city, loc.state, loc.country, normalize_place(loc.city),
+                             normalize_place(loc.state), normalize_place(loc.country),
+                             loc.latitude, loc.longitude, s.shape.value, s.raw_id))
+                terms.extend((term, idx) for term in set(tokenize(s.comments)))
+            with self._conn:
+                self._conn.executemany(_INSERT, rows)
+                self._conn.executemany('INSERT INTO terms (term, id) VALUES (?, ?)', terms)
+            self._next_id += len(batch)
+            added += len(batch)
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[Iterable[Sighting]], path: str = ':memory:',
+                     batch_size: int = 10000) -> 'SQLiteSightingRepository':
+        """repository z kolejnych paczek obserwacji (np. wyniki loadera)"""
+        repo = cls(path, batch_size=batch_size)
+        for batch in batches:
+            repo.add_many(batch)
+        return repo
+
+    def _stream(self, sql: str, params: Sequence[Any] = ()) -> Iterator[Sighting]:
+        """
+        wiersze zapytania jako Sighting - kursor czytany blokami (FETCH_BLOCK)
+        - Location współdzielone w obrębie jednego zapytania (flyweight)
+        """
+        cursor = self._conn.execute(sql, params)
+        locations: Dict[Tuple, Location] = {}
+        try:
+            while True:
+                rows = cursor.fetchmany(self.FETCH_BLOCK)
+                if not rows:
+                    return
+                yield from self._to_sightings(rows, locations)
+        finally:
+            cursor.close()
+
+    def _to_sightings(self, rows: List[Tuple], locations: Dict[Tuple, Location]) -> List[Sighting]:
+        """wiersze SELECT _COLUMNS -> Sighting (trusted_constructor, bez ponownej walidacji)"""
+        build_location, build_sighting = self._build_location, self._build_sighting
+        result = []
+        for _, us, duration, comments, city, state, country, lat, lon, shape, raw_id in rows:
+            key = (city, state, country, lat, lon)
+            loc = locations.get(key)
+            if loc is None:
+                loc = locations[key] = build_location(
+                    {'city': city, 'state': state, 'country': country, 'latitude': lat, 'longitude': lon})
+            result.append(build_sighting({'datetime_utc': us_to_datetime(us), 'duration_seconds': duration,
+                                          'comments': comments, 'location': loc, 'shape': _SHAPES[shape],
+                                          'raw_id': raw_id}))
+        return result
+
+    def _select(self, where: str = '', params: Sequence[Any] = (), order: str = 'id') -> List[Sighting]:
+        return list(self._stream(f'SELECT {_COLUMNS} FROM sightings {where} ORDER BY {order}', params))
+
+    def _take(self, ids: Sequence[int]) -> List[Sighting]:
+        """obserwacje o podanych id w kolejności ids (paczki po FETCH_BLOCK - limit parametrów SQLite)"""
+        found: Dict[int, Sighting] = {}
+        locations: Dict[Tuple, Location] = {}
+        for pos in range(0, len(ids), self.FETCH_BLOCK):
+            block = ids[pos:pos + self.FETCH_BLOCK]
+            sql = f'SELECT {_COLUMNS} FROM sightings WHERE id IN ({",".join("?" * len(block))})'
+            rows = self._conn.execute(sql, block).fetchall()
+            found.update(zip((row[0] for row in rows), self._to_sightings(rows, locations)))
+        return [found[i] for i in ids]
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM sightings').fetchone()[0]
+
+    def __iter__(self) -> Iterator[Sighting]:
+        return self.iter_all()
+
+    def iter_all(self) -> Iterator[Sighting]:
+        """wszystkie obserwacje leniwie, w kolejności dodania"""
+        return self._stream(f'SELECT {_COLUMNS} FROM sightings ORDER BY id')
+
+    def all(self) -> List[Sighting]:
+        return list(self.iter_all())
+
+    def by_shape(self, shape: UFOShape) -> List[Sighting]:
+        return self._select('WHERE shape = ?', (shape.value,))
+
+    def by_country(self, country: str) -> List[Sighting]:
+        return self._select('WHERE country_key = ?', (normalize_place(country),))
+
+    def by_state(self, state: str, country: Optional[str] = None) -> List[Sighting]:
+        if country is None:
+            return self._select('WHERE state_key = ?', (normalize_place(state),))
+        return self._select('WHERE country_key = ? AND state_key = ?', (normalize_place(country), normalize_place(state)))
+
+    def by_city(self, city: str) -> List[Sighting]:
+        return self._select('WHERE city_key = ?', (normalize_place(city),))
+
+    def by_date_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Sighting]:
+        """obserwacje z [start, end), chronologicznie (przy równym czasie - kolejność dodania)"""
+        where, params = self._time_conditions(start, end)
+        return self._select(f'WHERE {" AND ".join(where)}' if where else '', params, order='datetime_us, id')
+
+    @staticmethod
+    def _time_conditions(start: Optional[datetime], end: Optional[datetime]) -> Tuple[List[str], List[Any]]:
+        where: List[str] = []
+        params: List[Any] = []
+        if start is not None:
+            where.append('datetime_us >= ?')
+            params.append(datetime_to_us(start))
+        if end is not None:
+            where.append('datetime_us < ?')
+            params.append(datetime_to_us(end))
+        return where, params
+
+    def time_histogram(self, unit: str = 'year') -> Dict[int, int]:
+        """liczba obserwacji w jednostce czasu: 'year', 'month', 'weekday', 'hour' (GROUP BY w SQL)"""
+        expr = _UNIT_SQL.get(unit)
+        if expr is None:
+            raise ValueError(f'nieznana jednostka histogramu: {unit} (dostępne: {", ".join(_UNIT_SQL)})')
+        rows = self._conn.execute(f'SELECT {expr} AS k, COUNT(*) FROM sightings GROUP BY k ORDER BY k')
+        return dict(rows.fetchall())
+
+    def _radius_ids(self, lat: float, lon: float, km: float) -> List[Tuple[float, int]]:
+        """(odległość, id) w promieniu km - prostokąt z indeksu geo w SQL, dokładny dystans w Pythonie"""
+        where, params = _radius_bbox(lat, lon, km)
+        found = []
+        for idx, plat, plon in self._conn.execute(f'SELECT id, latitude, longitude FROM sightings WHERE {where}', params):
+            d = haversine_km(lat, lon, plat, plon)
+            if d <= km:
+                found.append((d, idx))
+        found.sort()
+        return found
+
+    def within_radius(self, lat: float, lon: float, km: float) -> List[Sighting]:
+        """obserwacje w promieniu km od punktu, od najbliższej"""
+        return self._take([idx for _, idx in self._radius_ids(lat, lon, km)])
+
+    def in_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[Sighting]:
+        """obserwacje w prostokącie (granice włącznie) w kolejności dodania, min_lon > max_lon - przez antypołudnik"""
+        lon_sql = '(longitude >= ? OR longitude <= ?)' if min_lon > max_lon else 'longitude BETWEEN ? AND ?'
+        return self._select(f'WHERE latitude BETWEEN ? AND ? AND {lon_sql}', (min_lat, max_lat, min_lon, max_lon))
+
+    def nearest(self, lat: float, lon: float, k: int = 10) -> List[Sighting]:
+        """
+        k obserwacji najbliższych punktowi, od najbliższej
+        - promień podwajany aż zapytanie zwróci k punktów albo obejmie całą kulę
+        """
+        if k < 1:
+            return []
+        km = 100.0
+        while True:
+            found = self._radius_ids(lat, lon, km)
+            if len(found) >= k or km >= pi * EARTH_RADIUS_KM:
+                return self._take([idx for _, idx in found[:k]])
+            km = min(km * 2, pi * EARTH_RADIUS_KM)
+
+    def search_comments(self, query: str, limit: Optional[int] = None) -> List[Sighting]:
+        """wyszukiwanie pełnotekstowe w comments (składnia jak SightingRepository.search_comments)"""
+        text = _text_sql(query)
+        if text is None or limit == 0:
+            return []
+        sql, params = text
+        tail = '' if limit is None else f' LIMIT {int(limit)}'
+        return self._select(f'WHERE id IN ({sql})', params, order=f'id{tail}')
+
+    def _query_sql(self, q: SightingQuery) -> Optional[Tuple[str, List[Any]]]:
+        """
+        SightingQuery -> SELECT z warunkami w WHERE (wybór indeksu zostawiamy planerowi SQLite)
+        - None gdy wynik na pewno jest pusty (np. tekst bez słów)
+        """
+        where, params = self._time_conditions(q.start, q.end)
+        if q.shape is not None:
+            where.append('shape = ?')
+            params.append(q.shape.value)
+        for column, value in (('country_key', q.country), ('state_key', q.state), ('city_key', q.city)):
+            key = normalize_place(value)
+            if key:
+                where.append(f'{column} = ?')
+                params.append(key)
+        if q.has_duration():
+            where.append('duration IS NOT NULL')
+        if q.min_duration is not None:
+            where.append('duration >= ?')
+            params.append(q.min_duration)
+        if q.max_duration is not None:
+            where.append('duration <= ?')
+            params.append(q.max_duration)
+        if q.text is not None:
+            text = _text_sql(q.text)
+            if text is None:
+                return None
+            where.append(f'id IN ({text[0]})')
+            params.extend(text[1])
+        sql = f'SELECT {_COLUMNS} FROM sightings'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY id'
+        if q.limit is not None:
+            sql += f' LIMIT {int(q.limit)}'
+        return sql, params
+
+    def stream(self, q: Optional[SightingQuery] = None, **predicates) -> Iterator[Sighting]:
+        """
+        wynik zapytania leniwie - obiekty Sighting powstają dopiero przy iteracji
+        - te same predykaty co query(): repo.stream(country='us', min_duration=300)
+        """
+        q = q if q is not None else SightingQuery(**predicates)
+        compiled = self._query_sql(q)
+        if compiled is None or q.limit == 0:
+            return iter(())
+        return self._stream(*compiled)
+
+    def query(self, q: Optional[SightingQuery] = None, **predicates) -> List[Sighting]:
+        """zapytanie złożone (AND wszystkich warunków), wynik w kolejności dodania"""
+        return list(self.stream(q, **predicates))
+
+    def explain(self, q: Optional[SightingQuery] = None, **predicates) -> Dict[str, Any]:
+        """
+        plan zapytania: sql, parametry i EXPLAIN QUERY PLAN (użyte indeksy SQLite)
+        """
+        q = q if q is not None else SightingQuery(**predicates)
+        compiled = self._query_sql(q)
+        if compiled is None:
+            return {'sql': None, 'params': [], 'plan': []}
+        sql, params = compiled
+        plan = [row[-1] for row in self._conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+        return {'sql': sql, 'params': params, 'plan': plan}
+
+    def _grouped(self, dims: Sequence[str], where: Dict[str, Any], n: Optional[int] = None) -> List[Tuple[Any, int]]:
+        unknown = [d for d in list(dims) + list(where) if d not in _DIMENSION_SQL]
+        if unknown:
+            raise ValueError(f'nieznane wymiary: {unknown} (dostępne: {", ".join(DIMENSIONS)})')
+        conditions, params = [], []
+        for dim, value in where.items():
+            if dim in ('country', 'state'):
+                value = normalize_place(value)
+            elif dim == 'shape' and value is not None:
+                value = value.value
+            conditions.append(f'{_DIMENSION_SQL[dim]} IS ?')
+            params.append(value)
+        select = ', '.join(_DIMENSION_SQL[d] for d in dims)
+        sql = f'SELECT {select + ", " if dims else ""}COUNT(*) AS n FROM sightings'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        if dims:
+            sql += f' GROUP BY {select}'
+        if n is not None:
+            sql += f' ORDER BY n DESC, MIN(id) LIMIT {int(n)}'
+        shape_pos = dims.index('shape') if 'shape' in dims else None
+        result = []
+        for row in self._conn.execute(sql, params):
+            key = list(row[:-1])
+            if shape_pos is not None:
+                key[shape_pos] = _SHAPES[key[shape_pos]]
+            result.append((key[0] if len(dims) == 1 else tuple(key), row[-1]))
+        return result
+
+    def count_by(self, *dims: str, **where: Any) -> Dict[Any, int]:
+        """group by w SQL - te same klucze co SightingRepository.count_by (wszystkie wymiary DIMENSIONS)"""
+        return dict(self._grouped(dims, where))
+
+    def count(self, **where: Any) -> int:
+        """liczba obserwacji spełniających filtry wymiarów"""
+        return self._grouped((), where)[0][1]
+
+    def top_groups(self, dims, n: int = 10, **where: Any) -> List[Tuple[Any, int]]:
+        """n najliczniejszych grup (ORDER BY liczba DESC + LIMIT w SQL)"""
+        dims = (dims,) if isinstance(dims, str) else tuple(dims)
+        return self._grouped(dims, where, n)
+
+    def top_shapes(self, n: int = 10):
+        return self.top_groups('shape', n)
+
+    def export(self, target, fmt: str = 'ndjson', **kwargs) -> int:
+        """strumieniowy eksport (jak SightingRepository.export) - kursor czytany blokami"""
+        return export_sightings(self.iter_all(), target, fmt, **kwargs)
+
+    def export_json(self) -> str:
+        buf = io.StringIO()
+        write_json_array(self.iter_all(), buf, compact=False, encoder='json')
+        return buf.getvalue()
@@ -0,0 +1,182 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from pathlib import Path
+import csv
+import hashlib
+import io
+import json
+import os
+import time
+
+from .parser import parse_row_to_sighting
+from .repository import SightingRepository
+
+"""
+przyrostowe ładowanie dopisywanego pliku CSV (tail / follow)
+============================================================================
+dlaczego
+1. feed obserwacji to ciągle rosnący CSV - nowe wiersze dopisywane w ciągu dnia
+2. ponowne load_sightings_threaded na całym pliku kosztuje tyle, ile cała historia
+3. zapamiętujemy offset (bajty) i nagłówek - parsujemy tylko dopisane rekordy
+
+stan (JSON obok CSV, domyślnie <csv>.tail.json):
+- offset: pozycja za ostatnim przetworzonym rekordem
+- header: nagłówek CSV (zmiana nagłówka = nowy plik, zaczynamy od nowa)
+- records: liczba przetworzonych rekordów (ciągłość raw_id)
+- file_id: (st_dev, st_ino) pliku - rotacja (nowy plik pod tą samą ścieżką) = nowy plik
+- digest: skrót ostatnich bajtów przed offset - wykrywa nadpisanie pliku w miejscu
+
+repository nie jest zapisywane w stanie - po restarcie historię daje np. snapshot
+"""
+
+
+def _complete_records_end(data: bytes) -> int:
+    """
+    koniec ostatniego pełnego rekordu w buforze
+    - ostatni wiersz może być dopisany tylko częściowo - zostawiamy go na następny raz
+    - '\n' w cudzysłowie (wieloliniowe comments) nie kończy rekordu
+    """
+    end, pos, in_quotes = 0, 0, False
+    while True:
+        nl = data.find(b'\n', pos)
+        if nl == -1:
+            return end
+        in_quotes ^= bool(data.count(b'"', pos, nl) & 1)
+        if not in_quotes:
+            end = nl + 1
+        pos = nl + 1
+
+
+DIGEST_WINDOW = 4096
+
+
+def _digest_before(fh, offset: int) -> str:
+    """
+    skrót ostatnich DIGEST_WINDOW bajtów przed offset
+    - stały koszt niezależnie od rozmiaru historii (nie haszujemy całego prefiksu)
+    """
+    start = max(0, offset - DIGEST_WINDOW)
+    fh.seek(start)
+    return hashlib.blake2b(fh.read(offset - start), digest_size=16).hexdigest()
+
+
+class TailIngestor:
+    """
+    przyrostowe dokładanie nowych wierszy CSV do SightingRepository
+    ============================================================================
+    - poll() - jedno sprawdzenie pliku, zwraca liczbę dodanych obserwacji
+    - follow() - pętla poll() co interval sekund
+    - koszt odświeżenia zależy od rozmiaru przyrostu, nie historii
+
+    obcięcie pliku (rozmiar < offset), zmiana nagłówka, inny plik pod ścieżką
+    (st_dev/st_ino - rotacja) lub inne bajty przed offset -> czytamy od początku
+    - stare obserwacje nie pasują do nowego pliku (raw_id od 1 = duplikaty),
+      więc repository zastępujemy nowym z repository_factory
+    - resets liczy takie restarty; kto trzyma referencję do repository, czyta tail.repository
+    """
+    def __init__(self, csv_path: str, repository: SightingRepository, state_path: Optional[str] = None,
+                 repository_factory: Callable[[], SightingRepository] = SightingRepository):
+        self.csv_path = str(csv_path)
+        self.repository = repository
+        self.repository_factory = repository_factory
+        self.resets = 0
+        self.state_path = state_path or self.csv_path + '.tail.json'
+        self.offset = 0
+        self.header: Optional[List[str]] = None
+        self.records = 0
+        self.file_id: Optional[List[int]] = None
+        self.digest: Optional[str] = None
+        self._load_state()
+
+    def _load_state(self) -> None:
+        if not Path(self.state_path).exists():
+            return
+        with open(self.state_path, encoding='utf-8') as fh:
+            state: Dict[str, Any] = json.load(fh)
+        self.offset = state.get('offset', 0)
+        self.header = state.get('header')
+        self.records = state.get('records', 0)
+        self.file_id = state.get('file_id')
+        self.digest = state.get('digest')
+
+    def _save_state(self) -> None:
+        """zapis stanu przez plik tymczasowy + os.replace (atomowo)"""
+        tmp = f'{self.state_path}.tmp{os.getpid()}'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump({'offset': self.offset, 'header': self.header, 'records': self.records,
+                       'file_id': self.file_id, 'digest': self.digest}, fh)
+        os.replace(tmp, self.state_path)
+
+    def _reset(self) -> None:
+        self.offset, self.header, self.records = 0, None, 0
+        self.file_id, self.digest = None, None
+        self.repository = self.repository_factory()
+        self.resets += 1
+
+    @staticmethod
+    def _read_header(fh) -> List[str]:
+        fh.seek(0)
+        return next(csv.reader([fh.readline().decode('utf-8')]), [])
+
+    def _replaced(self, fh, st: os.stat_result) -> bool:
+        """czy plik pod ścieżką nie jest już tym, z którego czytaliśmy do offset"""
+        if not self.offset:
+            return False
+        if st.st_size < self.offset:
+            return True
+        if self.file_id is not None and [st.st_dev, st.st_ino] != self.file_id:
+            return True
+        if self.digest is not None and _digest_before(fh, self.offset) != self.digest:
+            return True
+        return self._read_header(fh) != self.header
+
+    def poll(self) -> int:
+        """
+        przetworzenie rekordów dopisanych od ostatniego wywołania
+        - zwraca liczbę obserwacji dodanych do repository
+        """
+        with open(self.csv_path, 'rb') as fh:
+            st = os.fstat(fh.fileno())
+            if self._replaced(fh, st):
+                # plik obcięty / podmieniony - zaczynamy od nowa, z pustym repository
+                self._reset()
+            fh.seek(self.offset)
+            data = fh.read()
+            end = _complete_records_end(data)
+            if end == 0:
+                return 0
+            self.file_id = [st.st_dev, st.st_ino]
+            self.digest = _digest_before(fh, self.offset + end)
+        text = data[:end].decode('utf-8')
+        reader = csv.reader(io.StringIO(text, newline=''))
+        if self.offset == 0:
+            self.header = next(reader, [])
+        added = 0
+        for values in reader:
+            if not values:
+                # pusta linia - pomijana jak w read_csv, bez zmiany numeracji raw_id
+                continue
+            self.records += 1
+            try:
+                s = parse_row_to_sighting(dict(zip(self.header, values)), raw_id=self.records)
+            except Exception:
+                # błędne wiersze pomijamy, tak jak loadery
+                continue
+            if s is not None:
+                self.repository.add(s)
+                added += 1
+        self.offset += end
+        self._save_state()
+        return added
+
+    def follow(self, interval: float = 1.0, max_polls: Optional[int] = None) -> Iterator[int]:
+        """
+        śledzenie pliku - poll() co interval sekund
+        - generator: po każdym sprawdzeniu oddaje liczbę nowych obserwacji
+        - max_polls ogranicza liczbę sprawdzeń (None = bez końca)
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            yield self.poll()
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(interval)
@@ -0,0 +1,154 @@
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+import heapq
+import html
+import re
+
+from .indexes import intersect_sorted
+
+"""
+indeks pełnotekstowy (inverted index) dla Sighting.comments
+============================================================================
+dlaczego
+1. comments to najbogatsze pole, a szukanie w nim = skan podciągów po każdej obserwacji
+2. indeks odwrotny: słowo -> posortowana lista id obserwacji (posting list)
+3. zapytanie AND = przecięcie list, OR = suma list - bez czytania samych komentarzy
+
+posting list jako array('I') - 4 bajty na wpis zamiast obiektu int + wskaźnika w list
+"""
+
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    tekst -> lista słów
+    - dekodowanie encji HTML z NUFORC ("&#44" -> ",", "&#39" -> "'", także bez średnika)
+    - casefold zamiast lower (poprawne porównanie bez wielkości liter także dla ß itp.)
+    - słowo = ciąg liter/cyfr
+    """
+    if not text:
+        return []
+    return _TOKEN_RE.findall(html.unescape(text).casefold())
+
+
+# ASCII: litery i cyfry zostają, reszta -> spacja (dla ASCII to samo co _TOKEN_RE); \x00 rozdziela teksty
+_ASCII_SEPARATORS = str.maketrans({chr(c): ' ' for c in range(1, 128) if not chr(c).isalnum()})
+
+
+def tokenize_many(texts: List[str]) -> List[List[str]]:
+    """
+    tokenize dla wielu tekstów naraz - wynik jak [tokenize(t) for t in texts]
+    - html.unescape i casefold raz na sklejonym tekście (teksty rozdzielone \x00,
+      którego nie przekracza żadna encja ani słowo)
+    - tekst ASCII: translate + split w C zamiast regex z klasami Unicode;
+      pozostałe przez _TOKEN_RE
+    """
+    if any('\x00' in t for t in texts):
+        return [tokenize(t) for t in texts]
+    joined = html.unescape('\x00'.join(texts)).casefold()
+    # jedno translate na całym tekście (tablica budowana raz, nie na każdy tekst)
+    ascii_pieces = joined.translate(_ASCII_SEPARATORS).split('\x00')
+    if joined.isascii():
+        return [piece.split() for piece in ascii_pieces]
+    return [piece.split() if piece.isascii() else _TOKEN_RE.findall(original)
+            for piece, original in zip(ascii_pieces, joined.split('\x00'))]
+
+
+class InvertedIndex:
+    """
+    odwrotny indeks słów
+    ============================================================================
+    - add(idx, text) - przyrostowo, id rosnące (tak nadaje je magazyn repository),
+      więc posting listy są posortowane bez dodatkowego sortowania
+    - search(query, limit) - składnia: słowa oddzielone spacją = AND,
+      słowo kluczowe OR (wielkimi literami) rozdziela alternatywy
+
+    przykład: "green light OR orange disk" = (green AND light) OR (orange AND disk)
+    """
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[Optional[str]]) -> 'InvertedIndex':
+        """
+        indeks z całej kolumny tekstów naraz (id = pozycja w texts)
+        - unikalne teksty tokenizowane jednym wywołaniem tokenize_many
+        - id rosną, więc posting listy zbieramy w zwykłych listach bez sprawdzania
+          kolejności przy każdym wpisie; słowo powtórzone w tekście daje sąsiednie
+          duplikaty id, usuwane raz na słowo (dict.fromkeys) zamiast set() na tekst
+        """
+        positions: Dict[str, int] = {}
+        codes = [positions.setdefault(text, len(positions)) if text else -1 for text in texts]
+        token_lists = tokenize_many(list(positions))
+        lists: Dict[str, List[int]] = defaultdict(list)
+        for idx, code in enumerate(codes):
+            if code >= 0:
+                for token in token_lists[code]:
+                    lists[token].append(idx)
+        index = cls()
+        index._postings = {token: array('I', dict.fromkeys(ids)) for token, ids in lists.items()}
+        return index
+
+    def add(self, idx: int, text: Optional[str]) -> None:
+        for token in set(tokenize(text)):
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = array('I')
+            if posting and posting[-1] >= idx:
+                # id spoza kolejności (nietypowe) - wstawiamy w miejsce, bez duplikatów
+                pos = bisect_left(posting, idx)
+                if pos == len(posting) or posting[pos] != idx:
+                    posting.insert(pos, idx)
+            else:
+                posting.append(idx)
+
+    def merge(self, other: 'InvertedIndex', offset: int = 0) -> None:
+        """
+        dopisanie indeksu częściowego - id z other przesunięte o offset
+        - offset >= wszystkie nasze id, więc posting listy zostają posortowane
+        """
+        for token, src in other._postings.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = array('I')
+            posting.extend(src if not offset else array('I', [i + offset for i in src]))
+
+    def postings(self, term: str) -> array:
+        """posting list jednego słowa (po tej samej normalizacji co tekst)"""
+        tokens = tokenize(term)
+        if len(tokens) != 1:
+            return array('I', intersect_sorted([self._postings.get(t, array('I')) for t in set(tokens)]))
+        return self._postings.get(tokens[0], array('I'))
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """
+        id obserwacji pasujących do zapytania, rosnąco
+        - grupa AND: przecięcie posting list (od najrzadszego słowa)
+        - OR: scalenie posortowanych wyników grup (heapq.merge) bez duplikatów
+        - limit: najwyżej limit pierwszych wyników
+        """
+        groups: List[List[int]] = []
+        for part in re.split(r'\s+OR\s+', query.strip()):
+            tokens = tokenize(part)
+            if tokens:
+                groups.append(intersect_sorted([self._postings.get(t, array('I')) for t in set(tokens)]))
+        result: List[int] = []
+        last = None
+        for idx in heapq.merge(*groups):
+            if idx == last:
+                continue
+            result.append(idx)
+            last = idx
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def nbytes(self) -> int:
+        """rozmiar wszystkich posting list w bajtach (bez słownika słów)"""
+        return sum(p.itemsize * len(p) for p in self._postings.values())
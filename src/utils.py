@@ -1,6 +1,17 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from dateutil import parser
-from typing import Optional
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+import re
+import sys
+from .models import Location, UFOShape
+
+try:
+    import numpy as np
+except Exception:
+    # opcjonalna zależność - potrzebna tylko dla wsadowych parserów kolumn
+    np = None
 
 """
 utility functions - pomocnicze funkcje parsowania
@@ -10,20 +21,66 @@ zgodnie z wytycznymi osobny moduł aby unikać powtarzania kodu
 - single responsibility - każda funkcja robi JEDNĄ rzecz
 
 """
-def parse_datetime_to_utc(s: str) -> Optional[datetime]:
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_us(dt: datetime) -> int:
     """
-    parsowanie daty z różnych formatów do datetime w UTC
-    
-    dateutil.parser
-    =========================
-    - potrafi sparsować wiele formatów dat ("2020-01-01", "01/01/2020", "Jan 1 2020")
-    - lepsza obsługa edge cases niż datetime.strptime()
-    
-    zwraca Optional[datetime]:
-    - None dla pustych/błędnych dat
+    datetime -> mikrosekundy od epoki (UTC)
+    - daty "naive" traktujemy jak UTC (tak jak parse_datetime_to_utc)
+    - liczba całkowita: łatwo porównywać, sortować i trzymać w tablicach
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def us_to_datetime(us: int) -> datetime:
+    """mikrosekundy od epoki -> datetime w UTC"""
+    return _EPOCH + timedelta(microseconds=int(us))
+
+
+# formaty kandydujące do szybkiej ścieżki - NUFORC używa głównie pierwszego
+CANDIDATE_DATETIME_FORMATS: Tuple[str, ...] = (
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d',
+)
+
+# dyrektywy strptime -> grupy regex (tylko te, których używają formaty kandydujące)
+_DIRECTIVES: Dict[str, str] = {
+    '%Y': r'(?P<year>\d{4})',
+    '%m': r'(?P<month>\d{1,2})',
+    '%d': r'(?P<day>\d{1,2})',
+    '%H': r'(?P<hour>\d{1,2})',
+    '%M': r'(?P<minute>\d{1,2})',
+    '%S': r'(?P<second>\d{1,2})',
+}
+
+
+def _format_to_regex(fmt: str) -> Pattern[str]:
+    """
+    kompilacja formatu strptime do regex z nazwanymi grupami
+    - regex + int() jest kilka razy szybszy niż datetime.strptime()
+    """
+    pattern = re.escape(fmt)
+    for directive, group in _DIRECTIVES.items():
+        pattern = pattern.replace(re.escape(directive), group)
+    return re.compile(pattern)
+
+
+_CANDIDATE_PATTERNS: List[Tuple[str, Pattern[str]]] = [(fmt, _format_to_regex(fmt)) for fmt in CANDIDATE_DATETIME_FORMATS]
+
+
+def _parse_with_dateutil(s: str) -> Optional[datetime]:
+    """
+    wolna ścieżka - dateutil.parser dla formatów spoza szybkiej ścieżki
     """
-    if not s:
-        return None
     try:
         dt = parser.parse(s)
     except Exception:
@@ -39,6 +96,189 @@ def parse_datetime_to_utc(s: str) -> Optional[datetime]:
     return dt
 
 
+class DateTimeParser:
+    """
+    parser dat uczący się formatów (format sniffing)
+    ============================================================================
+    dlaczego tak
+    - dateutil.parser.parse to najgorętsza funkcja ładowania danych
+    - dane NUFORC mają 1-2 formaty (np. "10/10/1949 20:30")
+    - dominujące formaty parsujemy prekompilowanym regex, dateutil tylko przy chybieniu
+
+    uczenie:
+    - learn(sample) - wykrywa dominujące formaty na próbce wartości
+      (loadery wywołują je na pierwszej paczce każdego ładowania, po reset())
+    - parse() - po chybieniu, gdy dateutil sobie poradzi, dopisuje pasujący
+      format kandydujący (uczenie w locie, każdy proces uczy się sam)
+    - ranking po trafieniach: format trafiany częściej niż poprzedni przesuwa się
+      w przód, przy pełnej liście nowy format zastępuje najrzadziej używany -
+      kilka nietypowych wartości na początku pliku nie blokuje dominującego formatu
+
+    statystyki:
+    - hits - trafienia szybkiej ścieżki, misses - wywołania dateutil
+    - liczniki są przybliżone przy wielu wątkach (bez locka na gorącej ścieżce)
+
+    współbieżność:
+    - lista formatów nigdy nie jest zmieniana w miejscu, tylko podmieniana na nową
+    - reset()/learn() z innego ładowania w tym samym procesie (np. TailIngestor.poll
+      obok load_sightings_threaded) zmienia tylko ranking - parse() nie rzuca wyjątków
+    """
+    def __init__(self, formats: Iterable[str] = (), max_formats: int = 3):
+        self.max_formats = max_formats
+        self._formats: List[Tuple[str, Pattern[str]]] = []
+        self._usage: Counter = Counter()
+        self.hits = 0
+        self.misses = 0
+        for fmt in formats:
+            self._add_format(fmt)
+
+    def reset(self, formats: Iterable[str] = ()) -> None:
+        """nowe ładowanie: formaty, ich ranking i statystyki od zera"""
+        self._formats = []
+        self._usage = Counter()
+        self.reset_stats()
+        for fmt in formats:
+            self._add_format(fmt)
+
+    @property
+    def formats(self) -> List[str]:
+        """aktualnie używane formaty szybkiej ścieżki (w kolejności sprawdzania)"""
+        return [fmt for fmt, _ in self._formats]
+
+    def _add_format(self, fmt: str) -> None:
+        if fmt in self.formats or self.max_formats < 1:
+            return
+        formats = list(self._formats)
+        if len(formats) >= self.max_formats:
+            # pełna lista - wymiana najrzadziej trafianego formatu (przy remisie ostatniego)
+            victim = min(reversed(formats), key=lambda item: self._usage[item[0]])
+            formats.remove(victim)
+            del self._usage[victim[0]]
+        formats.append((fmt, _format_to_regex(fmt)))
+        # nowa lista zamiast zmiany w miejscu - inne wątki iterują po starej
+        self._formats = formats
+
+    def _count_hit(self, formats: List[Tuple[str, Pattern[str]]], pos: int, fmt: str) -> None:
+        """
+        licznik trafień i przesunięcie formatu w rankingu
+        - formats to lista, po której iterował _fast_path; reset()/learn() w innym wątku
+          mogły już podmienić self._formats (także na krótszą) - wtedy tylko liczymy trafienie
+        """
+        usage = self._usage
+        usage[fmt] += 1
+        if 0 < pos < len(formats) and self._formats is formats and usage[fmt] > usage[formats[pos - 1][0]]:
+            swapped = list(formats)
+            swapped[pos - 1], swapped[pos] = swapped[pos], swapped[pos - 1]
+            self._formats = swapped
+
+    def learn(self, sample: Iterable[Optional[str]]) -> List[str]:
+        """
+        wykrywanie dominujących formatów na próbce wartości
+        - formaty sortujemy po liczbie trafień (najczęstszy sprawdzany pierwszy)
+        - zwraca listę formatów szybkiej ścieżki
+        """
+        counts = {fmt: 0 for fmt in CANDIDATE_DATETIME_FORMATS}
+        for value in sample:
+            if not value:
+                continue
+            value = value.strip()
+            for fmt, rx in _CANDIDATE_PATTERNS:
+                if rx.fullmatch(value):
+                    counts[fmt] += 1
+                    break
+        ranked = sorted((fmt for fmt, n in counts.items() if n), key=lambda f: counts[f], reverse=True)[:self.max_formats]
+        # nowe obiekty zamiast zmiany w miejscu - inne wątki mogą właśnie iterować po starych
+        self._usage = Counter({fmt: counts[fmt] for fmt in ranked})
+        self._formats = [(fmt, _format_to_regex(fmt)) for fmt in ranked]
+        return self.formats
+
+    def _fast_path(self, s: str) -> Optional[datetime]:
+        formats = self._formats
+        for pos, (fmt, rx) in enumerate(formats):
+            m = rx.fullmatch(s)
+            if m is None:
+                continue
+            g = m.groupdict()
+            try:
+                dt = datetime(int(g['year']), int(g['month']), int(g['day']),
+                              int(g.get('hour') or 0), int(g.get('minute') or 0), int(g.get('second') or 0),
+                              tzinfo=timezone.utc)
+            except ValueError:
+                # np. "24:00" albo miesiąc 13 - decyzję zostawiamy dateutil
+                return None
+            self._count_hit(formats, pos, fmt)
+            return dt
+        return None
+
+    def parse(self, s: Optional[str]) -> Optional[datetime]:
+        """
+        parsowanie daty do datetime w UTC - szybka ścieżka, potem dateutil
+        - wynik identyczny jak parse_datetime_to_utc (naive -> UTC)
+        """
+        if not s:
+            return None
+        s = s.strip()
+        dt = self._fast_path(s)
+        if dt is not None:
+            self.hits += 1
+            return dt
+        self.misses += 1
+        dt = _parse_with_dateutil(s)
+        if dt is not None:
+            # uczenie w locie - zapamiętujemy format, który pasuje do tej wartości
+            for fmt, rx in _CANDIDATE_PATTERNS:
+                if fmt not in self.formats and rx.fullmatch(s):
+                    self._add_format(fmt)
+                    break
+        return dt
+
+    def stats(self) -> Dict[str, float]:
+        """
+        statystyki szybkiej ścieżki - jak często używamy dateutil
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+
+# domyślny parser współdzielony przez parse_datetime_to_utc (osobny w każdym procesie),
+# loadery zaczynają od reset() + learn() na próbce pliku
+DATETIME_PARSER = DateTimeParser()
+
+
+def learn_datetime_formats(sample: Iterable[Optional[str]]) -> List[str]:
+    """
+    początek ładowania: DATETIME_PARSER od zera (formaty, ranking, statystyki)
+    i wyuczony na próbce wartości - stan poprzedniego ładowania nie przechodzi dalej
+    """
+    DATETIME_PARSER.reset()
+    return DATETIME_PARSER.learn(sample)
+
+
+def parse_datetime_to_utc(s: str) -> Optional[datetime]:
+    """
+    parsowanie daty z różnych formatów do datetime w UTC
+    
+    dateutil.parser
+    =========================
+    - potrafi sparsować wiele formatów dat ("2020-01-01", "01/01/2020", "Jan 1 2020")
+    - lepsza obsługa edge cases niż datetime.strptime()
+    - najpierw próbujemy szybkiej ścieżki DATETIME_PARSER (wyuczone formaty),
+      dateutil tylko gdy żaden nie pasuje
+    
+    zwraca Optional[datetime]:
+    - None dla pustych/błędnych dat
+    """
+    return DATETIME_PARSER.parse(s)
+
+
 def parse_duration_seconds(s: Optional[str]) -> Optional[float]:
     """
     parsowanie czasu trwania obserwacji do sekund
@@ -73,3 +313,235 @@ def parse_duration_seconds(s: Optional[str]) -> Optional[float]:
     
     # jeśli nie udało się wyekstrahować liczby, zwracamy None
     return None
+
+
+class ParseCache:
+    """
+    memoizacja normalizatorów dla powtarzających się surowych wartości
+    ============================================================================
+    dlaczego tak
+    - kolumny shape, duration i nawet datetime mają mało unikalnych wartości
+    - każda unikalna wartość jest parsowana raz na ładowanie, reszta to trafienia w cache
+
+    bezpieczeństwo:
+    - functools.lru_cache jest bezpieczne dla wątków i ograniczone (maxsize)
+    - każdy proces puli ma własną kopię cache (brak współdzielonego stanu)
+    - wyniki są niemutowalne (datetime, float, Enum) - można je współdzielić
+
+    flyweight (interning) przy ładowaniu:
+    - text: city/state/country przez sys.intern - jeden obiekt str na unikalną nazwę
+    - location: identyczne (city, state, country, lat, lon) -> ten sam obiekt Location,
+      walidowany raz; obiekty są współdzielone między obserwacjami, więc nie wolno
+      ich modyfikować (zmiana jednego = zmiana we wszystkich obserwacjach z tego miejsca)
+
+    per-load:
+    - clear() na początku ładowania czyści wartości i statystyki
+    """
+    def __init__(self, maxsize: int = 65536):
+        self.maxsize = maxsize
+        self.datetime: Callable[[Optional[str]], Optional[datetime]] = lru_cache(maxsize)(parse_datetime_to_utc)
+        self.duration: Callable[[Optional[str]], Optional[float]] = lru_cache(maxsize)(parse_duration_seconds)
+        self.shape: Callable[[Optional[str]], UFOShape] = lru_cache(maxsize)(UFOShape.normalize)
+        self.text: Callable[[Optional[str]], Optional[str]] = lru_cache(maxsize)(intern_text)
+        self._location = lru_cache(maxsize)(_make_location)
+
+    def location(self, city: Optional[str], state: Optional[str], country: Optional[str],
+                 latitude: Optional[float], longitude: Optional[float]) -> Location:
+        """
+        współdzielony obiekt Location dla danego miejsca
+        - nazwy najpierw przez text() - klucz i obiekt trzymają te same napisy
+        - błędne współrzędne: ValueError (pydantic) jak przy Location(...), wyjątki nie są cache'owane
+        """
+        return self._location(self.text(city), self.text(state), self.text(country), latitude, longitude)
+
+    def _caches(self) -> Dict[str, Callable]:
+        return {'datetime': self.datetime, 'duration': self.duration, 'shape': self.shape,
+                'text': self.text, 'location': self._location}
+
+    def clear(self) -> None:
+        """czyszczenie wszystkich cache (razem ze statystykami)"""
+        for fn in self._caches().values():
+            fn.cache_clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        statystyki trafień dla każdego normalizatora
+        - hits, misses, size (liczba unikalnych wartości), hit_rate
+        """
+        result = {}
+        for name, fn in self._caches().items():
+            info = fn.cache_info()
+            total = info.hits + info.misses
+            result[name] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+                'hit_rate': info.hits / total if total else 0.0,
+            }
+        return result
+
+
+def intern_text(value: Optional[str]) -> Optional[str]:
+    """napis -> internowany napis (jeden obiekt na unikalną wartość), pusty -> None"""
+    return sys.intern(value) if value else None
+
+
+def _make_location(city: Optional[str], state: Optional[str], country: Optional[str],
+                   latitude: Optional[float], longitude: Optional[float]) -> Location:
+    return Location(city=city, state=state, country=country, latitude=latitude, longitude=longitude)
+
+
+# domyślny cache używany przez parse_row_to_sighting (osobny w każdym procesie)
+PARSE_CACHE = ParseCache()
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError('numpy jest wymagany dla wsadowych parserów kolumn')
+
+
+_DIRECTIVE_RE = re.compile(r'%[YmdHMS]')
+# zakresy pól sprawdzane po konwersji - wartość spoza zakresu idzie ścieżką skalarną
+# (tak jak w _fast_path: datetime() rzuca ValueError i decyduje dateutil)
+_FIELD_RANGES: Dict[str, Tuple[int, int]] = {
+    '%Y': (1000, 9999), '%m': (1, 12), '%d': (1, 31), '%H': (0, 23), '%M': (0, 59), '%S': (0, 59),
+}
+_FIELD_US: Dict[str, int] = {'%H': 3_600_000_000, '%M': 60_000_000, '%S': 1_000_000}
+
+
+def _vector_layout(fmt: str) -> Optional[Tuple[List[str], List[Tuple[str, int]]]]:
+    """
+    format strptime -> (dyrektywy, grupy separatorów [(znak, liczba)])
+    - tylko formaty z pól liczbowych rozdzielonych pojedynczymi znakami,
+      każdy znak separatora w jednej grupie (np. '%m/%d/%Y %H:%M' -> '/'x2, ' 'x1, ':'x1)
+    - None - format obsługuje tylko ścieżka skalarna
+    """
+    directives = _DIRECTIVE_RE.findall(fmt)
+    seps = _DIRECTIVE_RE.split(fmt)
+    if not directives or seps[0] or seps[-1] or any(len(s) != 1 for s in seps[1:-1]):
+        return None
+    groups: List[Tuple[str, int]] = []
+    for sep in seps[1:-1]:
+        if groups and groups[-1][0] == sep:
+            groups[-1] = (sep, groups[-1][1] + 1)
+        else:
+            groups.append((sep, 1))
+    if len({sep for sep, _ in groups}) != len(groups) or set(''.join(seps)) & set('0123456789'):
+        return None
+    return directives, groups
+
+
+def _parse_format_vectorized(arr: 'np.ndarray', fmt: str) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    wektorowe parsowanie kolumny napisów jednym formatem (bez pętli po wierszach)
+
+    1. dopasowanie układu: liczba każdego separatora, ich kolejność (rfind < find
+       następnej grupy), bez pustych pól, po usunięciu separatorów same cyfry
+    2. pasujące wiersze sklejone w jeden napis - split + astype(int64) daje macierz pól
+    3. pola w zakresach, dzień <= długość miesiąca; data z datetime64[M] + dni + mikrosekundy
+
+    zwraca (mikrosekundy od epoki, maska wierszy sparsowanych tym formatem)
+    """
+    n = len(arr)
+    us = np.zeros(n, dtype=np.int64)
+    layout = _vector_layout(fmt)
+    if layout is None or n == 0:
+        return us, np.zeros(n, dtype=bool)
+    directives, groups = layout
+    ok = np.ones(n, dtype=bool)
+    spaced = arr
+    for i, (sep, count) in enumerate(groups):
+        ok &= np.strings.count(arr, sep) == count
+        if i:
+            ok &= np.strings.rfind(arr, groups[i - 1][0]) < np.strings.find(arr, sep)
+        if sep != ' ':
+            spaced = np.strings.replace(spaced, sep, ' ')
+    ok &= np.strings.isdigit(np.strings.replace(spaced, ' ', ''))
+    ok &= (np.strings.find(spaced, '  ') < 0) & ~np.strings.startswith(spaced, ' ') & ~np.strings.endswith(spaced, ' ')
+    rows = np.flatnonzero(ok)
+    if not len(rows):
+        return us, ok
+    # int() na krótkich napisach cyfr jest szybsze niż astype(int64) z tablicy napisów numpy
+    parts = ' '.join(spaced[rows].tolist()).split()
+    fields = np.fromiter(map(int, parts), dtype=np.int64, count=len(parts)).reshape(len(rows), len(directives))
+    values = {d: fields[:, k] for k, d in enumerate(directives)}
+    valid = np.ones(len(rows), dtype=bool)
+    for d, col in values.items():
+        low, high = _FIELD_RANGES[d]
+        valid &= (col >= low) & (col <= high)
+    month_start = (values['%Y'] - 1970) * 12 + values.get('%m', 1) - 1
+    month = month_start.astype('datetime64[M]')
+    days_in_month = ((month + 1).astype('datetime64[D]') - month.astype('datetime64[D]')).astype(np.int64)
+    day = values.get('%d', np.ones(len(rows), dtype=np.int64))
+    valid &= day <= days_in_month
+    parsed = (month.astype('datetime64[D]') + (day - 1)).astype('datetime64[us]').astype(np.int64)
+    for d, unit in _FIELD_US.items():
+        if d in values:
+            parsed += values[d] * unit
+    us[rows[valid]] = parsed[valid]
+    ok[rows[~valid]] = False
+    return us, ok
+
+
+def parse_datetimes_batch(values: Iterable[Optional[str]]) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    wsadowe parsowanie kolumny dat do numpy datetime64[us] (UTC)
+
+    dlaczego wsadowo
+    ================
+    - formaty wyuczone przez DATETIME_PARSER (w jego kolejności) parsujemy wektorowo
+      dla całej kolumny - _parse_format_vectorized, bez wywołania na każdy wiersz
+    - reszta (inne formaty, wartości spoza zakresu jak "24:00") przez DATETIME_PARSER.parse
+      raz na unikalną wartość - ten sam wynik co parse_datetime_to_utc
+
+    zwraca (daty, maska):
+    - daty: datetime64[us], NaT dla błędnych wartości
+    - maska: True gdzie wartość jest pusta lub nieparsowalna
+    """
+    _require_numpy()
+    arr = np.strings.strip(np.asarray([v or '' for v in values], dtype=str))
+    result = np.full(len(arr), np.datetime64('NaT'), dtype='datetime64[us]')
+    todo = arr != ''
+    for fmt in DATETIME_PARSER.formats:
+        rows = np.flatnonzero(todo)
+        if not len(rows):
+            break
+        us, ok = _parse_format_vectorized(arr[rows], fmt)
+        result[rows[ok]] = us[ok].astype('datetime64[us]')
+        todo[rows[ok]] = False
+    rest = np.flatnonzero(todo)
+    if len(rest):
+        uniques, inverse = np.unique(arr[rest], return_inverse=True)
+        parsed = np.empty(len(uniques), dtype='datetime64[us]')
+        for i, raw in enumerate(uniques.tolist()):
+            dt = DATETIME_PARSER.parse(raw)
+            parsed[i] = np.datetime64('NaT') if dt is None else np.datetime64(datetime_to_us(dt), 'us')
+        result[rest] = parsed[inverse]
+    return result, np.isnat(result)
+
+
+def parse_durations_batch(values: Iterable[Optional[str]]) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    wsadowe parsowanie kolumny czasów trwania do numpy float64
+
+    - maska wierszy liczbowych (cyfry z najwyżej jedną kropką) - ten podzbiór
+      wektorowo przez astype(float64), także gdy reszta kolumny to tekst
+    - reszta ("about 5 minutes", "a few"): np.unique + parse_duration_seconds
+      raz na unikalną wartość
+
+    zwraca (sekundy, maska):
+    - sekundy: float64, NaN dla braków
+    - maska: True gdzie wartość jest pusta lub nieparsowalna
+    """
+    _require_numpy()
+    arr = np.strings.strip(np.asarray([v or '' for v in values], dtype=str))
+    result = np.full(len(arr), np.nan, dtype=np.float64)
+    # isdecimal (nie isdigit) - odrzuca znaki jak '²', których float() nie przyjmuje
+    numeric = np.strings.isdecimal(np.strings.replace(arr, '.', '', count=1))
+    result[numeric] = arr[numeric].astype(np.float64)
+    rest = np.flatnonzero(~numeric & (arr != ''))
+    if len(rest):
+        uniques, inverse = np.unique(arr[rest], return_inverse=True)
+        parsed = np.array([parse_duration_seconds(raw) for raw in uniques.tolist()], dtype=np.float64)
+        result[rest] = parsed[inverse]
+    return result, np.isnan(result)
@@ -37,3 +37,27 @@ def test_async_loader_basic():
     finally:
         # czyszczenie tymczasowych plików
         os.remove(path)
+
+
+def test_async_loader_blocks_in_order():
+    """
+    test blokowego async loadera
+
+    sprawdza:
+    - wiele bloków (chunk_size) i małe okno w locie
+    - kolejność wyników = kolejność pliku, raw_id = numer rekordu
+    - pula procesów jako executor (processes=True)
+    """
+    rows = [{'datetime': '2020-01-01 00:00:00', 'city': f'C{i}', 'shape': 'orb'} for i in range(1, 31)]
+    fd, path = tempfile.mkstemp(text=True, suffix='.csv')
+    os.close(fd)
+    try:
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.DictWriter(fh, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        for processes in (False, True):
+            results = asyncio.run(load_sightings_async(path, max_workers=2, chunk_size=4, max_in_flight=2, processes=processes))
+            assert [s.raw_id for s in results] == list(range(1, 31))
+    finally:
+        os.remove(path)
@@ -0,0 +1,109 @@
+import tempfile
+import os
+
+import numpy as np
+from ufo_project.src.utils import (
+    parse_datetimes_batch, parse_durations_batch, parse_datetime_to_utc, parse_duration_seconds,
+    learn_datetime_formats, datetime_to_us,
+)
+from ufo_project.src.parser import read_csv_columns
+
+"""
+testy jednostkowe - wsadowe parsery kolumn (numpy)
+============================================================================
+- kolumna dat -> datetime64[us] + maska błędów
+- kolumna czasów trwania -> float64 + maska braków
+- kolumnowe czytanie CSV
+"""
+
+
+def test_parse_datetimes_batch():
+    """
+    test wsadowego parsowania dat
+
+    sprawdza:
+    - powtarzające się i różne formaty dat
+    - NaT + maska True dla pustych i błędnych wartości
+    - zgodność z parse_datetime_to_utc
+    """
+    values = ['10/10/1949 20:30', '', '10/10/1949 20:30', 'not a date', None, '2020-01-01 00:00:00']
+    dates, mask = parse_datetimes_batch(values)
+    assert dates.dtype == np.dtype('datetime64[us]')
+    assert mask.tolist() == [False, True, False, True, True, False]
+    expected = parse_datetime_to_utc('2020-01-01 00:00:00').replace(tzinfo=None)
+    assert dates[5].astype(object) == expected
+
+
+def test_parse_datetimes_batch_vectorized_matches_scalar():
+    """
+    test wektorowej ścieżki wyuczonego formatu
+
+    sprawdza:
+    - wartości w wyuczonym formacie i poza nim (inne formaty, "24:00", 31 lutego,
+      brakujące pola, spacje na brzegach) dają to samo co parse_datetime_to_utc
+    """
+    learn_datetime_formats(['10/10/1949 20:30', '1/2/2000 1:05'])
+    values = [
+        '10/10/1949 20:30', ' 1/2/2000 1:05 ', '12/31/1999 23:59', '2/29/2000 0:00', '2/29/1999 0:00',
+        '2/31/2000 10:00', '1/1/1950 24:00', '13/1/2000 1:00', '1/1/2000', '1//2000 1:00',
+        '1/1/2000 1:00:00', '2020-01-01 00:00:00', '1/1/2000 1:60', 'x/1/2000 1:00', '',
+    ]
+    dates, mask = parse_datetimes_batch(values)
+    for value, got, bad in zip(values, dates.tolist(), mask.tolist()):
+        ref = parse_datetime_to_utc(value)
+        assert bad == (ref is None), value
+        if ref is not None:
+            assert np.datetime64(datetime_to_us(ref), 'us') == np.datetime64(got, 'us'), value
+
+
+def test_parse_durations_batch():
+    """
+    test wsadowego parsowania czasu trwania
+
+    sprawdza:
+    - czysta kolumna liczbowa (wektorowe astype)
+    - kolumna z tekstem ("about 5 seconds", "a few") - fallback przez unikalne wartości
+    """
+    values, mask = parse_durations_batch(['1', '2.5', '30'])
+    assert values.tolist() == [1.0, 2.5, 30.0]
+    assert not mask.any()
+    values, mask = parse_durations_batch(['about 5 seconds', 'a few', '', '7'])
+    assert values[0] == 5.0
+    assert values[3] == 7.0
+    assert mask.tolist() == [False, True, True, False]
+
+
+def test_parse_durations_batch_numeric_subset():
+    """
+    test maski liczbowej w kolumnie mieszanej
+
+    sprawdza:
+    - liczby (także ".5", "3.", spacje) i tekst w jednej kolumnie
+    - wynik zgodny z parse_duration_seconds dla każdej wartości
+    """
+    raw = [' 10 ', '.5', '3.', '1.2.3', 'about 5 seconds', '²', '1e3', '-4', 'a few', None]
+    values, mask = parse_durations_batch(raw)
+    for value, got, bad in zip(raw, values.tolist(), mask.tolist()):
+        ref = parse_duration_seconds(value)
+        assert bad == (ref is None), value
+        if ref is not None:
+            assert got == ref, value
+
+
+def test_read_csv_columns():
+    """
+    test kolumnowego czytania CSV
+
+    sprawdza:
+    - wybór podzbioru kolumn
+    - pomijanie kolumn spoza nagłówka
+    """
+    fd, path = tempfile.mkstemp(text=True, suffix='.csv')
+    os.close(fd)
+    try:
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            fh.write('datetime,city,shape\n10/10/1949 20:30,A,light\n1/1/2000 1:00,B,\n')
+        cols = read_csv_columns(path, ['datetime', 'shape', 'missing'])
+        assert cols == {'datetime': ['10/10/1949 20:30', '1/1/2000 1:00'], 'shape': ['light', '']}
+    finally:
+        os.remove(path)
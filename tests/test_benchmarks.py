@@ -0,0 +1,110 @@
+from ufo_project.benchmarks.generate import generate_csv, HEADER
+from ufo_project.benchmarks.run import COMPONENTS, bench_snapshot, compare, parse_rows
+from ufo_project.src.bulk import load_sightings_bulk
+from ufo_project.src.parser import read_csv
+from pathlib import Path
+import json
+import pytest
+
+"""
+testy jednostkowe - generator danych i porównanie wyników benchmarków
+============================================================================
+- generator: powtarzalny (seed), plik czytelny dla loaderów, zawiera trudne przypadki
+- compare: wykrywanie regresji czasu i pamięci z progiem szumu
+- baseline.json: zapisany wynik obejmuje wszystkie komponenty
+- start ze snapshotu szybszy niż parsowanie CSV
+"""
+
+
+def test_generator_is_seeded_and_messy(tmp_path):
+    """
+    test generatora CSV
+
+    sprawdza:
+    - ten sam seed -> identyczny plik, inny seed -> inny
+    - liczba rekordów mimo komentarzy wieloliniowych
+    - w danych są daty 24:00, tekstowe czasy trwania, encje HTML i odrzucane wiersze
+    """
+    a, b, c = (tmp_path / name for name in ('a.csv', 'b.csv', 'c.csv'))
+    generate_csv(str(a), 2000, seed=1)
+    generate_csv(str(b), 2000, seed=1)
+    generate_csv(str(c), 2000, seed=2)
+    assert a.read_bytes() == b.read_bytes()
+    assert a.read_bytes() != c.read_bytes()
+    a = str(a)
+    rows = list(read_csv(a))
+    assert len(rows) == 2000 and list(rows[0]) == HEADER
+    assert any('\n' in r['comments'] for r in rows)
+    assert any('&#44' in r['comments'] for r in rows)
+    assert any(r['datetime'].endswith('24:00') for r in rows)
+    assert any(r['duration (seconds)'] == 'about 5 minutes' for r in rows)
+    result = load_sightings_bulk(a)
+    assert 0 < len(result.rejected) < 200
+    assert len(result.sightings) + len(result.rejected) == 2000
+
+
+def test_compare_flags_regressions():
+    """
+    test porównania z baseline
+
+    sprawdza:
+    - spowolnienie ponad tolerancję i wzrost RSS (własnego i procesów potomnych) są zgłaszane
+    - małe różnice (szum) i etapy spoza baseline są pomijane
+    """
+    def result(load, query, rss, children=50.0):
+        stages = {'load': {'seconds': load}, 'query': {'seconds': query}}
+        return {'results': {'10000': {'csv_bytes': 1, 'repository': {'stages': stages, 'peak_rss_mb': rss,
+                                                                     'peak_children_rss_mb': children}}}}
+
+    baseline = result(1.0, 0.001, 100.0)
+    assert compare(result(1.1, 0.004, 110.0), baseline) == []
+    regressions = compare(result(1.5, 0.004, 200.0), baseline)
+    assert len(regressions) == 2
+    assert regressions[0].startswith('10000 repository.load')
+    assert compare(result(1.5, 0.1, 100.0), {'results': {}}) == []
+    regressions = compare(result(1.0, 0.001, 100.0, children=120.0), baseline)
+    assert len(regressions) == 1 and 'peak_children_rss' in regressions[0]
+
+
+def test_committed_baseline_covers_components():
+    """
+    test zapisanego baseline
+
+    sprawdza:
+    - baseline.json nagrany z seed 0 dla 10k wierszy
+    - są w nim wszystkie komponenty z COMPONENTS, compare z samym sobą bez regresji
+    - loadery z pulą procesów mają zapisane RSS workerów (RUSAGE_CHILDREN)
+    """
+    baseline = json.loads((Path(__file__).parent.parent / 'benchmarks' / 'baseline.json').read_text(encoding='utf-8'))
+    assert baseline['meta']['seed'] == 0
+    assert set(COMPONENTS) <= set(baseline['results']['10000'])
+    assert compare(baseline, baseline) == []
+    for name in ('load_parallel', 'load_mmap'):
+        assert baseline['results']['10000'][name]['peak_children_rss_mb'] > 0
+
+
+@pytest.mark.parametrize('text, rows', [('10k', 10_000), ('1M', 1_000_000), ('2.5k', 2_500), ('123', 123)])
+def test_parse_rows(text, rows):
+    """
+    test zapisu rozmiarów
+
+    sprawdza:
+    - przyrostki k / M i liczby bez przyrostka
+    """
+    assert parse_rows(text) == rows
+
+
+def test_snapshot_warm_start_faster_than_parse(tmp_path):
+    """
+    test benchmarku snapshotu
+
+    sprawdza:
+    - kolejny start (snapshot + indeksy z kolumn) jest szybszy niż samo parsowanie CSV
+    - benchmark sprząta po sobie plik snapshotu
+    """
+    path = tmp_path / 'nuforc.csv'
+    generate_csv(str(path), 5000, seed=0)
+    report = bench_snapshot(str(path), 5000)
+    assert report['stages']['warm']['seconds'] < report['stages']['parse_reference']['seconds']
+    assert report['warm_speedup_vs_parse'] > 1
+    assert [p.name for p in tmp_path.iterdir()] == ['nuforc.csv']
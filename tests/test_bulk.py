@@ -0,0 +1,125 @@
+import csv
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from ufo_project.src.bulk import load_sightings_bulk, validate_columns
+from ufo_project.src.models import Location, LATITUDE_RANGE
+from ufo_project.src.parser import load_sightings_threaded, parse_row_to_sighting, read_csv
+
+"""
+testy jednostkowe - zaufany tryb wsadowy
+============================================================================
+- wynik zgodny z parse_row_to_sighting dla poprawnych wierszy
+- odrzucone wiersze z powodem zamiast cichego pomijania
+- reguły walidacji wspólne z models.py
+"""
+
+FIELDS = ['datetime', 'city', 'state', 'country', 'shape', 'duration (seconds)', 'comments', 'latitude', 'longitude']
+ROWS = [
+    ['10/10/1949 20:30', 'san marcos', 'tx', 'us', 'cylinder', '2700', 'This event took place', '29.88', '-97.94'],
+    ['10/10/1955 17:00', 'chester', '', 'gb', 'Triangular', '20', '', '53.2', ''],
+    ['', 'nowhere', '', '', 'disk', '10', 'no date', '1', '1'],
+    ['1/1/2000 00:00', 'north', '', '', 'light', '5', 'bad lat', '95.5', '10'],
+    ['1/1/2000 01:00', 'east', '', '', 'orb', '5', 'bad lon', '10', '-181'],
+    ['1/1/2000 02:00', 'past', '', '', 'orb', '-3', 'negative', '10', '10'],
+    ['1/1/2000 03:00', 'text', '', '', 'orb', 'about 5 minutes', 'bad lat text', 'n/a', '10'],
+    ['2/2/2002 22:15', '', '', '', '', '', '', '', ''],
+]
+
+
+def _write_csv(tmp_path, rows):
+    path = tmp_path / 'bulk.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+    return str(path)
+
+
+def _validated(path):
+    """obserwacje ze zwykłej ścieżki (pydantic), odrzucone wiersze pomijane"""
+    result = []
+    for raw_id, row in enumerate(read_csv(path), start=1):
+        try:
+            s = parse_row_to_sighting(row, raw_id=raw_id)
+        except (ValidationError, ValueError):
+            continue
+        if s is not None:
+            result.append(s)
+    return result
+
+
+def test_bulk_matches_validated_path(tmp_path):
+    """
+    test zgodności z parse_row_to_sighting
+
+    sprawdza:
+    - te same obserwacje (pola, raw_id) dla poprawnych wierszy
+    - odrzucone wiersze: raw_id, pole i powód
+    """
+    path = _write_csv(tmp_path, ROWS)
+    result = load_sightings_bulk(path)
+    expected = _validated(path)
+    assert [s.model_dump() for s in result.sightings] == [s.model_dump() for s in expected]
+    assert [(r.raw_id, r.field) for r in result.rejected] == [
+        (3, 'datetime_utc'), (4, 'latitude'), (5, 'longitude'), (6, 'duration_seconds'), (7, 'latitude')]
+    assert 'poza zakresem' in result.rejected[1].reason
+    assert result.reject_counts() == {'datetime_utc': 1, 'latitude': 2, 'longitude': 1, 'duration_seconds': 1}
+
+
+def test_bulk_clean_and_empty_files(tmp_path):
+    """
+    test plików bez błędów i pustych
+
+    sprawdza:
+    - czysta kolumna liczbowa (wektorowa ścieżka) bez odrzuceń
+    - plik z samym nagłówkiem
+    """
+    rows = [[f'1/{d}/2001 10:00', 'c', 's', 'us', 'disk', str(d), 'x', str(d / 2), str(-d)] for d in range(1, 29)]
+    result = load_sightings_bulk(_write_csv(tmp_path, rows))
+    assert len(result.sightings) == 28 and result.rejected == []
+    assert result.sightings[-1].location.longitude == -28.0
+    assert load_sightings_bulk(_write_csv(tmp_path, [])) == ([], [])
+
+
+def test_bulk_skips_blank_lines(tmp_path):
+    """
+    test pustych linii w CSV
+
+    sprawdza:
+    - puste linie pomijane jak w csv.DictReader
+    - raw_id takie same jak z load_sightings_threaded
+    """
+    path = tmp_path / 'blank.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(FIELDS)
+        for row in ROWS[:2] + ROWS[-1:]:
+            fh.write('\n')
+            writer.writerow(row)
+        fh.write('\n\n')
+    result = load_sightings_bulk(str(path))
+    expected = load_sightings_threaded(str(path))
+    assert [s.raw_id for s in result.sightings] == [s.raw_id for s in expected] == [1, 2, 3]
+    assert [s.model_dump() for s in result.sightings] == [s.model_dump() for s in expected]
+
+
+def test_validate_columns_uses_model_rules():
+    """
+    test reguł wsadowych
+
+    sprawdza:
+    - granice zakresów z models.py włącznie (jak walidatory pydantic)
+    - NaN jako brak wartości
+    """
+    low, high = LATITUDE_RANGE
+    lat = np.array([low, high, high + 0.001, np.nan])
+    lon = np.array([0.0, 180.0, -180.5, 0.0])
+    dur = np.array([0.0, np.nan, -1.0, 1.0])
+    v = validate_columns(lat, lon, dur)
+    assert v['latitude'].tolist() == [False, False, True, False]
+    assert v['longitude'].tolist() == [False, False, True, False]
+    assert v['duration_seconds'].tolist() == [False, False, True, False]
+    with pytest.raises(ValidationError):
+        Location(city=None, state=None, country=None, latitude=high + 0.001, longitude=None)
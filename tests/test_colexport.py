@@ -0,0 +1,97 @@
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.colexport import read_columns
+from ufo_project.src.colfile import ColumnFile, write_columns
+from ufo_project.src.frame import SightingFrame
+from ufo_project.src.models import Sighting, Location, UFOShape
+from datetime import datetime, timezone
+import numpy as np
+import pytest
+
+"""
+testy jednostkowe - eksport kolumnowy
+============================================================================
+- zapis / odczyt wybranych pól z kompresją i bez
+- kompresja bloków colfile
+"""
+
+
+def make_sightings(n):
+    """
+    helper tworzący obserwacje z brakami (None) w części pól
+    """
+    result = []
+    for i in range(n):
+        loc = Location(city=None if i % 3 == 0 else f'city{i % 5}', state='tx', country='us',
+                       latitude=30.0 + i / 100, longitude=None if i % 4 == 0 else -97.0)
+        result.append(Sighting(datetime_utc=datetime(2000, 1, 1, i % 24, tzinfo=timezone.utc), duration_seconds=float(i),
+                               comments=f'komentarz {i}', location=loc, shape=[UFOShape.DISK, UFOShape.LIGHT][i % 2], raw_id=i + 1))
+    return result
+
+
+@pytest.mark.parametrize('storage', [None, 'frame'])
+@pytest.mark.parametrize('compression', [None, 'zlib', 'lzma'])
+def test_export_columns_roundtrip(tmp_path, storage, compression):
+    """
+    test eksportu i odczytu pól
+
+    sprawdza:
+    - wartości zgodne z obserwacjami, None -> NaN / None
+    - odczyt tylko wybranych pól
+    - repository na liście i na SightingFrame
+    """
+    sightings = make_sightings(300)
+    repo = SightingRepository(sightings, storage=SightingFrame() if storage else None)
+    path = str(tmp_path / 'out.ucol')
+    assert repo.export_columns(path, compression=compression) == 300
+    cols = read_columns(path, ['datetime_utc', 'shape', 'city', 'longitude'])
+    assert set(cols) == {'datetime_utc', 'shape', 'city', 'longitude'}
+    assert cols['datetime_utc'].dtype == np.dtype('M8[us]')
+    assert cols['datetime_utc'][5] == np.datetime64('2000-01-01T05:00:00', 'us')
+    assert cols['shape'] == [s.shape.value for s in sightings]
+    assert cols['city'] == [s.location.city for s in sightings]
+    assert np.isnan(cols['longitude'][0]) and cols['longitude'][1] == -97.0
+    everything = read_columns(path)
+    assert everything['raw_id'].tolist() == list(range(1, 301))
+    values, codes = read_columns(path, ['country'], decode=False)['country']
+    assert values == ['us'] and set(codes.tolist()) == {0}
+
+
+def test_export_selected_fields_and_errors(tmp_path):
+    """
+    test eksportu części pól
+
+    sprawdza:
+    - w pliku tylko wyeksportowane pola
+    - nieznane / brakujące pole -> ValueError
+    """
+    repo = SightingRepository(make_sightings(10))
+    path = str(tmp_path / 'latlon.ucol')
+    repo.export_columns(path, fields=['latitude', 'longitude'])
+    assert set(read_columns(path)) == {'latitude', 'longitude'}
+    with pytest.raises(ValueError):
+        read_columns(path, ['shape'])
+    with pytest.raises(ValueError):
+        repo.export_columns(path, fields=['colour'])
+
+
+def test_colfile_compression(tmp_path):
+    """
+    test kompresji bloków colfile
+
+    sprawdza:
+    - powtarzalne dane są kompresowane, blok niekompresowalny zostaje surowy
+    - odczyt daje te same wartości
+    - nieznana kompresja -> ValueError
+    """
+    path = str(tmp_path / 'c.col')
+    zeros = np.zeros(10000, dtype=np.int64)
+    noise = np.random.default_rng(0).random(64)
+    write_columns(path, {'zeros': zeros, 'noise': noise, 'names': ['a', 'b'] * 500}, compression='zlib')
+    with ColumnFile(path) as cf:
+        assert cf._entries['zeros']['compression'] == 'zlib'
+        assert 'compression' not in cf._entries['noise']
+        assert cf.column('zeros').tolist() == zeros.tolist()
+        assert cf.column('noise').tolist() == noise.tolist()
+        assert cf.column('names') == ['a', 'b'] * 500
+    with pytest.raises(ValueError):
+        write_columns(path, {'zeros': zeros}, compression='zip')
@@ -0,0 +1,124 @@
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.cube import CountCube
+from ufo_project.src.models import Sighting, Location, UFOShape
+from collections import Counter
+from datetime import datetime, timezone
+import random
+import pytest
+
+"""
+testy jednostkowe - kostka zliczeń
+============================================================================
+- group_by / top / count zgodne ze zliczaniem obserwacji w Pythonie
+- roll-upy aktualizowane przy add po pierwszym zapytaniu
+- top_shapes z indeksu kształtów (także dla kostki bez wymiaru shape)
+- kostka wypełniana dopiero przy pierwszym agregacie
+"""
+
+
+def make(rnd):
+    """
+    helper tworzący losową obserwację
+    """
+    country, state = rnd.choice([('US', 'tx'), ('us', 'CA'), ('gb', None), (None, None)])
+    loc = Location(city=None, state=state, country=country, latitude=None, longitude=None)
+    dt = datetime(rnd.randint(1990, 1995), rnd.randint(1, 12), 1, rnd.randint(0, 23), tzinfo=timezone.utc)
+    shape = rnd.choice([UFOShape.LIGHT, UFOShape.LIGHT, UFOShape.DISK, UFOShape.ORB])
+    return Sighting(datetime_utc=dt, duration_seconds=None, comments=None, location=loc, shape=shape)
+
+
+def test_cube_matches_brute_force():
+    """
+    test zgodności agregatów
+
+    sprawdza:
+    - group_by po jednym i kilku wymiarach, z filtrem i bez
+    - count z filtrami, top malejąco
+    - filtry country/state bez względu na wielkość liter (normalize_place)
+    """
+    rnd = random.Random(5)
+    sightings = [make(rnd) for _ in range(400)]
+    repo = SightingRepository(sightings)
+    by_shape = Counter(s.shape for s in sightings)
+    assert repo.count_by('shape') == dict(by_shape)
+    assert repo.top_shapes(2) == by_shape.most_common(2)
+    us_years = Counter((s.datetime_utc.year, s.shape) for s in sightings if (s.location.country or '').lower() == 'us')
+    assert repo.count_by('year', 'shape', country='US') == dict(us_years)
+    assert repo.count_by(country='us', state='tx') == {(): sum(1 for s in sightings if s.location.state == 'tx')}
+    top = repo.top_groups(('country', 'state'), 2)
+    assert [n for _, n in top] == sorted((n for _, n in top), reverse=True)
+    assert repo._cube.count() == len(repo) == 400
+
+
+def test_rollup_updated_on_add():
+    """
+    test przyrostowej aktualizacji
+
+    sprawdza:
+    - roll-up policzony przed add uwzględnia nowe obserwacje
+    - top_shapes po add
+    """
+    rnd = random.Random(2)
+    repo = SightingRepository([make(rnd) for _ in range(20)])
+    before = repo.count_by('shape')
+    for _ in range(30):
+        s = make(rnd)
+        s.shape = UFOShape.FIREBALL
+        repo.add(s)
+    assert repo.count_by('shape') == {**before, UFOShape.FIREBALL: 30}
+    assert repo.top_shapes(1) == [(UFOShape.FIREBALL, 30)]
+
+
+def test_cube_optional_dimensions():
+    """
+    test wymiarów month / hour i walidacji
+
+    sprawdza:
+    - kostka z wymiarem hour
+    - zapytanie o wymiar spoza kostki i nieznany wymiar -> ValueError
+    """
+    rnd = random.Random(9)
+    sightings = [make(rnd) for _ in range(100)]
+    repo = SightingRepository(sightings, cube_dims=('shape', 'year', 'hour'))
+    assert repo.count_by('hour') == dict(Counter(s.datetime_utc.hour for s in sightings))
+    with pytest.raises(ValueError):
+        repo.count_by('country')
+    with pytest.raises(ValueError):
+        CountCube(('shape', 'planet'))
+
+
+def test_top_shapes_without_shape_dimension():
+    """
+    test top_shapes dla kostki bez wymiaru shape
+
+    sprawdza:
+    - top_shapes działa dla dowolnych cube_dims
+    - count_by('shape') nadal zgłasza ValueError (wymiar spoza kostki)
+    """
+    rnd = random.Random(4)
+    sightings = [make(rnd) for _ in range(50)]
+    repo = SightingRepository(sightings, cube_dims=('country', 'year'))
+    assert repo.top_shapes(3) == Counter(s.shape for s in sightings).most_common(3)
+    with pytest.raises(ValueError):
+        repo.count_by('shape')
+
+
+def test_cube_filled_lazily():
+    """
+    test leniwego wypełniania kostki
+
+    sprawdza:
+    - budowa repository, add i merge nie liczą komórek
+    - pierwszy agregat liczy całą kostkę, kolejne add / merge ją aktualizują
+    """
+    rnd = random.Random(8)
+    sightings = [make(rnd) for _ in range(60)]
+    repo = SightingRepository(sightings[:20])
+    repo.add(sightings[20])
+    repo.merge(SightingRepository(sightings[21:30]))
+    assert len(repo._cube) == 0
+    assert repo.count_by('shape') == dict(Counter(s.shape for s in sightings[:30]))
+    repo.add_many(sightings[30:40])
+    repo.merge(SightingRepository(sightings[40:]))
+    assert repo.count_by('shape') == dict(Counter(s.shape for s in sightings))
+    assert repo._cube.count() == 60
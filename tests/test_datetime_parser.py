@@ -0,0 +1,147 @@
+from ufo_project.src.utils import DateTimeParser, DATETIME_PARSER, parse_datetime_to_utc
+from ufo_project.src.parser import load_sightings_threaded
+from datetime import datetime, timezone
+import csv
+import threading
+
+"""
+testy jednostkowe - DateTimeParser (format sniffing)
+============================================================================
+- wykrywanie dominujących formatów na próbce
+- szybka ścieżka daje ten sam wynik co dateutil
+- liczniki trafień / chybień (fallback do dateutil)
+- kilka nietypowych wartości nie blokuje dominującego formatu, stan per-load
+- reset()/learn() z innego wątku w trakcie parsowania nie gubi wierszy
+"""
+
+
+def test_learn_dominant_formats():
+    """
+    test wykrywania formatów
+
+    sprawdza:
+    - najczęstszy format jest sprawdzany jako pierwszy
+    - wartości nieparsowalne są ignorowane przy uczeniu
+    """
+    p = DateTimeParser()
+    formats = p.learn(['10/10/1949 20:30', '1/2/2005 5:05', 'xyz', '2020-01-01 00:00:00'])
+    assert formats[0] == '%m/%d/%Y %H:%M'
+    assert '%Y-%m-%d %H:%M:%S' in formats
+
+
+def test_fast_path_and_fallback_stats():
+    """
+    test szybkiej ścieżki i fallbacku
+
+    sprawdza:
+    - wynik szybkiej ścieżki = wynik parse_datetime_to_utc (UTC)
+    - "24:00" (niepoprawna godzina) trafia do dateutil i daje None
+    - hits / misses liczą użycia szybkiej ścieżki i dateutil
+    """
+    p = DateTimeParser(formats=['%m/%d/%Y %H:%M'])
+    assert p.parse('10/10/1949 20:30') == datetime(1949, 10, 10, 20, 30, tzinfo=timezone.utc)
+    assert p.parse('10/10/1949 24:00') is None
+    assert p.parse('Jan 1 2020') == parse_datetime_to_utc('Jan 1 2020')
+    assert p.stats()['hits'] == 1
+    assert p.stats()['misses'] == 2
+
+
+def test_learns_on_the_fly():
+    """
+    test uczenia w locie
+
+    sprawdza:
+    - po chybieniu rozpoznany format jest dopisywany
+    - kolejna wartość w tym formacie idzie szybką ścieżką
+    """
+    p = DateTimeParser()
+    p.parse('2020-01-01 00:00:00')
+    p.parse('2021-05-06 07:08:09')
+    assert p.formats == ['%Y-%m-%d %H:%M:%S']
+    assert (p.hits, p.misses) == (1, 1)
+
+
+STRAY = ['2020-01-01', '2020-01-01 10:00', '2020-01-01 10:00:00']
+
+
+def nuforc_dates(n):
+    """
+    helper - n różnych dat w dominującym formacie NUFORC
+    """
+    return [f'{1 + i % 12}/{1 + i % 28}/{1950 + i % 60} {i % 24}:{i % 60:02d}' for i in range(n)]
+
+
+def test_stray_formats_do_not_lock_out_dominant():
+    """
+    test "zatrucia" listy formatów
+
+    sprawdza:
+    - trzy nietypowe formaty na początku zapełniają listę, ale dominujący format
+      zastępuje najrzadziej używany i dalej idzie szybką ścieżką
+    - dominujący format awansuje na początek listy
+    - reset() czyści formaty i statystyki
+    """
+    p = DateTimeParser()
+    for value in STRAY + nuforc_dates(1003):
+        p.parse(value)
+    assert p.formats[0] == '%m/%d/%Y %H:%M'
+    assert p.misses <= len(STRAY) + 1
+    assert p.hits >= 1000
+    p.reset()
+    assert p.formats == [] and (p.hits, p.misses) == (0, 0)
+
+
+def test_loader_learns_per_load(tmp_path):
+    """
+    test uczenia w loaderze
+
+    sprawdza:
+    - loader uczy się formatów na próbce pliku (dominujący format pierwszy)
+    - formaty i statystyki z poprzedniego ładowania nie przechodzą na kolejne
+    """
+    path = tmp_path / 'dates.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(['datetime', 'shape', 'latitude', 'longitude'])
+        for value in STRAY + nuforc_dates(1003):
+            writer.writerow([value, 'light', '1', '1'])
+    DATETIME_PARSER.reset(['%d.%m.%Y'])
+    DATETIME_PARSER.hits = 10 ** 6
+    assert len(load_sightings_threaded(str(path))) == 1006
+    assert DATETIME_PARSER.formats[0] == '%m/%d/%Y %H:%M'
+    assert '%d.%m.%Y' not in DATETIME_PARSER.formats
+    assert DATETIME_PARSER.hits < 2000 and DATETIME_PARSER.misses <= len(STRAY)
+
+
+def test_reset_during_parse_does_not_raise():
+    """
+    test resetu parsera przez inne ładowanie w trakcie parsowania
+
+    sprawdza:
+    - trafienie policzone na starej (dłuższej) liście formatów po reset() nie rzuca IndexError
+    - stara lista nie wraca jako aktualna - ranking dotyczy tylko bieżącej listy
+    - parse() z wieloma wątkami i równoległym learn()/reset() zwraca poprawne daty
+    """
+    p = DateTimeParser(['%Y-%m-%d', '%m/%d/%Y', '%m/%d/%Y %H:%M'])
+    stale = p._formats
+    p.reset(['%Y-%m-%d'])
+    p._count_hit(stale, 2, '%m/%d/%Y %H:%M')
+    assert p.formats == ['%Y-%m-%d']
+
+    values = nuforc_dates(2000)
+    expected = [parse_datetime_to_utc(v) for v in values]
+    stop = threading.Event()
+
+    def relearn():
+        while not stop.is_set():
+            p.reset()
+            p.learn(['2000-01-01'])
+
+    t = threading.Thread(target=relearn)
+    t.start()
+    try:
+        results = [p.parse(v) for v in values]
+    finally:
+        stop.set()
+        t.join()
+    assert results == expected
@@ -0,0 +1,86 @@
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.export import sighting_to_dict, write_ndjson, get_encoder
+from ufo_project.src.models import Sighting, Location, UFOShape
+from datetime import datetime, timezone
+import gzip
+import io
+import json
+import pytest
+
+"""
+testy jednostkowe - strumieniowy eksport
+============================================================================
+- NDJSON i tablica JSON do pliku, obiektu pliku i .gz
+- export_json zgodny z dotychczasowym json.dumps(..., indent=2)
+- wybór enkodera
+"""
+
+
+def make_sightings(n):
+    """
+    helper tworzący obserwacje (także z polskimi znakami i nową linią w komentarzu)
+    """
+    loc = Location(city='Łódź', state=None, country='pl', latitude=51.75, longitude=None)
+    return [Sighting(datetime_utc=datetime(2000, 1, 1, i % 24, tzinfo=timezone.utc), duration_seconds=float(i) if i % 2 else None,
+                     comments=f'światło\nnr {i}', location=loc, shape=UFOShape.ORB) for i in range(n)]
+
+
+@pytest.mark.parametrize('encoder', ['json', 'auto'])
+def test_ndjson_and_array_roundtrip(tmp_path, encoder):
+    """
+    test eksportu do plików
+
+    sprawdza:
+    - NDJSON: jedna obserwacja na linię, więcej niż jedna paczka zapisu
+    - tablica JSON zwięzła i z wcięciem
+    - gzip automatycznie dla .gz
+    """
+    sightings = make_sightings(2500)
+    expected = [sighting_to_dict(s) for s in sightings]
+    repo = SightingRepository(sightings)
+    assert repo.export(tmp_path / 'out.ndjson', encoder=encoder) == 2500
+    lines = (tmp_path / 'out.ndjson').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == expected
+    repo.export(tmp_path / 'out.json.gz', fmt='json', encoder=encoder)
+    with gzip.open(tmp_path / 'out.json.gz', 'rt', encoding='utf-8') as fh:
+        assert json.load(fh) == expected
+    repo.export(tmp_path / 'pretty.json', fmt='json', compact=False, encoder=encoder)
+    assert json.loads((tmp_path / 'pretty.json').read_text(encoding='utf-8')) == expected
+
+
+def test_export_json_unchanged_and_file_objects():
+    """
+    test zgodności export_json i zapisu do obiektów plików
+
+    sprawdza:
+    - export_json identyczny z json.dumps(lista, ensure_ascii=False, indent=2)
+    - pusty repository -> "[]"
+    - zapis do pliku tekstowego i binarnego (z gzip)
+    """
+    sightings = make_sightings(3)
+    repo = SightingRepository(sightings)
+    assert repo.export_json() == json.dumps([sighting_to_dict(s) for s in sightings], ensure_ascii=False, indent=2)
+    assert SightingRepository().export_json() == '[]'
+    text = io.StringIO()
+    write_ndjson(sightings, text, encoder='auto')
+    assert len(text.getvalue().splitlines()) == 3
+    raw = io.BytesIO()
+    repo.export(raw, compress=True)
+    assert len(gzip.decompress(raw.getvalue()).splitlines()) == 3
+
+
+def test_encoder_selection():
+    """
+    test wyboru enkodera
+
+    sprawdza:
+    - własna funkcja kodująca jest używana
+    - nieznany enkoder / format -> ValueError
+    """
+    out = io.StringIO()
+    write_ndjson(make_sightings(2), out, encoder=lambda obj: obj['shape'])
+    assert out.getvalue() == 'orb\norb\n'
+    with pytest.raises(ValueError):
+        get_encoder('yaml')
+    with pytest.raises(ValueError):
+        SightingRepository().export(io.StringIO(), fmt='xml')
@@ -0,0 +1,90 @@
+from ufo_project.src.frame import SightingFrame
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.models import Sighting, Location, UFOShape
+from datetime import datetime, timezone
+
+"""
+testy jednostkowe - SightingFrame (kolumnowy magazyn)
+============================================================================
+- rozbicie obserwacji na kolumny i materializacja z powrotem
+- kodowanie słownikowe napisów
+- SightingFrame jako magazyn SightingRepository (to samo API)
+- indeksy budowane wektorowo z kolumn (from_storage) = budowa wiersz po wierszu
+"""
+
+
+def make_sightings():
+    """
+    helper tworzący testowe dane (z brakami - None)
+    """
+    loc = Location(city='A', state='S', country='PL', latitude=52.5, longitude=21.0)
+    empty = Location(city=None, state=None, country=None, latitude=None, longitude=None)
+    return [
+        Sighting(datetime_utc=datetime(2020, 1, 1, 12, 30, tzinfo=timezone.utc), duration_seconds=10, comments='a', location=loc, shape=UFOShape.LIGHT, raw_id=1),
+        Sighting(datetime_utc=datetime(1999, 5, 6, 7, 8, 9, 123, tzinfo=timezone.utc), duration_seconds=None, comments=None, location=empty, shape=UFOShape.TRIANGLE),
+        Sighting(datetime_utc=datetime(2001, 1, 1, tzinfo=timezone.utc), duration_seconds=5.5, comments='c', location=loc, shape=UFOShape.LIGHT, raw_id=3),
+    ]
+
+
+def test_frame_roundtrip():
+    """
+    test materializacji
+
+    sprawdza:
+    - get(i) odtwarza te same wartości pól (także None)
+    - powtarzające się miasto jest w słowniku tylko raz
+    """
+    sightings = make_sightings()
+    frame = SightingFrame(sightings)
+    assert len(frame) == 3
+    assert [s.model_dump() for s in frame] == [s.model_dump() for s in sightings]
+    assert frame.city.values == ['A']
+
+
+def test_repository_with_frame_storage():
+    """
+    test repository z kolumnowym magazynem
+
+    sprawdza:
+    - all / by_shape / by_country / top_shapes działają tak samo jak z listą
+    """
+    repo = SightingRepository(make_sightings(), storage=SightingFrame())
+    assert len(repo.all()) == 3
+    assert [s.raw_id for s in repo.by_shape(UFOShape.LIGHT)] == [1, 3]
+    assert len(repo.by_country('pl')) == 2
+    assert repo.top_shapes(1) == [(UFOShape.LIGHT, 2)]
+
+
+def test_from_storage_frame_matches_row_build():
+    """
+    test wektorowej budowy indeksów z kolumn (from_storage)
+
+    sprawdza:
+    - indeksy kształtu, miejsc (nazwy różniące się wielkością liter i spacjami
+      to ten sam klucz), czasu i histogramy - te same listy id i kolejność kluczy
+      co przy budowie wiersz po wierszu
+    - daty sprzed 1970 i remisy czasu
+    """
+    import random
+    rnd = random.Random(11)
+    places = [('Austin', 'TX', 'US'), (' austin', 'tx ', 'us'), ('Paris', None, 'FR'), (None, 'TX', None), ('', '', '')]
+    sightings = []
+    for i in range(200):
+        city, state, country = rnd.choice(places)
+        loc = Location(city=city, state=state, country=country,
+                       latitude=rnd.choice([None, rnd.uniform(-90, 90)]), longitude=rnd.uniform(-180, 180))
+        dt = datetime(rnd.choice([1955, 1969, 1999, 2020]), rnd.randint(1, 12), rnd.randint(1, 28), rnd.randint(0, 23), tzinfo=timezone.utc)
+        sightings.append(Sighting(datetime_utc=dt, duration_seconds=None, comments=None, location=loc,
+                                  shape=rnd.choice(list(UFOShape)), raw_id=i))
+    rows = SightingRepository(sightings)
+    columns = SightingRepository.from_storage(SightingFrame(sightings))
+    for name in ('_by_shape', '_by_country', '_by_state', '_by_city', '_by_state_country'):
+        assert list(getattr(columns, name).items()) == list(getattr(rows, name).items()), name
+    rows._by_time._flush()
+    columns._by_time._flush()
+    assert (columns._by_time._keys, columns._by_time._ids) == (rows._by_time._keys, rows._by_time._ids)
+    assert columns._by_time.histograms == rows._by_time.histograms
+    assert columns.top_shapes(3) == rows.top_shapes(3)
+    assert columns.count_by('country', 'year') == rows.count_by('country', 'year')
+    assert [s.raw_id for s in columns.in_bbox(-90, -180, 90, 180)] == [s.raw_id for s in rows.in_bbox(-90, -180, 90, 180)]
+    assert len(SightingRepository.from_storage(SightingFrame())) == 0
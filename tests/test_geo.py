@@ -0,0 +1,102 @@
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.frame import SightingFrame
+from ufo_project.src.geo import GridIndex, haversine_km
+from ufo_project.src.models import Sighting, Location, UFOShape
+from datetime import datetime, timezone
+
+"""
+testy jednostkowe - indeks geograficzny
+============================================================================
+- haversine (znane odległości)
+- within_radius / in_bbox / nearest w repository
+- antypołudnik (180°) i obserwacje bez współrzędnych
+- wektorowa budowa siatki z kolumn (add_columns) zgodna z add
+"""
+
+
+def make(city, lat, lon):
+    """
+    helper tworzący obserwację w danym punkcie
+    """
+    loc = Location(city=city, state=None, country=None, latitude=lat, longitude=lon)
+    return Sighting(datetime_utc=datetime(2000, 1, 1, tzinfo=timezone.utc), duration_seconds=None, comments=None, location=loc, shape=UFOShape.DISK)
+
+
+CITIES = [
+    make('warszawa', 52.23, 21.01),
+    make('krakow', 50.06, 19.94),
+    make('berlin', 52.52, 13.40),
+    make('fiji', -17.7, 179.9),
+    make('samoa', -13.8, -172.1),
+    make('brak', None, None),
+]
+
+
+def test_haversine_known_distance():
+    """
+    test haversine
+
+    sprawdza:
+    - Warszawa - Kraków ~ 252 km
+    """
+    assert 245 < haversine_km(52.23, 21.01, 50.06, 19.94) < 260
+
+
+def test_repository_spatial_queries():
+    """
+    test zapytań przestrzennych
+
+    sprawdza:
+    - within_radius zwraca punkty posortowane po odległości
+    - in_bbox przez antypołudnik (min_lon > max_lon), wynik w kolejności dodania
+    - nearest dla magazynu listowego i kolumnowego
+    """
+    for repo in (SightingRepository(CITIES), SightingRepository.from_storage(SightingFrame(CITIES))):
+        assert [s.location.city for s in repo.within_radius(52.23, 21.01, 300)] == ['warszawa', 'krakow']
+        assert [s.location.city for s in repo.within_radius(52.23, 21.01, 600)] == ['warszawa', 'krakow', 'berlin']
+        assert [s.location.city for s in repo.in_bbox(-20, 170, -10, -170)] == ['fiji', 'samoa']
+        assert [s.location.city for s in repo.in_bbox(-90, -180, 90, 180)] == [c.location.city for c in CITIES[:5]]
+        assert [s.location.city for s in repo.nearest(-15, 179, k=2)] == ['fiji', 'samoa']
+
+
+def test_grid_index_nearest_all_points():
+    """
+    test nearest dla k większego niż liczba punktów
+
+    sprawdza:
+    - zwraca wszystkie punkty, od najbliższego
+    """
+    grid = GridIndex(cell_deg=5)
+    grid.add(0, 10, 10)
+    grid.add(1, -80, -170)
+    assert [idx for _, idx in grid.nearest(9, 9, k=5)] == [0, 1]
+
+
+def test_grid_add_columns_matches_add():
+    """
+    test wsadowej budowy siatki z kolumn numpy
+
+    sprawdza:
+    - te same komórki, id (w kolejności dodania) i współrzędne co add punkt po punkcie
+    - granice siatki (biegun, ±180°), NaN = brak współrzędnych
+    - repository z SightingFrame (from_storage) odpowiada jak repository z listy
+    """
+    import numpy as np
+    import random
+    rnd = random.Random(3)
+    points = [(rnd.uniform(-90, 90), rnd.uniform(-180, 180)) for _ in range(300)]
+    points += [(90.0, 180.0), (-90.0, -180.0), (0.0, 179.99999), (45.0, -0.0), (float('nan'), 10.0), (10.0, float('nan'))]
+    one, batch = GridIndex(cell_deg=2.5), GridIndex(cell_deg=2.5)
+    for idx, (lat, lon) in enumerate(points):
+        if lat == lat and lon == lon:
+            one.add(idx, lat, lon)
+    lats, lons = np.array(points).T
+    batch.add_columns(np.arange(len(points)), lats, lons)
+    assert len(batch) == len(one) == len(points) - 2
+    assert set(batch._cells) == set(one._cells)
+    for key, cell in one._cells.items():
+        other = batch._cells[key]
+        assert (list(other.ids), list(other.lats), list(other.lons)) == (list(cell.ids), list(cell.lats), list(cell.lons))
+    repo = SightingRepository.from_storage(SightingFrame(CITIES))
+    assert [s.location.city for s in repo.within_radius(52.23, 21.01, 600)] == \
+        [s.location.city for s in SightingRepository(CITIES).within_radius(52.23, 21.01, 600)]
@@ -0,0 +1,81 @@
+from ufo_project.src.parser import parse_row_to_sighting
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.utils import ParseCache, PARSE_CACHE
+import pytest
+from pydantic import ValidationError
+
+"""
+testy jednostkowe - współdzielenie Location i napisów (flyweight)
+============================================================================
+- identyczne miejsca -> ten sam obiekt Location
+- napisy city/state/country internowane
+- raport pamięci repository pokazuje oszczędność
+"""
+
+
+def row(city, lat='29.88', lon='-97.94', datetime='10/10/1949 20:30'):
+    """
+    helper tworzący wiersz CSV (jak z csv.DictReader)
+    """
+    return {'datetime': datetime, 'city': city, 'state': 'tx', 'country': 'us', 'shape': 'light',
+            'duration (seconds)': '60', 'comments': 'x', 'latitude': lat, 'longitude': lon}
+
+
+def test_location_shared_between_rows():
+    """
+    test współdzielenia Location
+
+    sprawdza:
+    - ten sam obiekt dla identycznego miejsca, różny dla innych współrzędnych
+    - te same obiekty napisów w różnych Location z tego samego miasta
+    - błędne współrzędne dalej odrzucane (wyjątek nie trafia do cache)
+    - współdzielony Location jest niezmienny (przypisanie pola -> ValidationError)
+    """
+    PARSE_CACHE.clear()
+    a = parse_row_to_sighting(row(''.join(['san ', 'marcos'])))
+    b = parse_row_to_sighting(row(''.join(['san ', 'marc', 'os']), datetime='1/1/2000 10:00'))
+    c = parse_row_to_sighting(row(''.join(['san ', 'marcos']), lat='29.9'))
+    assert a.location is b.location
+    assert c.location is not a.location
+    assert c.location.city is a.location.city
+    with pytest.raises(ValidationError):
+        a.location.city = 'austin'
+    assert b.location.city == 'san marcos'
+    with pytest.raises(ValueError):
+        parse_row_to_sighting(row('north', lat='95'))
+    with pytest.raises(ValueError):
+        parse_row_to_sighting(row('north', lat='95'))
+
+
+def test_parse_cache_location_stats():
+    """
+    test statystyk cache miejsc
+
+    sprawdza:
+    - trafienia location / text widoczne w stats()
+    - clear() czyści pulę
+    """
+    cache = ParseCache()
+    first = cache.location('austin', 'tx', 'us', 30.0, -97.0)
+    assert cache.location('austin', 'tx', 'us', 30.0, -97.0) is first
+    assert cache.stats()['location']['hits'] == 1
+    assert cache.text('') is None
+    cache.clear()
+    assert cache.location('austin', 'tx', 'us', 30.0, -97.0) is not first
+
+
+def test_memory_usage_reports_savings():
+    """
+    test raportu pamięci
+
+    sprawdza:
+    - liczba unikalnych Location
+    - saved_bytes > 0 dla powtarzających się miejsc
+    """
+    PARSE_CACHE.clear()
+    sightings = [parse_row_to_sighting(row(f'city{i % 3}', datetime=f'1/{i % 28 + 1}/2000 10:00')) for i in range(60)]
+    usage = SightingRepository(sightings).memory_usage()
+    assert usage['rows'] == 60
+    assert usage['locations'] == 3
+    assert usage['saved_bytes'] > 0
+    assert usage['unshared_bytes'] == usage['shared_bytes'] + usage['saved_bytes']
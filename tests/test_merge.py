@@ -0,0 +1,106 @@
+from ufo_project.benchmarks.generate import generate_csv
+from ufo_project.src.frame import SightingFrame
+from ufo_project.src.parser import load_repository_parallel, load_sightings_threaded
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.models import UFOShape
+from datetime import datetime
+import pickle
+import pytest
+
+"""
+testy jednostkowe - budowa wsadowa i scalanie repository częściowych
+============================================================================
+- add_many / from_batches dają te same indeksy co add
+- merge przesuwa id indeksów częściowych, wyniki zapytań jak dla jednego repository
+- repository budowane w procesach (load_repository_parallel)
+"""
+
+
+@pytest.fixture(scope='module')
+def sightings(tmp_path_factory):
+    """
+    helper - 3000 obserwacji z generatora benchmarków (różne kraje, daty, komentarze)
+    """
+    path = str(tmp_path_factory.mktemp('merge') / 'm.csv')
+    generate_csv(path, 3000, seed=7)
+    return load_sightings_threaded(path)
+
+
+def results(repo):
+    """
+    helper - wyniki zapytań korzystających z każdego indeksu (raw_id)
+    """
+    ids = lambda found: [s.raw_id for s in found]
+    return {
+        'all': ids(repo.all()),
+        'shape': ids(repo.by_shape(UFOShape.LIGHT)),
+        'country': ids(repo.by_country('us')),
+        'state': ids(repo.by_state('s5', country='us')),
+        'city': ids(repo.by_city('city 3')),
+        'time': ids(repo.by_date_range(datetime(1980, 1, 1), datetime(1995, 1, 1))),
+        'hours': repo.time_histogram('hour'),
+        'radius': ids(repo.within_radius(40.0, -100.0, 1500)),
+        'bbox': ids(repo.in_bbox(0, -120, 50, -60)),
+        'text': ids(repo.search_comments('green OR disk')),
+        'query': ids(repo.query(shape=UFOShape.DISK, country='us', start=datetime(1970, 1, 1))),
+        'cube': repo.count_by('country', 'year'),
+        'top': repo.top_shapes(5),
+    }
+
+
+def test_add_many_matches_add(sightings):
+    """
+    test budowy wsadowej
+
+    sprawdza:
+    - add_many i from_batches dają te same wyniki co add po jednej obserwacji
+    - add_many zwraca liczbę dodanych, działa też dla generatora
+    """
+    one = SightingRepository()
+    for s in sightings:
+        one.add(s)
+    many = SightingRepository()
+    assert many.add_many(s for s in sightings) == len(sightings)
+    batches = SightingRepository.from_batches(sightings[i:i + 700] for i in range(0, len(sightings), 700))
+    assert results(many) == results(one) == results(batches)
+
+
+def test_merge_partial_repositories(sightings):
+    """
+    test scalania
+
+    sprawdza:
+    - repository częściowe scalone w kolejności = jedno repository
+    - roll-up kostki policzony przed scaleniem jest aktualizowany
+    - scalanie działa dla magazynu kolumnowego i po pickle (wyniki procesów)
+    - różne wymiary kostek i scalenie z samym sobą -> ValueError
+    """
+    expected = results(SightingRepository(sightings))
+    parts = [SightingRepository(sightings[i:i + 1000]) for i in range(0, len(sightings), 1000)]
+    parts[0].count_by('country', 'year')
+    assert results(SightingRepository.from_parts(parts)) == expected
+
+    frame = SightingRepository(sightings[:1000], storage=SightingFrame())
+    frame.merge(pickle.loads(pickle.dumps(SightingRepository(sightings[1000:]))))
+    assert results(frame) == expected
+
+    with pytest.raises(ValueError):
+        SightingRepository().merge(SightingRepository(cube_dims=('shape', 'hour')))
+    with pytest.raises(ValueError):
+        parts[0].merge(parts[0])
+    assert len(SightingRepository.from_parts([])) == 0
+
+
+def test_load_repository_parallel(tmp_path):
+    """
+    test repository budowanego w procesach
+
+    sprawdza:
+    - wyniki jak dla repository z load_sightings_threaded (kolejność pliku)
+    - wymiary kostki przekazywane do procesów
+    """
+    path = str(tmp_path / 'p.csv')
+    generate_csv(path, 2000, seed=3)
+    repo = load_repository_parallel(path, max_workers=2, chunk_size=300, cube_dims=('shape', 'country', 'state', 'year', 'hour'))
+    assert results(repo) == results(SightingRepository(load_sightings_threaded(path)))
+    assert sum(repo.count_by('hour').values()) == len(repo)
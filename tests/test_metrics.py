@@ -0,0 +1,111 @@
+from ufo_project.src.metrics import IngestMetrics, STAGES
+from ufo_project.src.parser import (load_sightings_threaded, load_sightings_parallel, load_sightings_async,
+                                    iter_sightings)
+from ufo_project.main import run_with_loader
+import asyncio
+import csv
+import pickle
+import pytest
+
+"""
+testy jednostkowe - metryki ładowania (czasy etapów, odrzucone wiersze)
+============================================================================
+- odrzucone wiersze liczone według powodu
+- liczniki z wątków i procesów scalane w jeden obiekt
+- bez metryk loadery zwracają to samo co wcześniej
+"""
+
+HEADER = ['datetime', 'city', 'state', 'country', 'shape', 'duration (seconds)', 'comments', 'latitude', 'longitude']
+
+
+def write_csv(path):
+    """
+    helper - 6 poprawnych wierszy i po jednym odrzuconym z każdego powodu
+    """
+    good = [['10/10/1949 20:30', f'city {i}', 'tx', 'us', 'light', '60', 'x', '29.88', '-97.94'] for i in range(6)]
+    bad = [
+        ['not a date', 'a', 'tx', 'us', 'light', '60', 'x', '29.88', '-97.94'],
+        ['10/10/1949 20:30', 'b', 'tx', 'us', 'light', '60', 'x', '95', '-97.94'],
+        ['10/10/1949 20:30', 'c', 'tx', 'us', 'light', '60', 'x', '29.88', '-190'],
+        ['10/10/1949 20:30', 'd', 'tx', 'us', 'light', '-5', 'x', '29.88', '-97.94'],
+        ['10/10/1949 20:30', 'e', 'tx', 'us', 'light', '60', 'x', 'north', '-97.94'],
+    ]
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(HEADER)
+        writer.writerows(good[:3] + bad + good[3:])
+    return str(path)
+
+
+EXPECTED_REJECTS = {'datetime': 1, 'latitude': 1, 'longitude': 1, 'duration_seconds': 1, 'coordinates': 1}
+
+
+@pytest.mark.parametrize('load', [
+    lambda path, m: load_sightings_threaded(path, max_workers=2, chunk_size=2, metrics=m),
+    lambda path, m: load_sightings_parallel(path, max_workers=2, chunk_size=2, metrics=m),
+    lambda path, m: asyncio.run(load_sightings_async(path, max_workers=2, chunk_size=2, metrics=m)),
+], ids=['threaded', 'parallel', 'async'])
+def test_loader_metrics(tmp_path, load):
+    """
+    test metryk loaderów
+
+    sprawdza:
+    - liczniki odrzuceń według powodu (scalone z paczek w wątkach / procesach)
+    - rows_read / rows_loaded, przepustowość po zakończeniu
+    - czasy etapów parsowania i czytania
+    - obserwacje takie same jak bez metryk
+    """
+    path = write_csv(tmp_path / 'm.csv')
+    metrics = IngestMetrics()
+    sightings = load(path, metrics)
+    assert dict(metrics.rejects) == EXPECTED_REJECTS
+    assert metrics.rows_read == 11 and metrics.rows_loaded == 6 == len(sightings)
+    assert metrics.rows_rejected == 5
+    assert metrics.throughput() > 0
+    assert set(metrics.timers) == {'read', 'datetime', 'duration', 'validation'}
+    assert [s.raw_id for s in sightings] == [s.raw_id for s in load_sightings_threaded(path, chunk_size=2)]
+
+
+def test_metrics_disabled_and_index_stage(tmp_path):
+    """
+    test ścieżki bez metryk i etapu 'index' w run_with_loader
+
+    sprawdza:
+    - loader bez metrics zwraca te same obserwacje
+    - przerwana iteracja dalej ustawia wall_seconds
+    - run_with_loader mierzy budowę repository
+    """
+    path = write_csv(tmp_path / 'm.csv')
+    assert len(load_sightings_threaded(path)) == 6
+    metrics = IngestMetrics()
+    for _ in iter_sightings(path, chunk_size=2, metrics=metrics):
+        break
+    assert metrics.wall_seconds > 0
+    metrics = IngestMetrics()
+    repo = run_with_loader(load_sightings_threaded, path, metrics=metrics)
+    assert len(repo) == 6 and metrics.timers['index'] > 0
+
+
+def test_metrics_merge_and_report():
+    """
+    test scalania i raportu
+
+    sprawdza:
+    - merge sumuje liczniki, obiekt przechodzi przez pickle (procesy)
+    - as_dict: etapy w kolejności STAGES, własne etapy na końcu
+    - throughput None przed pomiarem czasu
+    """
+    a, b = IngestMetrics(), IngestMetrics()
+    a.reject('datetime')
+    b.reject('datetime')
+    b.reject('latitude')
+    a.add_time('custom', 0.5)
+    b.add_time('validation', 1.0)
+    b.add_time('read', 1.0)
+    b.rows_read = 10
+    a.merge(pickle.loads(pickle.dumps(b)))
+    report = a.as_dict()
+    assert report['rejects'] == {'datetime': 2, 'latitude': 1}
+    assert list(report['timers']) == ['read', 'validation', 'custom']
+    assert report['rows_per_sec'] is None
+    assert 'read' in STAGES
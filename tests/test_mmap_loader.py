@@ -0,0 +1,125 @@
+import tempfile
+import os
+import csv
+
+from ufo_project.src.parser import load_sightings_mmap, load_sightings_threaded
+
+"""
+testy jednostkowe - czytnik zakresów bajtów (mmap)
+============================================================================
+1. podział pliku na bardzo małe zakresy (wiele granic w środku rekordów)
+2. nowe linie i cudzysłowy w polu comments
+3. wynik identyczny z sekwencyjnym read_csv
+"""
+
+
+def test_mmap_loader_quoted_newlines():
+    """
+    test równoległego czytnika z cudzysłowami
+
+    sprawdza:
+    - comments z nową linią, przecinkiem i podwójnym cudzysłowem
+    - zakresy po 17 bajtów (granice wypadają w środku pól w cudzysłowie)
+    - te same obserwacje i raw_id co load_sightings_threaded
+    """
+    rows = [
+        {'datetime': f'1/{i % 28 + 1}/2000 10:00', 'city': f'C{i}', 'shape': 'light',
+         'comments': ('line one\nline "two", ok\n' * (i % 3)) or 'plain'}
+        for i in range(1, 30)
+    ]
+    rows[4]['datetime'] = 'bad date'
+    fd, path = tempfile.mkstemp(text=True, suffix='.csv')
+    os.close(fd)
+    try:
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.DictWriter(fh, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        expected = load_sightings_threaded(path)
+        for range_size in (17, 1000, 1 << 20):
+            results = load_sightings_mmap(path, max_workers=2, range_size=range_size, max_in_flight=3)
+            assert [s.model_dump() for s in results] == [s.model_dump() for s in expected]
+        assert [s.raw_id for s in expected][4] == 6
+    finally:
+        os.remove(path)
+
+
+def test_mmap_loader_early_break_cancels_ranges(monkeypatch):
+    """
+    test wczesnego przerwania
+
+    sprawdza:
+    - break po pierwszej obserwacji i close() generatora nie czekają na cały plik
+    - zakresy czekające w kolejce puli są anulowane
+    """
+    from ufo_project.src import parser
+
+    submitted = []
+    make_executor = parser._make_executor
+
+    def recording_executor(*args, **kwargs):
+        ex = make_executor(*args, **kwargs)
+        submit = ex.submit
+
+        def record(fn, *a, **kw):
+            fut = submit(fn, *a, **kw)
+            if fn is parser._parse_range:
+                submitted.append(fut)
+            return fut
+        ex.submit = record
+        return ex
+
+    monkeypatch.setattr(parser, '_make_executor', recording_executor)
+    fd, path = tempfile.mkstemp(text=True, suffix='.csv')
+    os.close(fd)
+    try:
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.writer(fh)
+            writer.writerow(['datetime', 'city', 'shape'])
+            writer.writerows([f'1/{i % 28 + 1}/2000 10:00', f'C{i}', 'disk'] for i in range(2000))
+        it = parser.iter_sightings_mmap(path, max_workers=1, range_size=512, max_in_flight=16)
+        first = next(it)
+        it.close()
+        assert first.raw_id == 1
+        assert len(submitted) == 16
+        assert any(fut.cancelled() for fut in submitted)
+    finally:
+        os.remove(path)
+
+
+def test_mmap_loader_guessed_parity(monkeypatch):
+    """
+    test zgadywania parzystości cudzysłowów w procesie roboczym
+
+    sprawdza:
+    - comments w cudzysłowie z przecinkami, bez nowych linii - granice zakresów
+      w środku pól, a mimo to żaden zakres nie jest parsowany drugi raz
+    - to samo miejsce w różnych zakresach to jeden obiekt Location
+    """
+    from ufo_project.src import parser
+
+    calls = []
+    parse_range = parser._parse_range
+
+    def counting_parse_range(*args):
+        calls.append(args)
+        return parse_range(*args)
+
+    monkeypatch.setattr(parser, '_parse_range', counting_parse_range)
+    monkeypatch.setattr(parser, '_make_executor', lambda workers, processes, formats=(): parser.ThreadPoolExecutor(1))
+    fd, path = tempfile.mkstemp(text=True, suffix='.csv')
+    os.close(fd)
+    try:
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.writer(fh)
+            writer.writerow(['datetime', 'city', 'shape', 'comments'])
+            writer.writerows([f'1/{i % 28 + 1}/2000 10:00', f'C{i % 3}', 'disk', f'bright, "fast" light {i}']
+                             for i in range(300))
+        with open(path, 'rb') as fh:
+            data_start = len(fh.readline())
+        results = parser.load_sightings_mmap(path, range_size=100)
+        assert [s.model_dump() for s in results] == [s.model_dump() for s in load_sightings_threaded(path)]
+        assert len(calls) == len(range(data_start, os.path.getsize(path), 100))
+        assert results[0].location is results[-3].location
+    finally:
+        os.remove(path)
@@ -1,5 +1,7 @@
-from ufo_project.src.models import UFOShape, Location, Sighting
+from ufo_project.src.models import UFOShape, Location, Sighting, trusted_constructor
 from datetime import datetime, timezone
+from pydantic import ValidationError
+import pytest
 
 """
 testy jednostkowe - models
@@ -7,6 +9,7 @@ testy jednostkowe - models
 - normalizacja UFOShape (Enum)
 - tworzenie obiektów Location i Sighting
 - działanie dataclasses/pydantic
+- trusted_constructor - ten sam obiekt co walidowany konstruktor
 """
 
 
@@ -46,3 +49,25 @@ def test_sighting_creation():
     """
     s = Sighting(datetime_utc=datetime.now(timezone.utc), duration_seconds=12.3, comments='x', location=Location(city=None,state=None,country=None,latitude=None,longitude=None), shape=UFOShape.ORB)
     assert s.duration_seconds == 12.3
+
+
+def test_trusted_constructor_matches_validated():
+    """
+    test konstruktora zaufanych danych
+
+    sprawdza:
+    - obiekty równe zbudowanym przez walidujący konstruktor (model_dump, ==, fields_set)
+    - Location dalej frozen, zbiór pól nie jest współdzielony między obiektami
+    """
+    values = {'city': 'a', 'state': None, 'country': 'pl', 'latitude': 52.1, 'longitude': 21.0}
+    loc = trusted_constructor(Location)(dict(values))
+    assert loc == Location(**values)
+    assert loc.model_fields_set == Location(**values).model_fields_set
+    with pytest.raises(ValidationError):
+        loc.city = 'b'
+    build = trusted_constructor(Sighting)
+    fields = {'datetime_utc': datetime(2000, 1, 1, tzinfo=timezone.utc), 'duration_seconds': 5.0,
+              'comments': None, 'location': loc, 'shape': UFOShape.DISK, 'raw_id': 3}
+    first, second = build(dict(fields)), build(dict(fields))
+    assert first == Sighting(**fields) and first.model_dump() == Sighting(**fields).model_dump()
+    assert first.model_fields_set is not second.model_fields_set
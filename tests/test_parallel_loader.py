@@ -0,0 +1,89 @@
+import tempfile
+import os
+import csv
+
+from ufo_project.src.parser import load_sightings_parallel, load_sightings_threaded
+from ufo_project.src.models import UFOShape
+import pytest
+
+"""
+testy jednostkowe - parallel loader
+============================================================================
+1. weryfikuje parsowanie w puli procesów (ProcessPoolExecutor)
+2. sprawdza podział na paczki (chunk_size) i zachowanie kolejności
+3. porównuje wynik z loaderem wielowątkowym
+"""
+
+
+def _write_csv(rows):
+    """
+    helper zapisujący tymczasowy plik CSV
+    """
+    fd, path = tempfile.mkstemp(text=True, suffix='.csv')
+    os.close(fd)
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.DictWriter(fh, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def test_parallel_loader_matches_threaded():
+    """
+    test loadera procesowego
+
+    sprawdza:
+    - paczki mniejsze niż liczba wierszy (kilka tasków)
+    - pomijanie wierszy z błędną datą
+    - ten sam zbiór obserwacji co load_sightings_threaded
+    """
+    rows = [
+        {'datetime': f'2020-01-{d:02d} 10:00:00', 'city': f'C{d}', 'state': 'S', 'country': 'PL',
+         'shape': 'light' if d % 2 else 'triangle', 'duration (seconds)': str(d),
+         'latitude': '50', 'longitude': '20'}
+        for d in range(1, 8)
+    ]
+    rows.append({'datetime': 'not a date', 'city': 'X', 'state': '', 'country': '', 'shape': '',
+                 'duration (seconds)': '', 'latitude': '', 'longitude': ''})
+    path = _write_csv(rows)
+    try:
+        results = load_sightings_parallel(path, max_workers=2, chunk_size=3)
+        assert [s.location.city for s in results] == [f'C{d}' for d in range(1, 8)]
+        assert results[1].shape == UFOShape.TRIANGLE
+        threaded = load_sightings_threaded(path, max_workers=2)
+        assert sorted(s.location.city for s in threaded) == sorted(s.location.city for s in results)
+    finally:
+        os.remove(path)
+
+
+def test_parallel_loader_invalid_chunk_size():
+    """
+    test niepoprawnego rozmiaru paczki
+
+    sprawdza:
+    - chunk_size < 1 rzuca ValueError zanim uruchomimy pulę procesów
+    """
+    with pytest.raises(ValueError):
+        load_sightings_parallel('nie_istnieje.csv', chunk_size=0)
+
+
+def test_loaders_preserve_order_and_raw_id():
+    """
+    test zachowania kolejności i numerów rekordów
+
+    sprawdza:
+    - wyniki wracają w kolejności pliku mimo wielu paczek w locie
+    - raw_id = numer rekordu (1 = pierwszy wiersz danych), także po pominiętym wierszu
+    """
+    rows = [
+        {'datetime': '2020-01-01 10:00:00' if i != 3 else 'zła data', 'city': f'C{i}', 'shape': 'orb'}
+        for i in range(1, 41)
+    ]
+    path = _write_csv(rows)
+    try:
+        for results in (load_sightings_threaded(path, max_workers=4, chunk_size=3, max_in_flight=2),
+                        load_sightings_parallel(path, max_workers=2, chunk_size=7)):
+            assert [s.raw_id for s in results] == [i for i in range(1, 41) if i != 3]
+            assert all(s.location.city == f'C{s.raw_id}' for s in results)
+    finally:
+        os.remove(path)
@@ -0,0 +1,34 @@
+from ufo_project.src.utils import ParseCache, parse_duration_seconds
+from ufo_project.src.models import UFOShape
+
+"""
+testy jednostkowe - ParseCache (memoizacja normalizatorów)
+============================================================================
+- ten sam wynik co funkcje bez cache
+- powtarzające się wartości są trafieniami w cache
+- clear() resetuje cache per-load
+"""
+
+
+def test_parse_cache_hits_and_clear():
+    """
+    test memoizacji
+
+    sprawdza:
+    - wyniki identyczne z normalizatorami bez cache
+    - statystyki hits/misses/size dla każdej kolumny
+    - ograniczenie rozmiaru (maxsize)
+    - clear() zeruje statystyki
+    """
+    cache = ParseCache(maxsize=2)
+    for _ in range(3):
+        assert cache.shape('Triangular') == UFOShape.TRIANGLE
+        assert cache.duration('about 5 seconds') == parse_duration_seconds('about 5 seconds')
+    for raw in ('1', '2', '3'):
+        cache.duration(raw)
+    stats = cache.stats()
+    assert stats['shape']['hits'] == 2
+    assert stats['shape']['misses'] == 1
+    assert stats['duration']['size'] == 2
+    cache.clear()
+    assert cache.stats()['shape']['hits'] == 0
@@ -0,0 +1,115 @@
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.query import SightingQuery
+from ufo_project.src.indexes import intersect_sorted
+from ufo_project.src.models import Sighting, Location, UFOShape
+from datetime import datetime, timezone
+import random
+import pytest
+
+"""
+testy jednostkowe - zapytania złożone
+============================================================================
+- wynik query zgodny z filtrowaniem wszystkich obserwacji w Pythonie
+- wybór najbardziej selektywnego indeksu (explain)
+- walidacja SightingQuery
+"""
+
+SHAPES = [UFOShape.TRIANGLE, UFOShape.LIGHT, UFOShape.DISK]
+PLACES = [('US', 'tx', 'Austin'), ('us', 'ca', 'Fresno'), ('gb', None, 'London')]
+
+
+def make(i, rnd):
+    """
+    helper tworzący losową obserwację
+    """
+    country, state, city = rnd.choice(PLACES)
+    loc = Location(city=city, state=state, country=country, latitude=None, longitude=None)
+    dt = datetime(rnd.randint(1980, 2010), rnd.randint(1, 12), 1, tzinfo=timezone.utc)
+    duration = rnd.choice([None, 30.0, 300.0, 900.0])
+    return Sighting(datetime_utc=dt, duration_seconds=duration, comments=rnd.choice(['green light', 'orange disk', None]),
+                    location=loc, shape=rnd.choice(SHAPES), raw_id=i)
+
+
+def brute(sightings, q):
+    """
+    filtrowanie w Pythonie - wzorzec dla query
+    """
+    def ok(s):
+        loc = s.location
+        if q.shape is not None and s.shape != q.shape:
+            return False
+        if q.country is not None and (loc.country or '').lower() != q.country.lower():
+            return False
+        if q.state is not None and (loc.state or '').lower() != q.state.lower():
+            return False
+        if q.has_time() and not q.match_time(s):
+            return False
+        if q.has_duration() and not q.match_duration(s):
+            return False
+        if q.text is not None and 'green' not in (s.comments or ''):
+            return False
+        return True
+    return [s.raw_id for s in sightings if ok(s)]
+
+
+def test_query_matches_brute_force():
+    """
+    test poprawności zapytań złożonych
+
+    sprawdza:
+    - różne kombinacje kształtu, miejsca, czasu, czasu trwania i tekstu
+    - wynik w kolejności dodania
+    """
+    rnd = random.Random(7)
+    sightings = [make(i, rnd) for i in range(500)]
+    repo = SightingRepository(sightings)
+    queries = [
+        SightingQuery(shape=UFOShape.TRIANGLE, country='us', start=datetime(1990, 1, 1), end=datetime(2000, 1, 1), min_duration=300),
+        SightingQuery(state='TX', country='US', max_duration=60),
+        SightingQuery(start=datetime(2005, 1, 1)),
+        SightingQuery(min_duration=300, max_duration=300),
+        SightingQuery(shape=UFOShape.DISK, text='green', end=datetime(1985, 6, 1)),
+        SightingQuery(),
+    ]
+    for q in queries:
+        assert [s.raw_id for s in repo.query(q)] == brute(sightings, q)
+    assert len(repo.query(shape=UFOShape.LIGHT, limit=5)) == 5
+    assert len(repo.query(country='us', min_duration=30, limit=3)) == 3
+    assert repo.query(country='mars') == []
+
+
+def test_explain_picks_most_selective_index():
+    """
+    test wyboru indeksów
+
+    sprawdza:
+    - pierwszym źródłem jest najmniejsza lista id
+    - wąski przedział czasu staje się źródłem, szeroki - warunkiem na końcu
+    - czas trwania zawsze sprawdzany na końcu
+    """
+    rnd = random.Random(1)
+    repo = SightingRepository([make(i, rnd) for i in range(300)])
+    narrow = repo.explain(shape=UFOShape.TRIANGLE, start=datetime(1995, 1, 1), end=datetime(1995, 2, 1), min_duration=1)
+    assert narrow['sources'][0][0] == 'time'
+    assert narrow['residual'] == ['duration']
+    wide = repo.explain(shape=UFOShape.TRIANGLE, city='london', start=datetime(1970, 1, 1))
+    sizes = [n for _, n in wide['sources']]
+    assert sizes == sorted(sizes)
+    assert wide['residual'] == ['time']
+
+
+def test_intersect_and_query_validation():
+    """
+    test przecięcia list i walidacji zapytania
+
+    sprawdza:
+    - intersect_sorted dla list różnej długości i pustych
+    - pusty przedział czasu / czasu trwania odrzucany przez pydantic
+    """
+    assert intersect_sorted([[1, 3, 5, 7, 9], [3, 4, 5], [0, 3, 5, 9]]) == [3, 5]
+    assert intersect_sorted([[1, 2], []]) == []
+    assert intersect_sorted([]) == []
+    with pytest.raises(ValueError):
+        SightingQuery(start=datetime(2001, 1, 1), end=datetime(2000, 1, 1))
+    with pytest.raises(ValueError):
+        SightingQuery(min_duration=10, max_duration=5)
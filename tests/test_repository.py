@@ -34,3 +34,25 @@ def test_repo_basic():
     repo = SightingRepository(make_dummy())
     assert len(repo.all()) == 2
     assert len(repo.by_shape(UFOShape.LIGHT)) == 1
+
+
+def test_repo_place_indexes():
+    """
+    test indeksów kraju / stanu / miasta
+
+    sprawdza:
+    - dokładne dopasowanie kraju ("us" nie pasuje do "aus")
+    - normalizację wielkości liter i spacji
+    - stan zawężony do kraju
+    """
+    def make(city, state, country):
+        loc = Location(city=city, state=state, country=country, latitude=None, longitude=None)
+        return Sighting(datetime_utc=datetime.now(timezone.utc), duration_seconds=1, comments=None, location=loc, shape=UFOShape.ORB)
+
+    repo = SightingRepository([make('Austin', 'TX', 'us'), make('Perth', 'wa', 'aus'), make('Seattle', 'WA', 'US '), make(None, None, None)])
+    assert [s.location.city for s in repo.by_country('US')] == ['Austin', 'Seattle']
+    assert [s.location.city for s in repo.by_country('aus')] == ['Perth']
+    assert len(repo.by_state('wa')) == 2
+    assert [s.location.city for s in repo.by_state('WA', country='us')] == ['Seattle']
+    assert [s.location.state for s in repo.by_city(' austin')] == ['TX']
+    assert repo.by_country('xx') == []
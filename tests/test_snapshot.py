@@ -0,0 +1,139 @@
+import tempfile
+import os
+import time
+
+import pytest
+
+from ufo_project.src.colfile import MAGIC, ColumnFile
+from ufo_project.src.snapshot import load_repository_cached, load_snapshot, save_snapshot, snapshot_path_for
+from ufo_project.src.frame import SightingFrame
+from ufo_project.src.parser import aiter_sightings, load_sightings_async, load_sightings_threaded
+from ufo_project.src.models import UFOShape
+
+"""
+testy jednostkowe - snapshot (binarna kopia sparsowanych danych)
+============================================================================
+- zapis i odczyt snapshotu (mmap) daje te same obserwacje
+- zmiana CSV unieważnia snapshot
+- load_repository_cached korzysta ze snapshotu przy kolejnym starcie
+- load_repository_cached przyjmuje loadery sync, korutyny i async generatory
+- obcięty albo obcy plik snapshotu -> None (parsujemy CSV), bez wyjątku
+"""
+
+CSV = 'datetime,city,state,country,shape,duration (seconds),comments,latitude,longitude\n' \
+      '10/10/1949 20:30,san marcos,tx,us,cylinder,2700,"This event took place, in early fall",29.88,-97.94\n' \
+      '10/10/1955 17:00,chester (uk/england),,gb,circle,20,Green/Orange circular disc,53.2,-2.91\n'
+
+
+def _write(path, text):
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        fh.write(text)
+
+
+def test_snapshot_roundtrip_and_invalidation():
+    """
+    test zapisu/odczytu snapshotu
+
+    sprawdza:
+    - obserwacje ze snapshotu = obserwacje z loadera
+    - kolumny numeryczne są widokiem tylko do odczytu (mmap)
+    - zmiana zawartości CSV unieważnia snapshot
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'scrubbed.csv')
+        _write(csv_path, CSV)
+        sightings = load_sightings_threaded(csv_path)
+        save_snapshot(SightingFrame(sightings), csv_path)
+        frame = load_snapshot(csv_path)
+        assert frame is not None
+        assert not frame.latitude.view().flags.writeable
+        assert [s.model_dump() for s in frame] == [s.model_dump() for s in sightings]
+        # po dopisaniu wiersza do frame kolumny są już kopią
+        frame.append(sightings[0])
+        assert len(frame) == 3
+
+        _write(csv_path, CSV.replace('2700', '2701'))
+        os.utime(csv_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        assert load_snapshot(csv_path) is None
+
+
+def test_load_repository_cached():
+    """
+    test repository ze snapshotu
+
+    sprawdza:
+    - pierwszy start zapisuje snapshot obok CSV
+    - drugi start nie woła loadera i daje te same wyniki zapytań
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'scrubbed.csv')
+        _write(csv_path, CSV)
+        repo = load_repository_cached(csv_path)
+        assert os.path.exists(snapshot_path_for(csv_path))
+
+        def failing_loader(path):
+            raise AssertionError('loader nie powinien być wywołany')
+
+        cached = load_repository_cached(csv_path, loader_func=failing_loader)
+        assert len(cached.all()) == len(repo.all()) == 2
+        assert [s.location.city for s in cached.by_country('gb')] == ['chester (uk/england)']
+        assert sorted(cached.top_shapes(), key=lambda x: x[0].value) == [(UFOShape.CIRCLE, 1), (UFOShape.UNKNOWN, 1)]
+
+
+@pytest.mark.parametrize('loader', [load_sightings_threaded, load_sightings_async, aiter_sightings])
+def test_load_repository_cached_loader_kinds(loader):
+    """
+    test rodzajów loaderów
+
+    sprawdza:
+    - lista, korutyna i async generator dają te same obserwacje w snapshotcie
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'scrubbed.csv')
+        _write(csv_path, CSV)
+        repo = load_repository_cached(csv_path, loader_func=loader)
+        assert [s.raw_id for s in repo.all()] == [1, 2]
+        assert repo.all() == load_sightings_threaded(csv_path)
+
+
+def test_corrupted_snapshot_falls_back():
+    """
+    test uszkodzonego snapshotu
+
+    sprawdza:
+    - snapshot obcięty w dowolnym miejscu danych -> load_snapshot zwraca None
+    - śmieci, zły MAGIC, nagłówek dłuższy niż plik -> None
+    - uszkodzony blok napisów (ten sam rozmiar pliku) -> None
+    - ColumnFile zgłasza ValueError, load_repository_cached parsuje CSV od nowa
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'scrubbed.csv')
+        _write(csv_path, CSV)
+        target = snapshot_path_for(csv_path)
+        save_snapshot(SightingFrame(load_sightings_threaded(csv_path)), csv_path)
+        with open(target, 'rb') as fh:
+            good = fh.read()
+
+        expected = [s.model_dump() for s in load_snapshot(csv_path)]
+
+        def check(data, allow_valid=False):
+            with open(target, 'wb') as fh:
+                fh.write(data)
+            frame = load_snapshot(csv_path)
+            # obcięte samo wyrównanie za ostatnim blokiem to nadal poprawny plik
+            assert frame is None or (allow_valid and [s.model_dump() for s in frame] == expected)
+
+        for cut in range(0, len(good), 7):
+            check(good[:cut], allow_valid=cut > len(good) - 64)
+        check(os.urandom(len(good)))
+        check(b'not a snapshot at all')
+        check(MAGIC + (10**9).to_bytes(8, 'little') + b'{}')
+        # niepoprawny UTF-8 w bloku napisów, rozmiar pliku bez zmian
+        check(good.replace(b'This event', b'\xff' * 10))
+        check(good[:len(good) // 2])
+        with pytest.raises(ValueError):
+            ColumnFile(target)
+
+        repo = load_repository_cached(csv_path)
+        assert len(repo.all()) == 2
+        assert load_snapshot(csv_path) is not None
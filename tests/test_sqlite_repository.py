@@ -0,0 +1,134 @@
+from ufo_project.benchmarks.generate import generate_csv
+from ufo_project.src.parser import load_sightings_threaded
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.sqlite_repository import SQLiteSightingRepository
+from ufo_project.src.models import UFOShape
+from datetime import datetime
+import io
+import json
+import types
+import pytest
+
+"""
+testy jednostkowe - repository na SQLite
+============================================================================
+- te same wyniki co SightingRepository dla wszystkich typów zapytań
+- zapis paczkami w transakcjach, dane zostają w pliku
+- wyniki strumieniowane leniwie, plan zapytania z indeksów SQLite
+"""
+
+CUBE_DIMS = ('shape', 'country', 'state', 'year', 'month', 'hour')
+
+
+@pytest.fixture(scope='module')
+def sightings(tmp_path_factory):
+    """
+    helper - 3000 obserwacji z generatora benchmarków
+    """
+    path = str(tmp_path_factory.mktemp('sqlite') / 's.csv')
+    generate_csv(path, 3000, seed=11)
+    return load_sightings_threaded(path)
+
+
+def answers(repo):
+    """
+    helper - wyniki zapytań (raw_id / liczniki) porównywane między implementacjami
+    """
+    ids = lambda found: [s.raw_id for s in found]
+    return {
+        'len': len(repo),
+        'all': ids(repo.all()),
+        'shape': ids(repo.by_shape(UFOShape.TRIANGLE)),
+        'country': ids(repo.by_country(' US')),
+        'state': ids(repo.by_state('s7')),
+        'state_country': ids(repo.by_state('s7', country='us')),
+        'city': ids(repo.by_city('City 5')),
+        'time': ids(repo.by_date_range(datetime(1980, 1, 1), datetime(1990, 1, 1))),
+        'histograms': [repo.time_histogram(unit) for unit in ('year', 'month', 'weekday', 'hour')],
+        'radius': ids(repo.within_radius(40.0, -100.0, 1500)),
+        'radius_wrap': ids(repo.within_radius(10.0, 179.0, 800)),
+        'bbox': ids(repo.in_bbox(0, -120, 50, -60)),
+        'bbox_wrap': ids(repo.in_bbox(-30, 170, 30, -170)),
+        'nearest': ids(repo.nearest(52.0, 21.0, 7)),
+        'text': ids(repo.search_comments('green light OR orange disk')),
+        'text_limit': ids(repo.search_comments('bright', limit=5)),
+        'query': ids(repo.query(shape=UFOShape.DISK, country='us', start=datetime(1970, 1, 1),
+                                end=datetime(2005, 1, 1), min_duration=60, max_duration=3600)),
+        'query_text': ids(repo.query(text='silent', state='s3', limit=3)),
+        'count_by': repo.count_by('country', 'year'),
+        'count_by_where': repo.count_by('hour', shape=UFOShape.LIGHT, country='US'),
+        'top_groups': repo.top_groups(('state', 'shape'), 5, country='us'),
+        'top_shapes': repo.top_shapes(4),
+    }
+
+
+def test_same_answers_as_memory_repository(sightings):
+    """
+    test zgodności z SightingRepository
+
+    sprawdza:
+    - by_*, zakresy czasu, histogramy, zapytania przestrzenne (także przez antypołudnik)
+    - in_bbox zwraca te same listy (ta sama kolejność - kolejność dodania)
+    - wyszukiwanie pełnotekstowe, query, count_by / top_groups
+    - obiekty po odczycie równe zapisanym
+    """
+    memory = SightingRepository(sightings, cube_dims=CUBE_DIMS)
+    with SQLiteSightingRepository(sightings=sightings, batch_size=700) as db:
+        assert answers(db) == answers(memory)
+        assert db.all() == sightings
+        assert db.export_json() == memory.export_json()
+
+
+def test_file_batches_and_streaming(sightings, tmp_path):
+    """
+    test pliku bazy i strumieniowania
+
+    sprawdza:
+    - dane zostają w pliku po zamknięciu, kolejne id przy dopisywaniu
+    - błąd w paczce wycofuje tylko tę paczkę
+    - stream zwraca generator, eksport NDJSON z kursora
+    - explain pokazuje użycie indeksu
+    """
+    path = str(tmp_path / 'ufo.db')
+    with SQLiteSightingRepository(path, batch_size=500) as db:
+        assert db.add_many(sightings[:1000]) == 1000
+
+    with SQLiteSightingRepository(path, batch_size=500) as db:
+        assert len(db) == 1000
+        with pytest.raises(AttributeError):
+            db.add_many(sightings[1000:1400] + [None])
+        assert len(db) == 1000
+        db.add_many(sightings[1000:2000])
+        assert [s.raw_id for s in db.all()] == [s.raw_id for s in sightings[:2000]]
+
+        stream = db.stream(country='us', min_duration=300)
+        assert isinstance(stream, types.GeneratorType)
+        assert list(stream) == [s for s in sightings[:2000] if s.location.country == 'us'
+                                and s.duration_seconds is not None and s.duration_seconds >= 300]
+        assert list(db.stream(text='   ')) == [] and db.query(limit=0) == []
+
+        buf = io.StringIO()
+        assert db.export(buf) == 2000
+        assert json.loads(buf.getvalue().splitlines()[0])['comments'] == sightings[0].comments
+
+        plan = db.explain(shape=UFOShape.DISK, start=datetime(1990, 1, 1))
+        assert any('INDEX' in step for step in plan['plan'])
+
+
+def test_from_batches_and_errors(sightings):
+    """
+    test budowy z paczek i błędnych argumentów
+
+    sprawdza:
+    - from_batches = jedno add_many
+    - nieznany wymiar / jednostka histogramu -> ValueError
+    """
+    db = SQLiteSightingRepository.from_batches(sightings[i:i + 400] for i in range(0, 1200, 400))
+    assert [s.raw_id for s in db.all()] == [s.raw_id for s in sightings[:1200]]
+    with pytest.raises(ValueError):
+        db.count_by('weekday')
+    with pytest.raises(ValueError):
+        db.time_histogram('minute')
+    with pytest.raises(ValueError):
+        SQLiteSightingRepository(batch_size=0)
+    db.close()
@@ -0,0 +1,70 @@
+import asyncio
+import tempfile
+import os
+import csv
+
+from ufo_project.src.parser import iter_sightings, aiter_sightings
+
+"""
+testy jednostkowe - strumieniowe API (iter_sightings / aiter_sightings)
+============================================================================
+1. generator oddaje obserwacje leniwie, w kolejności pliku
+2. przerwanie iteracji nie wymaga parsowania całego pliku
+3. async generator daje ten sam wynik co wersja synchroniczna
+"""
+
+
+def _write_csv(n):
+    """
+    helper zapisujący tymczasowy plik CSV z n wierszami
+    """
+    fd, path = tempfile.mkstemp(text=True, suffix='.csv')
+    os.close(fd)
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.DictWriter(fh, fieldnames=['datetime', 'city', 'shape'])
+        writer.writeheader()
+        writer.writerows({'datetime': '2020-01-01 10:00:00', 'city': f'C{i}', 'shape': 'disk'} for i in range(1, n + 1))
+    return path
+
+
+def test_iter_sightings_streams_in_order():
+    """
+    test synchronicznego generatora
+
+    sprawdza:
+    - wynik to generator, nie lista
+    - wczesne przerwanie (break) zwraca poprawny prefiks
+    - pełna iteracja w pulach wątków i procesów daje wszystkie wiersze w kolejności
+    """
+    path = _write_csv(50)
+    try:
+        it = iter_sightings(path, max_workers=2, chunk_size=4, max_in_flight=2)
+        assert not isinstance(it, list)
+        first = []
+        for s in it:
+            first.append(s.raw_id)
+            if len(first) == 5:
+                break
+        it.close()
+        assert first == [1, 2, 3, 4, 5]
+        assert [s.raw_id for s in iter_sightings(path, max_workers=2, chunk_size=7, processes=True)] == list(range(1, 51))
+    finally:
+        os.remove(path)
+
+
+def test_aiter_sightings_matches_sync():
+    """
+    test async generatora
+
+    sprawdza:
+    - `async for` oddaje te same obserwacje co iter_sightings
+    """
+    path = _write_csv(23)
+
+    async def collect():
+        return [s.raw_id async for s in aiter_sightings(path, max_workers=2, chunk_size=5, max_in_flight=1)]
+
+    try:
+        assert asyncio.run(collect()) == [s.raw_id for s in iter_sightings(path, chunk_size=5)]
+    finally:
+        os.remove(path)
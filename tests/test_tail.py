@@ -0,0 +1,132 @@
+import tempfile
+import os
+
+from ufo_project.src.tail import TailIngestor
+from ufo_project.src.repository import SightingRepository
+
+"""
+testy jednostkowe - TailIngestor (przyrostowe ładowanie)
+============================================================================
+- kolejne poll() dokładają tylko dopisane wiersze
+- niepełny ostatni rekord czeka na dokończenie
+- stan (offset, nagłówek) przetrwa utworzenie nowego ingestora
+- podmiana / obcięcie / rotacja pliku -> nowe repository, bez duplikatów
+- puste linie nie zmieniają numeracji raw_id
+"""
+
+
+def test_tail_ingests_only_appended_rows():
+    """
+    test przyrostowego ładowania
+
+    sprawdza:
+    - pierwszy poll() czyta nagłówek i istniejące wiersze
+    - częściowo dopisany wiersz (także z nową linią w cudzysłowie) nie jest parsowany
+    - raw_id kontynuuje numerację rekordów
+    - nowy ingestor ze stanu z dysku nie czyta historii ponownie
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'feed.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            fh.write('datetime,city,shape,comments\n1/1/2000 10:00,A,light,x\n')
+        repo = SightingRepository()
+        tail = TailIngestor(path, repo)
+        assert tail.poll() == 1
+        assert tail.poll() == 0
+
+        with open(path, 'a', newline='', encoding='utf-8') as fh:
+            fh.write('1/2/2000 10:00,B,disk,y\n1/3/2000 10:00,C,orb,"multi\nline')
+        assert tail.poll() == 1
+        with open(path, 'a', newline='', encoding='utf-8') as fh:
+            fh.write(' comment"\n')
+        assert list(tail.follow(interval=0, max_polls=2)) == [1, 0]
+        assert [s.raw_id for s in repo.all()] == [1, 2, 3]
+        assert repo.all()[2].comments == 'multi\nline comment'
+
+        with open(path, 'a', newline='', encoding='utf-8') as fh:
+            fh.write('1/4/2000 10:00,D,orb,z\n')
+        other = SightingRepository()
+        assert TailIngestor(path, other).poll() == 1
+        assert [s.location.city for s in other.all()] == ['D']
+        assert other.all()[0].raw_id == 4
+
+
+def test_tail_restarts_on_replaced_file():
+    """
+    test podmiany i obcięcia pliku
+
+    sprawdza:
+    - inny nagłówek przy tym samym/większym rozmiarze -> czytanie od początku
+    - obcięty plik -> czytanie od początku
+    - po restarcie repository jest nowe (z repository_factory), bez duplikatów raw_id
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'feed.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            fh.write('datetime,city\n1/1/2000 10:00,A\n')
+        repo = SightingRepository()
+        tail = TailIngestor(path, repo)
+        assert tail.poll() == 1
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            fh.write('city,datetime\nB,1/1/2001 10:00\nC,1/1/2002 10:00\n')
+        assert tail.poll() == 2
+        assert tail.resets == 1 and tail.repository is not repo
+        assert [s.raw_id for s in tail.repository.all()] == [1, 2]
+        assert [s.location.city for s in tail.repository.all()] == ['B', 'C']
+
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            fh.write('city,datetime\nD,1/1/2003 10:00\n')
+        assert tail.poll() == 1
+        assert tail.resets == 2
+        assert [(s.raw_id, s.location.city) for s in tail.repository.all()] == [(1, 'D')]
+
+
+def test_tail_skips_blank_lines_like_loaders():
+    """
+    test pustych linii
+
+    sprawdza:
+    - pusta linia nie jest liczona jako rekord
+    - raw_id zgodne z load_sightings_threaded na tym samym pliku
+    """
+    from ufo_project.src.parser import load_sightings_threaded
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'feed.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            fh.write('datetime,city\n1/1/2000 10:00,A\n\n1/2/2000 10:00,B\n')
+        tail = TailIngestor(path, SightingRepository())
+        assert tail.poll() == 2
+        expected = [s.raw_id for s in load_sightings_threaded(path)]
+        assert [s.raw_id for s in tail.repository.all()] == expected == [1, 2]
+
+
+def test_tail_restarts_on_rotated_file_with_same_header():
+    """
+    test rotacji pliku
+
+    sprawdza:
+    - nowy plik (os.replace) z tym samym nagłówkiem i rozmiarem >= offset -> restart
+    - nadpisanie w miejscu z innymi wierszami przed offset -> restart
+    - nowe wiersze czytane od początku, bez starych obserwacji
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'feed.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            fh.write('datetime,city\n1/1/2000 10:00,A\n')
+        tail = TailIngestor(path, SightingRepository())
+        assert tail.poll() == 1
+
+        rotated = os.path.join(tmp, 'feed.csv.new')
+        with open(rotated, 'w', newline='', encoding='utf-8') as fh:
+            fh.write('datetime,city\n1/1/2001 10:00,B\n1/1/2002 10:00,C\n')
+        os.replace(rotated, path)
+        assert tail.poll() == 2
+        assert tail.resets == 1
+        assert [(s.raw_id, s.location.city) for s in tail.repository.all()] == [(1, 'B'), (2, 'C')]
+
+        with open(path, 'w', newline='', encoding='utf-8') as fh:
+            fh.write('datetime,city\n1/1/2003 10:00,D\n1/1/2004 10:00,E\n1/1/2005 10:00,F\n')
+        assert tail.poll() == 3
+        assert tail.resets == 2
+        assert [s.location.city for s in tail.repository.all()] == ['D', 'E', 'F']
@@ -0,0 +1,102 @@
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.text_index import InvertedIndex, tokenize, tokenize_many
+from ufo_project.src.models import Sighting, Location, UFOShape
+from datetime import datetime, timezone
+
+"""
+testy jednostkowe - indeks pełnotekstowy comments
+============================================================================
+- tokenizacja z dekodowaniem encji HTML NUFORC (&#44)
+- zapytania AND / OR i limit
+- indeks aktualizowany przy add
+- leniwa budowa wsadowa (from_texts) zgodna z przyrostową
+"""
+
+
+def make(comments):
+    """
+    helper tworzący obserwację z komentarzem
+    """
+    loc = Location(city=None, state=None, country=None, latitude=None, longitude=None)
+    return Sighting(datetime_utc=datetime(2000, 1, 1, tzinfo=timezone.utc), duration_seconds=None, comments=comments, location=loc, shape=UFOShape.LIGHT)
+
+
+def test_tokenize_entities_and_case():
+    """
+    test tokenizacji
+
+    sprawdza:
+    - "&#44" bez średnika dekodowany do przecinka (rozdziela słowa)
+    - case folding
+    """
+    assert tokenize('Green&#44Orange LIGHTS&#33') == ['green', 'orange', 'lights']
+    assert tokenize(None) == []
+
+
+def test_search_comments():
+    """
+    test wyszukiwania w repository
+
+    sprawdza:
+    - AND (wszystkie słowa), OR (dowolna grupa), brak duplikatów
+    - limit wyników
+    - obserwacja dodana po utworzeniu repository jest wyszukiwalna
+    """
+    repo = SightingRepository([make('Bright green light&#44 hovering'), make('orange disk'), make('green disk'), make(None)])
+    assert [s.comments for s in repo.search_comments('GREEN disk')] == ['green disk']
+    assert len(repo.search_comments('green OR disk')) == 3
+    assert len(repo.search_comments('green OR disk', limit=2)) == 2
+    assert repo.search_comments('purple') == []
+    repo.add(make('purple light'))
+    assert [s.comments for s in repo.search_comments('purple')] == ['purple light']
+
+
+def test_inverted_index_out_of_order_ids():
+    """
+    test posting list przy id spoza kolejności
+
+    sprawdza:
+    - lista pozostaje posortowana i bez duplikatów
+    """
+    index = InvertedIndex()
+    for idx in (5, 2, 9, 2):
+        index.add(idx, 'orb')
+    assert list(index.postings('orb')) == [2, 5, 9]
+
+
+def test_from_texts_matches_incremental():
+    """
+    test wsadowej budowy indeksu
+
+    sprawdza:
+    - tokenize_many daje to samo co tokenize (encje, Unicode, podkreślenie, tekst z \x00)
+    - from_texts - te same posting listy co add wiersz po wierszu (powtórzone słowa, None)
+    """
+    texts = ['Green&#44Orange LIGHTS', 'straße ÉTÉ', 'foo_bar  baz9', 'a\u2014b &amp', None, '', 'green green disk', 'ﬁne']
+    present = [t for t in texts if t]
+    assert tokenize_many(present) == [tokenize(t) for t in present]
+    assert tokenize_many(['a\x00b', 'c']) == [['a', 'b'], ['c']]
+    incremental = InvertedIndex()
+    for idx, text in enumerate(texts):
+        incremental.add(idx, text)
+    batch = InvertedIndex.from_texts(texts)
+    assert batch._postings == incremental._postings
+
+
+def test_text_index_built_lazily():
+    """
+    test leniwego indeksu tekstowego w repository
+
+    sprawdza:
+    - budowa repository i add nie tokenizują comments
+    - pierwsze zapytanie tekstowe buduje indeks, kolejne add / merge go aktualizują
+    """
+    repo = SightingRepository([make('green disk'), make('orange light')])
+    repo.add(make('green light'))
+    assert repo._by_text is None
+    assert len(repo.search_comments('green')) == 2
+    repo.add(make('green orb'))
+    other = SightingRepository([make('green cigar')])
+    repo.merge(other)
+    assert [s.comments for s in repo.search_comments('green')] == ['green disk', 'green light', 'green orb', 'green cigar']
+    assert [s.comments for s in repo.query(text='light')] == ['orange light', 'green light']
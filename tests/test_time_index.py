@@ -0,0 +1,55 @@
+from ufo_project.src.repository import SightingRepository
+from ufo_project.src.frame import SightingFrame
+from ufo_project.src.models import Sighting, Location, UFOShape
+from datetime import datetime, timezone
+
+"""
+testy jednostkowe - indeks czasu repository
+============================================================================
+- zapytania by_date_range (wyszukiwanie binarne)
+- nieposortowane dodawanie obserwacji
+- histogramy rok / miesiąc / dzień tygodnia / godzina
+"""
+
+
+def make(dt):
+    """
+    helper tworzący obserwację z podaną datą
+    """
+    loc = Location(city=None, state=None, country=None, latitude=None, longitude=None)
+    return Sighting(datetime_utc=dt, duration_seconds=None, comments=None, location=loc, shape=UFOShape.LIGHT)
+
+
+def test_by_date_range_unsorted_input():
+    """
+    test zapytań o przedział czasu
+
+    sprawdza:
+    - wynik w kolejności chronologicznej mimo dodawania w innej kolejności
+    - przedział [start, end) i przedziały otwarte
+    - add po zapytaniu (ponowne scalenie bufora)
+    - ten sam wynik dla magazynu kolumnowego
+    """
+    dates = [datetime(y, 6, 1, tzinfo=timezone.utc) for y in (1995, 1990, 2005, 2000, 1999)]
+    for repo in (SightingRepository(map(make, dates)), SightingRepository.from_storage(SightingFrame(map(make, dates)))):
+        years = [s.datetime_utc.year for s in repo.by_date_range(datetime(1990, 6, 1, tzinfo=timezone.utc), datetime(2000, 6, 1, tzinfo=timezone.utc))]
+        assert years == [1990, 1995, 1999]
+        assert [s.datetime_utc.year for s in repo.by_date_range(start=datetime(2000, 1, 1))] == [2000, 2005]
+        repo.add(make(datetime(1980, 1, 1, tzinfo=timezone.utc)))
+        assert [s.datetime_utc.year for s in repo.by_date_range(end=datetime(1991, 1, 1))] == [1980, 1990]
+
+
+def test_time_histograms():
+    """
+    test histogramów
+
+    sprawdza:
+    - liczniki per rok, miesiąc, dzień tygodnia i godzina
+    - aktualizację przyrostową po add
+    """
+    repo = SightingRepository([make(datetime(2020, 1, 6, 21, 0, tzinfo=timezone.utc)), make(datetime(2020, 3, 7, 21, 30, tzinfo=timezone.utc))])
+    assert repo.time_histogram('year') == {2020: 2}
+    assert repo.time_histogram('hour') == {21: 2}
+    assert repo.time_histogram('weekday') == {0: 1, 5: 1}
+    repo.add(make(datetime(2021, 1, 1, 3, 0, tzinfo=timezone.utc)))
+    assert repo.time_histogram('month') == {1: 2, 3: 1}